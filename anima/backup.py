@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2020, Anima Istanbul
+#
+# This module is part of anima and is released under the MIT
+# License: http://www.opensource.org/licenses/MIT
+import hashlib
+import os
+import shutil
+import threading
+import time
+
+try:
+    import queue
+except ImportError:  # Python 2
+    import Queue as queue
+
+from anima import logger
+
+
+class BackupRecord(object):
+    """Stores the state of the source file of the last backup.
+
+    :param int size: The size of the source file.
+    :param float mtime: The modification time of the source file.
+    :param str digest: The md5 hex digest of the file content, it is
+      calculated only when needed.
+    """
+
+    __slots__ = ('size', 'mtime', 'digest')
+
+    def __init__(self, size=0, mtime=0, digest=None):
+        self.size = size
+        self.mtime = mtime
+        self.digest = digest
+
+
+class LocalBackupService(object):
+    """Copies files to a local backup folder in a background thread.
+
+    The copies are queued with :meth:`.submit` which returns immediately, so
+    saving a scene never waits for its backup. A file is not copied again if
+    its size and modification time didn't change since its last backup, or if
+    its content is the same with the last backup.
+
+    The last ``max_backups`` copies of each file are kept. The older ones are
+    renamed by appending ``.1``, ``.2`` etc. to their names. When the total
+    size of the backup folder exceeds ``max_total_size`` bytes the oldest
+    backups are deleted.
+
+    Use :meth:`.get_stats` to see the queue depth and the throughput of the
+    service.
+
+    :param str backup_path: The root of the backup folder.
+    :param int max_backups: The number of backups that are kept per file.
+    :param int max_total_size: The maximum total size of the backup folder in
+      bytes, 0 or None disables the limit.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    chunk_size = 1024 * 1024
+
+    def __init__(self, backup_path, max_backups=3, max_total_size=None):
+        self.backup_path = backup_path
+        self.max_backups = max_backups
+        self.max_total_size = max_total_size
+
+        self._queue = queue.Queue()
+        # the output paths of the jobs that are waiting in the queue and their
+        # source paths, a new job with the same output path replaces the
+        # queued one
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+
+        self._records = {}
+        # the backup file paths and their (mtime, size), filled lazily
+        self._backup_files = None
+        self._total_size = 0
+
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+        self._stats = {
+            'submitted': 0,
+            'copied': 0,
+            'skipped': 0,
+            'failed': 0,
+            'evicted': 0,
+            'bytes_copied': 0,
+            'busy_time': 0.0,
+        }
+
+    @classmethod
+    def get(cls, backup_path=None):
+        """returns the shared service for the given backup path
+
+        :param str backup_path: The root of the backup folder, the default is
+          :meth:`anima.env.base.EnvironmentBase.local_backup_path`.
+        :return: :class:`.LocalBackupService`
+        """
+        from anima import defaults
+        if backup_path is None:
+            from anima.env.base import EnvironmentBase
+            backup_path = EnvironmentBase.local_backup_path()
+
+        with cls._instances_lock:
+            service = cls._instances.get(backup_path)
+            if service is None:
+                service = cls(
+                    backup_path,
+                    max_backups=defaults.local_backup_max_backups,
+                    max_total_size=defaults.local_backup_max_total_size
+                )
+                cls._instances[backup_path] = service
+        return service
+
+    @classmethod
+    def is_on_same_device(cls, path1, path2):
+        """returns True if the given paths are on the same drive or file
+        system, the paths don't need to exist, the closest existing parents
+        are checked then
+
+        :param str path1: A path.
+        :param str path2: Another path.
+        :return: bool
+        """
+        drive1 = os.path.splitdrive(os.path.abspath(path1))[0]
+        drive2 = os.path.splitdrive(os.path.abspath(path2))[0]
+        if drive1.lower() != drive2.lower():
+            return False
+
+        devices = []
+        for path in [path1, path2]:
+            path = os.path.abspath(path)
+            while not os.path.exists(path):
+                parent = os.path.dirname(path)
+                if parent == path:
+                    return False
+                path = parent
+            try:
+                devices.append(os.stat(path).st_dev)
+            except OSError:
+                return False
+        return devices[0] == devices[1]
+
+    def submit(self, source_path, output_path):
+        """queues a copy of the given source file to the given output path
+
+        :param str source_path: The path of the file to be backed up.
+        :param str output_path: The path of the backup file.
+        """
+        self._stats['submitted'] += 1
+        with self._pending_lock:
+            is_queued = output_path in self._pending
+            self._pending[output_path] = source_path
+        if not is_queued:
+            self._queue.put(output_path)
+        self._start_worker()
+
+    def wait(self):
+        """blocks until all the queued copies are done
+        """
+        self._queue.join()
+
+    @property
+    def queue_depth(self):
+        """returns the number of copies waiting in the queue
+        """
+        return self._queue.qsize()
+
+    def get_stats(self):
+        """returns the statistics of this service
+
+        :return dict: A dictionary with the ``submitted``, ``copied``,
+          ``skipped``, ``failed``, ``evicted``, ``bytes_copied``,
+          ``busy_time``, ``queue_depth`` and ``throughput`` (bytes per second)
+          keys.
+        """
+        stats = dict(self._stats)
+        stats['queue_depth'] = self.queue_depth
+        stats['throughput'] = \
+            stats['bytes_copied'] / stats['busy_time'] \
+            if stats['busy_time'] else 0.0
+        return stats
+
+    def _start_worker(self):
+        """starts the worker thread if it is not running
+        """
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._work,
+                    name='LocalBackupService'
+                )
+                self._worker.daemon = True
+                self._worker.start()
+
+    def _work(self):
+        """the worker loop
+        """
+        while True:
+            output_path = self._queue.get()
+            try:
+                with self._pending_lock:
+                    source_path = self._pending.pop(output_path, None)
+                if source_path is not None:
+                    start = time.time()
+                    try:
+                        self.backup(source_path, output_path)
+                    except (IOError, OSError) as e:
+                        # no space left or no permission etc.
+                        self._stats['failed'] += 1
+                        logger.debug(
+                            'could not back up %s: %s' % (source_path, e)
+                        )
+                    self._stats['busy_time'] += time.time() - start
+            finally:
+                self._queue.task_done()
+
+    @classmethod
+    def _hash_file(cls, path):
+        """returns the md5 hex digest of the given file
+        """
+        md5 = hashlib.md5()
+        with open(path, 'rb') as f:
+            while True:
+                data = f.read(cls.chunk_size)
+                if not data:
+                    break
+                md5.update(data)
+        return md5.hexdigest()
+
+    def is_changed(self, source_path, output_path):
+        """returns True if the given source file is changed after its last
+        backup to the given output path
+
+        :param str source_path: The path of the file to be backed up.
+        :param str output_path: The path of the backup file.
+        :return: bool
+        """
+        stat = os.stat(source_path)
+        record = self._records.get(output_path)
+        if record is not None \
+           and record.size == stat.st_size and record.mtime == stat.st_mtime:
+            return False
+
+        # the backup may be done in a previous session
+        try:
+            output_size = os.path.getsize(output_path)
+        except OSError:
+            return True
+
+        if output_size != stat.st_size:
+            return True
+
+        if record is None or record.digest is None:
+            output_digest = self._hash_file(output_path)
+        else:
+            output_digest = record.digest
+
+        source_digest = self._hash_file(source_path)
+        self._records[output_path] = \
+            BackupRecord(stat.st_size, stat.st_mtime, source_digest)
+        return source_digest != output_digest
+
+    def backup(self, source_path, output_path):
+        """backs up the given source file to the given output path if it is
+        changed, it is called by the worker thread
+
+        :param str source_path: The path of the file to be backed up.
+        :param str output_path: The path of the backup file.
+        :return bool: True if the file is copied.
+        """
+        if not self.is_changed(source_path, output_path):
+            self._stats['skipped'] += 1
+            logger.debug('not changed, skipping backup: %s' % source_path)
+            return False
+
+        self._scan_backup_files()
+
+        # create intermediate folders
+        try:
+            os.makedirs(os.path.dirname(output_path))
+        except OSError:
+            # already exists
+            pass
+
+        self._rotate(output_path)
+
+        stat = os.stat(source_path)
+        shutil.copy2(source_path, output_path)
+        self._records[output_path] = BackupRecord(stat.st_size, stat.st_mtime)
+        self._add_backup_file(output_path)
+
+        self._stats['copied'] += 1
+        self._stats['bytes_copied'] += stat.st_size
+        logger.debug('created copy to: %s' % output_path)
+
+        self._evict(keep=output_path)
+        return True
+
+    def _rotate(self, output_path):
+        """renames the previous backups of the given output path, and deletes
+        the ones exceeding the max_backups limit
+        """
+        for i in range(self.max_backups - 1, -1, -1):
+            path = '%s.%s' % (output_path, i) if i else output_path
+            if not os.path.exists(path):
+                continue
+            if i + 1 >= self.max_backups:
+                self._remove_backup_file(path)
+            else:
+                new_path = '%s.%s' % (output_path, i + 1)
+                if os.path.exists(new_path):
+                    self._remove_backup_file(new_path)
+                os.rename(path, new_path)
+                self._move_backup_file(path, new_path)
+
+    def _scan_backup_files(self):
+        """fills the backup file list, it is done only once
+        """
+        if self._backup_files is not None:
+            return
+        self._backup_files = {}
+        self._total_size = 0
+        for root, dirs, files in os.walk(self.backup_path):
+            for file_name in files:
+                path = os.path.join(root, file_name).replace('\\', '/')
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                self._backup_files[path] = (stat.st_mtime, stat.st_size)
+                self._total_size += stat.st_size
+
+    def _add_backup_file(self, path):
+        """adds the given file to the backup file list
+        """
+        stat = os.stat(path)
+        self._discard_backup_file(path)
+        self._backup_files[path] = (stat.st_mtime, stat.st_size)
+        self._total_size += stat.st_size
+
+    def _discard_backup_file(self, path):
+        """removes the given file from the backup file list
+        """
+        entry = self._backup_files.pop(path, None)
+        if entry is not None:
+            self._total_size -= entry[1]
+
+    def _move_backup_file(self, path, new_path):
+        """updates the backup file list for a renamed file
+        """
+        entry = self._backup_files.pop(path, None)
+        if entry is not None:
+            self._backup_files[new_path] = entry
+
+    def _remove_backup_file(self, path):
+        """deletes the given backup file
+        """
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        self._discard_backup_file(path)
+        self._records.pop(path, None)
+
+    def _evict(self, keep=None):
+        """deletes the oldest backups until the total size is under the limit
+
+        :param str keep: A path that should not be deleted.
+        """
+        if not self.max_total_size or self._total_size <= self.max_total_size:
+            return
+
+        backups = sorted(
+            self._backup_files.items(), key=lambda item: item[1][0]
+        )
+        for path, (mtime, size) in backups:
+            if self._total_size <= self.max_total_size:
+                break
+            if path == keep:
+                continue
+            self._remove_backup_file(path)
+            self._stats['evicted'] += 1
+            logger.debug('evicted backup: %s' % path)
@@ -45,6 +45,15 @@ class Config(ConfigBase):
         ffprobe_command_path='ffprobe',
 
         max_recent_files=50,
+        recent_files_save_delay=2.0,
+        local_backup_max_backups=3,
+        local_backup_max_total_size=10 * 1024 * 1024 * 1024,
+        publisher_max_workers=4,
+        record_publisher_stats=True,
+        publisher_stats_file_name='publisher_stats.json',
+        thumbnail_cache_folder_name='thumbnails',
+        thumbnail_memory_cache_size=100,
+        thumbnail_disk_cache_size=200 * 1024 * 1024,
 
         status_colors={
             'wfd': [171, 186, 195],
@@ -7,10 +7,420 @@
 import os
 
 
+class XMLBuffer(object):
+    """A simple file like object to collect the written xml data
+
+    The written chunks are joined only once when :meth:`.getvalue` is called.
+    """
+
+    __slots__ = ('data',)
+
+    def __init__(self):
+        self.data = []
+
+    def write(self, data):
+        """stores the given data
+        """
+        self.data.append(data)
+
+    def getvalue(self):
+        """returns the written data as a string
+        """
+        return ''.join(self.data)
+
+
+class TimecodeConverter(object):
+    """Converts frame numbers to timecode strings and back.
+
+    It generates the same values with the ``timecode.Timecode`` class for
+    integer, NTSC and NTSC drop frame (29.97, 59.94) frame rates, but all the
+    frame rate dependent values are calculated once and no ``Timecode``
+    instance is created per conversion. Use :meth:`.get` to get the shared
+    instance for a frame rate.
+
+    The frame numbers are zero based, so the frame number 0 is
+    ``00:00:00:00``, which is equal to ``Timecode(framerate, frames=1)``.
+
+    :param str framerate: The frame rate, something like '24', '25', '23.98'
+      or '29.97'.
+    """
+
+    _instances = {}
+
+    def __init__(self, framerate='25'):
+        self.framerate = str(framerate)
+
+        fps = float(self.framerate)
+        self.int_framerate = int(round(fps))
+        self.drop_frame = \
+            fps != self.int_framerate and self.int_framerate % 30 == 0
+
+        if self.drop_frame:
+            float_framerate = fps
+            self.drop_frames = int(round(fps * 0.066666))
+            self.frame_delimiter = ';'
+        else:
+            float_framerate = float(self.int_framerate)
+            self.drop_frames = 0
+            self.frame_delimiter = ':'
+
+        self.frames_per_minute = self.int_framerate * 60 - self.drop_frames
+        self.frames_per_10_minutes = int(round(float_framerate * 60 * 10))
+        self.frames_per_24_hours = int(round(float_framerate * 60 * 60 * 24))
+
+        self._timecode_template = \
+            '%%02i:%%02i:%%02i%s%%02i' % self.frame_delimiter
+
+    @classmethod
+    def get(cls, framerate):
+        """returns the shared TimecodeConverter instance for the given frame
+        rate
+
+        :param str framerate: The frame rate.
+        :return: :class:`.TimecodeConverter`
+        """
+        framerate = str(framerate)
+        try:
+            return cls._instances[framerate]
+        except KeyError:
+            converter = cls(framerate)
+            cls._instances[framerate] = converter
+            return converter
+
+    def to_timecode(self, frame_number):
+        """returns the timecode string of the given frame number
+
+        :param int frame_number: The zero based frame number.
+        :return: str
+        """
+        frame_number %= self.frames_per_24_hours
+
+        if self.drop_frame:
+            drop_frames = self.drop_frames
+            d, m = divmod(frame_number, self.frames_per_10_minutes)
+            frame_number += drop_frames * 9 * d
+            if m > drop_frames:
+                frame_number += \
+                    drop_frames * ((m - drop_frames) // self.frames_per_minute)
+
+        seconds, frames = divmod(frame_number, self.int_framerate)
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+
+        return self._timecode_template % (hours, minutes, seconds, frames)
+
+    def to_timecodes(self, frame_numbers):
+        """returns the timecode strings of the given frame numbers
+
+        :param frame_numbers: A list of zero based frame numbers.
+        :return: list of str
+        """
+        to_timecode = self.to_timecode
+        return [to_timecode(frame_number) for frame_number in frame_numbers]
+
+    def to_frame(self, timecode):
+        """returns the zero based frame number of the given timecode string
+
+        :param str timecode: A timecode string like '00:00:01:12' or
+          '00:01:00;02'.
+        :return: int
+        """
+        hours, minutes, seconds, frames = \
+            timecode.replace(';', ':').replace('.', ':').split(':')[:4]
+        hours = int(hours)
+        minutes = int(minutes)
+
+        frame_number = \
+            ((hours * 60 + minutes) * 60 + int(seconds)) \
+            * self.int_framerate + int(frames)
+
+        if self.drop_frame:
+            total_minutes = 60 * hours + minutes
+            frame_number -= \
+                self.drop_frames * (total_minutes - total_minutes // 10)
+
+        return frame_number
+
+    def to_frames(self, timecodes):
+        """returns the zero based frame numbers of the given timecode strings
+
+        :param timecodes: A list of timecode strings.
+        :return: list of int
+        """
+        to_frame = self.to_frame
+        return [to_frame(timecode) for timecode in timecodes]
+
+
+class IntervalIndex(object):
+    """An index of frame ranges sorted by their start frames.
+
+    It is used to answer overlap, gap, containment and "what is at this
+    frame" queries without comparing every clip or shot against each other.
+    The ranges are half open, so a clip with ``start=0`` and ``end=10``
+    covers the frames 0 to 9, which is how the :class:`.Clip` start and end
+    values are stored. Add 1 to the end frame of inclusive ranges, like the
+    Maya shot sequence end times, before adding them to the index.
+
+    The queries use binary search on the sorted start frames and only check
+    the ranges starting within the longest range length before the queried
+    frame, so for a regular edit where the ranges do not overlap too much
+    they run in logarithmic time.
+
+    :param intervals: An iterable of ``(start, end, item)`` tuples. The items
+      should be hashable and can only be added once.
+    """
+
+    def __init__(self, intervals=None):
+        self._keys = []
+        self._items = []
+        self._keys_by_item = {}
+        self._counter = 0
+        self._max_length = 0
+        if intervals is not None:
+            for start, end, item in intervals:
+                self._keys_by_item[item] = self._create_key(start, end, item)
+            self._rebuild()
+
+    @classmethod
+    def from_track(cls, track):
+        """creates an IntervalIndex from the clips of the given Track
+
+        :param track: A :class:`.Track` instance.
+        :return: IntervalIndex
+        """
+        return cls((clip.start, clip.end, clip) for clip in track.clips)
+
+    def _create_key(self, start, end, item):
+        """creates the sort key for the given range
+
+        The counter keeps the keys unique, so the items themselves are never
+        compared and the items having the same range are kept in the order
+        that they are added.
+        """
+        if item in self._keys_by_item:
+            raise ValueError(
+                '%s is already in this %s' % (item, self.__class__.__name__)
+            )
+        if end < start:
+            raise ValueError(
+                'the end frame (%s) of %s should be bigger than or equal to '
+                'its start frame (%s)' % (end, item, start)
+            )
+        self._counter += 1
+        return start, end, self._counter
+
+    def _rebuild(self):
+        """sorts all the ranges in one go
+        """
+        entries = sorted(
+            self._keys_by_item.items(), key=lambda entry: entry[1]
+        )
+        self._keys = [key for item, key in entries]
+        self._items = [item for item, key in entries]
+        self._max_length = \
+            max([key[1] - key[0] for key in self._keys] or [0])
+
+    @property
+    def max_length(self):
+        """returns the length of the longest range
+        """
+        if self._max_length is None:
+            self._max_length = \
+                max([key[1] - key[0] for key in self._keys] or [0])
+        return self._max_length
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, item):
+        return item in self._keys_by_item
+
+    def __iter__(self):
+        """iterates over the ``(start, end, item)`` tuples sorted by their
+        start frames
+        """
+        for key, item in zip(self._keys, self._items):
+            yield key[0], key[1], item
+
+    def add(self, start, end, item):
+        """adds the given range to the index
+
+        :param start: The start frame.
+        :param end: The end frame, which is not included in the range.
+        :param item: The item, a :class:`.Clip` or a shot etc.
+        """
+        import bisect
+        key = self._create_key(start, end, item)
+        index = bisect.bisect_right(self._keys, key)
+        self._keys.insert(index, key)
+        self._items.insert(index, item)
+        self._keys_by_item[item] = key
+        if self._max_length is not None:
+            self._max_length = max(self._max_length, end - start)
+
+    def remove(self, item):
+        """removes the given item from the index
+
+        :param item: An item that is previously added to this index.
+        """
+        import bisect
+        try:
+            key = self._keys_by_item.pop(item)
+        except KeyError:
+            raise ValueError(
+                '%s is not in this %s' % (item, self.__class__.__name__)
+            )
+        index = bisect.bisect_left(self._keys, key)
+        del self._keys[index]
+        del self._items[index]
+        if key[1] - key[0] == self._max_length:
+            # calculate it when it is needed
+            self._max_length = None
+
+    def update(self, item, start, end):
+        """updates the range of the given item, use it when a clip or a shot
+        is retimed
+
+        :param item: An item that is previously added to this index.
+        :param start: The new start frame.
+        :param end: The new end frame.
+        """
+        self.remove(item)
+        self.add(start, end, item)
+
+    def get_range(self, item):
+        """returns the ``(start, end)`` range of the given item
+        """
+        key = self._keys_by_item[item]
+        return key[0], key[1]
+
+    def _candidates(self, start, end):
+        """returns the index range of the ranges starting between
+        ``start - max_length`` and ``end``
+        """
+        import bisect
+        lo = bisect.bisect_left(self._keys, (start - self.max_length,))
+        hi = bisect.bisect_left(self._keys, (end,))
+        return lo, hi
+
+    def items_at(self, frame):
+        """returns the items covering the given frame
+
+        :param frame: The frame number.
+        :return: list
+        """
+        lo, hi = self._candidates(frame, frame + 1)
+        keys = self._keys
+        items = self._items
+        return [items[i] for i in range(lo, hi) if keys[i][1] > frame]
+
+    def overlapping(self, start, end):
+        """returns the items overlapping with the given range
+
+        :param start: The start frame.
+        :param end: The end frame, which is not included in the range.
+        :return: list
+        """
+        lo, hi = self._candidates(start, end)
+        keys = self._keys
+        items = self._items
+        return [
+            items[i] for i in range(lo, hi)
+            if keys[i][1] > start
+        ]
+
+    def containing(self, start, end):
+        """returns the items that are fully containing the given range
+
+        :param start: The start frame.
+        :param end: The end frame, which is not included in the range.
+        :return: list
+        """
+        lo, hi = self._candidates(end, start + 1)
+        keys = self._keys
+        items = self._items
+        return [
+            items[i] for i in range(lo, hi)
+            if keys[i][0] <= start and keys[i][1] >= end
+        ]
+
+    def overlaps(self):
+        """returns the overlapping item pairs
+
+        The pairs are ordered by the start frames of their first item, and
+        the first item of a pair is always starting before or at the same
+        frame with the second one.
+
+        :return: list of ``(item1, item2)`` tuples
+        """
+        import heapq
+        overlapping_pairs = []
+        # the ranges that are still running sorted by their end frames
+        active = []
+        for key, item in zip(self._keys, self._items):
+            start, end, order = key
+            if start == end:
+                # empty ranges are not overlapping with anything
+                continue
+            while active and active[0][0] <= start:
+                heapq.heappop(active)
+            for active_end, active_order, active_item in sorted(
+                    active, key=lambda entry: entry[1]):
+                overlapping_pairs.append((active_item, item))
+            heapq.heappush(active, (end, order, item))
+        return overlapping_pairs
+
+    def gaps(self, start=None, end=None):
+        """returns the frame ranges which are not covered by any item
+
+        :param start: The start frame of the range to look for the gaps, the
+          start frame of the first item is used if skipped.
+        :param end: The end frame of the range to look for the gaps, the end
+          frame of the last ending item is used if skipped.
+        :return: list of ``(start, end)`` tuples, the end frames are not
+          included in the gaps.
+        """
+        if not self._keys:
+            if start is not None and end is not None and start < end:
+                return [(start, end)]
+            return []
+
+        if start is None:
+            start = self._keys[0][0]
+        if end is None:
+            end = max([key[1] for key in self._keys])
+
+        gaps = []
+        covered_until = start
+        for key in self._keys:
+            if key[0] >= end:
+                break
+            if key[0] > covered_until:
+                gaps.append((covered_until, key[0]))
+            if key[1] > covered_until:
+                covered_until = key[1]
+        if covered_until < end:
+            gaps.append((covered_until, end))
+        return gaps
+
+
 class EditBase(object):
     """The base for other Edit classes
+
+    The Edit classes are using ``__slots__`` to keep their instances compact,
+    as there can be hundreds of thousands of them when a couple of EDLs are
+    loaded. The attribute values are validated when they are set through the
+    constructor or the properties, use :meth:`.validate` to validate them
+    again if the internal attributes are directly set.
     """
 
+    __slots__ = ()
+
+    def validate(self):
+        """validates the attribute values of this object and its children
+        """
+        pass
+
     def from_xml(self, xml_node):
         """Fills attributes with the given XML node
 
@@ -21,6 +431,18 @@ class EditBase(object):
     def to_xml(self, indentation=2, pre_indent=0):
         """returns an xml version of this PrevisBase object
         """
+        xml_buffer = XMLBuffer()
+        self.write_xml(
+            xml_buffer, indentation=indentation, pre_indent=pre_indent
+        )
+        return xml_buffer.getvalue()
+
+    def write_xml(self, fp, indentation=2, pre_indent=0):
+        """writes an xml version of this PrevisBase object to the given file
+        like object
+
+        :param fp: A file like object that supports ``write()``.
+        """
         raise NotImplementedError
 
     def from_edl(self, edl_list):
@@ -36,10 +458,14 @@ class EditBase(object):
         raise NotImplementedError
 
 
-class NameMixin(object):
-    """A mixin for name attribute
+class CompactNameMixin(object):
+    """A mixin for name attribute which doesn't add an instance ``__dict__``.
+
+    The class using it should define a ``_name`` slot.
     """
 
+    __slots__ = ()
+
     def __init__(self, name=''):
         self._name = self._validate_name(name)
 
@@ -70,10 +496,20 @@ class NameMixin(object):
         self._name = self._validate_name(name)
 
 
-class DurationMixin(object):
-    """A mixin for duration attribute
+class NameMixin(CompactNameMixin):
+    """A mixin for name attribute
     """
 
+
+class CompactDurationMixin(object):
+    """A mixin for duration attribute which doesn't add an instance
+    ``__dict__``.
+
+    The class using it should define a ``_duration`` slot.
+    """
+
+    __slots__ = ()
+
     def __init__(self, duration=0.0):
         self._duration = self._validate_duration(duration)
 
@@ -115,7 +551,12 @@ class DurationMixin(object):
         self._duration = self._validate_duration(duration)
 
 
-class Sequence(EditBase, NameMixin, DurationMixin):
+class DurationMixin(CompactDurationMixin):
+    """A mixin for duration attribute
+    """
+
+
+class Sequence(EditBase, CompactNameMixin, CompactDurationMixin):
     """XML compatibility class for Sequence
 
     This class is mainly created to reflect the XML structure of Maya
@@ -136,10 +577,12 @@ class Sequence(EditBase, NameMixin, DurationMixin):
       to a timecode by using this parameter as the base.
     """
 
+    __slots__ = ('_name', '_duration', 'ntsc', 'timecode', 'rate', 'media')
+
     def __init__(self, name='', duration=0.0, rate=None,
                  timecode='00:00:00:00'):
-        NameMixin.__init__(self, name=name)
-        DurationMixin.__init__(self, duration=duration)
+        CompactNameMixin.__init__(self, name=name)
+        CompactDurationMixin.__init__(self, duration=duration)
         self.ntsc = False
         # replace this with pytimecode.PyTimeCode instance
         self.timecode = timecode
@@ -150,6 +593,16 @@ class Sequence(EditBase, NameMixin, DurationMixin):
 
         self.media = None
 
+    def validate(self):
+        """validates the attribute values of this Sequence and its children
+        """
+        self._name = self._validate_name(self._name)
+        self._duration = self._validate_duration(self._duration)
+        if self.rate is not None:
+            self.rate.validate()
+        if self.media is not None:
+            self.media.validate()
+
     def from_xml(self, xml_node):
         """Fills attributes with the given XML node
 
@@ -171,40 +624,155 @@ class Sequence(EditBase, NameMixin, DurationMixin):
 
         self.media = media
 
-    def to_xml(self, indentation=2, pre_indent=0):
-        """returns an xml version of this Sequence object
+    def read_xml(self, source):
+        """Fills attributes by incrementally parsing the given xmeml file.
+
+        Unlike :meth:`.from_xml` the XML doesn't need to be fully parsed in to
+        an ElementTree beforehand. Every clip is converted to a :class:`.Clip`
+        as soon as it is parsed and the processed elements are discarded.
+        Only the first sequence in the file is read.
+
+        :param source: A file path or a file like object.
+        """
+        from xml.etree import ElementTree
+
+        # the paths of the elements whose children are processed one by one
+        # and then discarded
+        container_paths = [
+            (),
+            ('media',),
+            ('media', 'video'),
+            ('media', 'video', 'track'),
+        ]
+
+        media = None
+        video = None
+        track = None
+        files_by_id = {}
+
+        tags = []
+        elements = []
+        sequence_depth = None
+        sequence_is_read = False
+        for event, element in \
+                ElementTree.iterparse(source, events=('start', 'end')):
+            if event == 'start':
+                tags.append(element.tag)
+                elements.append(element)
+                if sequence_is_read:
+                    continue
+
+                if sequence_depth is None:
+                    if element.tag == 'sequence':
+                        sequence_depth = len(tags)
+                    continue
+
+                path = tuple(tags[sequence_depth:])
+                if path == ('media',):
+                    media = Media()
+                    self.media = media
+                elif path == ('media', 'video'):
+                    video = Video()
+                    media.video = video
+                elif path == ('media', 'video', 'track'):
+                    track = Track()
+                    video.tracks.append(track)
+                continue
+
+            path = tuple(tags[sequence_depth:])
+            tags.pop()
+            elements.pop()
+            if sequence_depth is None or sequence_is_read:
+                continue
+
+            if not path:
+                # the end of the sequence
+                sequence_is_read = True
+                element.clear()
+                continue
+
+            if path == ('duration',):
+                self.duration = int(element.text)
+            elif path == ('name',):
+                self.name = element.text
+            elif path == ('rate',):
+                rate = Rate()
+                rate.from_xml(element)
+                self.rate = rate
+            elif path == ('timecode',):
+                self.timecode = element.find('string').text
+            elif path == ('media', 'video', 'format'):
+                sample_characteristics = element.find('samplecharacteristics')
+                video.width = int(sample_characteristics.find('width').text)
+                video.height = int(sample_characteristics.find('height').text)
+            elif path == ('media', 'video', 'track', 'locked'):
+                track.locked = element.text.title() == 'True'
+            elif path == ('media', 'video', 'track', 'enabled'):
+                track.enabled = element.text.title() == 'True'
+            elif path == ('media', 'video', 'track', 'clipitem'):
+                clip = Clip()
+                clip.from_xml(element)
+
+                # resolve the file nodes that are exported only by their ids
+                file_tag = element.find('file')
+                if file_tag is not None:
+                    file_id = file_tag.attrib.get('id')
+                    if clip.file is None:
+                        clip.file = files_by_id.get(file_id)
+                    elif file_id is not None:
+                        files_by_id[file_id] = clip.file
+
+                track.clips.append(clip)
+
+            # discard the processed element
+            if path[:-1] in container_paths:
+                element.clear()
+                elements[-1].remove(element)
+
+    def write_xml(self, fp, indentation=2, pre_indent=0):
+        """writes an xml version of this Sequence object to the given file
+        like object
+
+        :param fp: A file like object that supports ``write()``.
         """
-        template = """<?xml version="1.0" encoding="UTF-8"?>
+        header_template = """<?xml version="1.0" encoding="UTF-8"?>
 <!DOCTYPE xmeml>
 <xmeml version="5">
 %(pre_indent)s<sequence>
 %(pre_indent)s%(indentation)s<duration>%(duration)s</duration>
 %(pre_indent)s%(indentation)s<name>%(name)s</name>
-%(rate)s
+"""
+        timecode_template = """
 %(pre_indent)s%(indentation)s<timecode>
 %(pre_indent)s%(indentation)s%(indentation)s<string>%(timecode)s</string>
 %(pre_indent)s%(indentation)s</timecode>
-%(media)s
+"""
+        footer_template = """
 %(pre_indent)s</sequence>
 </xmeml>"""
 
-        return template % {
+        template_vars = {
             'duration': self.duration,
             'name': self.name,
-            'ntsc': str(self.ntsc).upper(),
-            'rate': self.rate.to_xml(
-                indentation=indentation,
-                pre_indent=indentation + pre_indent
-            ),
             'timecode': self.timecode,
-            'media': self.media.to_xml(
-                indentation=indentation,
-                pre_indent=indentation + pre_indent
-            ),
             'indentation': ' ' * indentation,
             'pre_indent': ' ' * pre_indent
         }
 
+        fp.write(header_template % template_vars)
+        self.rate.write_xml(
+            fp,
+            indentation=indentation,
+            pre_indent=indentation + pre_indent
+        )
+        fp.write(timecode_template % template_vars)
+        self.media.write_xml(
+            fp,
+            indentation=indentation,
+            pre_indent=indentation + pre_indent
+        )
+        fp.write(footer_template % template_vars)
+
     def from_edl(self, edl_list):
         """Fills attributes with the given edl.List instance
 
@@ -225,55 +793,58 @@ class Sequence(EditBase, NameMixin, DurationMixin):
         v.tracks.append(video_track)
         # no audio tracks fow now
 
+        # get the last timecode like 23:59:59:xx, to be used for negative
+        # record start values, it is created only once
+        tc_24_hours_frame_number = None
+
         # read Events in to Clips
         sequence_start = 1e20
         sequence_end = -1
         for e in edl_list.events:
             assert isinstance(e, edl.Event)
-            clip = Clip()
-
-            clip.name = e.reel
-            clip.id = e.clip_name
-            clip.type = 'Video' if e.track == 'V' else 'Audio'
-
-            clip.in_ = e.src_start_tc.frame_number
-            clip.out = e.src_end_tc.frame_number
-
-            clip.duration = clip.out - clip.in_
-
-            clip.start = e.rec_start_tc.frame_number
-            clip.end = e.rec_end_tc.frame_number
+            in_ = e.src_start_tc.frame_number
+            out = e.src_end_tc.frame_number
+
+            # pass everything to the constructor, so the values are validated
+            # only once
+            clip = Clip(
+                id=e.clip_name,
+                name=e.reel,
+                start=e.rec_start_tc.frame_number,
+                end=e.rec_end_tc.frame_number,
+                duration=out - in_,
+                in_=in_,
+                out=out,
+                type_='Video' if e.track == 'V' else 'Audio'
+            )
 
             # check in and out points relative to each other
             if clip.start > clip.end:
                 # a possible negative number
-                from timecode import Timecode
-                # get the last timecode like 23:59:59:xx
-                tc_24_hours = Timecode(
-                    edl_list.fps,
-                    '23:59:59:%s' % edl_list.fps
-                )
-                clip.start -= tc_24_hours.frame_number  # + 1
+                if tc_24_hours_frame_number is None:
+                    from timecode import Timecode
+                    tc_24_hours_frame_number = Timecode(
+                        edl_list.fps,
+                        '23:59:59:%s' % edl_list.fps
+                    ).frame_number
+                clip.start -= tc_24_hours_frame_number  # + 1
 
             if clip.start < sequence_start:
                 sequence_start = clip.start
             if clip.end > sequence_end:
                 sequence_end = clip.end
 
-            f = File()
-            f.name = clip.name
-
             # include the handle at start,
             # but we can not have any idea about the
             # handle at end
             #
             # a possible solution is to look to the original media
             # but we may not be able to reach the media itself
-            f.duration = e.src_end_tc.frame_number
-
-            f.pathurl = 'file://%s' % e.source_file
-
-            clip.file = f
+            clip.file = File(
+                duration=out,
+                name=clip.name,
+                pathurl='file://%s' % e.source_file
+            )
 
             if clip.type == 'Video':
                 video_track.clips.append(clip)
@@ -287,9 +858,9 @@ class Sequence(EditBase, NameMixin, DurationMixin):
         """Returns an edl.List instance equivalent of this Sequence instance
         """
         from edl import List, Event
-        from timecode import Timecode
 
         l = List(self.rate.timebase)
+        to_timecode = self.rate.timecode_converter.to_timecode
         l.title = self.name
 
         # convert clips to events
@@ -315,23 +886,13 @@ class Sequence(EditBase, NameMixin, DurationMixin):
                     e.tr_code = 'C'  # TODO: for now use C (Cut) later on
                     # expand it to add other transition codes
 
-                    src_start_tc = Timecode(self.rate.timebase,
-                                            frames=clip.in_ + 1)
+                    e.src_start_tc = to_timecode(clip.in_)
                     # 1 frame after last frame shown
-                    src_end_tc = Timecode(self.rate.timebase,
-                                          frames=clip.out + 1)
-
-                    e.src_start_tc = str(src_start_tc)
-                    e.src_end_tc = str(src_end_tc)
+                    e.src_end_tc = to_timecode(clip.out)
 
-                    rec_start_tc = Timecode(self.rate.timebase,
-                                            frames=clip.start + 1)
+                    e.rec_start_tc = to_timecode(clip.start)
                     # 1 frame after last frame shown
-                    rec_end_tc = Timecode(self.rate.timebase,
-                                          frames=clip.end + 1)
-
-                    e.rec_start_tc = str(rec_start_tc)
-                    e.rec_end_tc = str(rec_end_tc)
+                    e.rec_end_tc = to_timecode(clip.end)
 
                     source_file = \
                         clip.file.pathurl.replace('file://localhost', '')
@@ -349,9 +910,21 @@ class Sequence(EditBase, NameMixin, DurationMixin):
                     l.append(e)
         return l
 
-    def to_metafuze_xml(self):
+    def diff(self, other):
+        """returns the changes from this Sequence to the given Sequence
+
+        :param other: The new version of this :class:`.Sequence`.
+        :return: :class:`.SequenceDiff`
+        """
+        return SequenceDiff(self, other)
+
+    def to_metafuze_xml(self, clips=None):
         """Generates a MetaFuze compatible XML content per clip.
 
+        :param clips: An optional list of :class:`.Clip` instances to generate
+          the XML content for, use it with the :class:`.SequenceDiff` results
+          to only generate the XMLs of the changed clips. The default is None
+          which generates the XML content of all of the clips.
         :returns: list of strings
         """
         metafuze_xml_template = """<?xml version='1.0' encoding='UTF-8'?>
@@ -404,10 +977,14 @@ class Sequence(EditBase, NameMixin, DurationMixin):
    </Group>
 </MetaFuze_BatchTranscode>"""
         rendered_xmls = []
+        if clips is not None:
+            clips = set([id(clip) for clip in clips])
         video = self.media.video
         if video is not None:
             for track in video.tracks:
                 for clip in track.clips:
+                    if clips is not None and id(clip) not in clips:
+                        continue
                     raw_file_path = \
                         clip.file.pathurl.replace('file://localhost', '')
                     raw_mxf_path = '%s%s' % (
@@ -441,10 +1018,18 @@ class Media(EditBase):
     """XML compatibility class for Sequencer
     """
 
+    __slots__ = ('video', 'audio')
+
     def __init__(self):
         self.video = None
         self.audio = None
 
+    def validate(self):
+        """validates the attribute values of the children of this Media
+        """
+        if self.video is not None:
+            self.video.validate()
+
     def from_xml(self, xml_node):
         """Fills attributes with the given XML node
 
@@ -455,34 +1040,38 @@ class Media(EditBase):
         video.from_xml(xml_video_tag)
         self.video = video
 
-    def to_xml(self, indentation=2, pre_indent=0):
-        """returns an xml version of this Media object
-        """
-        template = """%(pre_indent)s<media>
-%(video)s
-%(pre_indent)s</media>"""
+    def write_xml(self, fp, indentation=2, pre_indent=0):
+        """writes an xml version of this Media object to the given file like
+        object
 
-        video_data = self.video.to_xml(
+        :param fp: A file like object that supports ``write()``.
+        """
+        fp.write('%s<media>\n' % (' ' * pre_indent))
+        self.video.write_xml(
+            fp,
             indentation=indentation,
             pre_indent=indentation + pre_indent
         )
-
-        return template % {
-            'video': video_data,
-            'pre_indent': ' ' * pre_indent,
-            'indentation': ' ' * indentation
-        }
+        fp.write('\n%s</media>' % (' ' * pre_indent))
 
 
 class Video(EditBase):
     """XML compatibility class for Sequencer
     """
 
+    __slots__ = ('width', 'height', 'tracks')
+
     def __init__(self):
         self.width = 0
         self.height = 0
         self.tracks = []
 
+    def validate(self):
+        """validates the attribute values of the tracks of this Video
+        """
+        for track in self.tracks:
+            track.validate()
+
     def from_xml(self, xml_node):
         """Fills attributes with the given XML node
 
@@ -503,72 +1092,99 @@ class Video(EditBase):
 
             self.tracks.append(track)
 
-    def to_xml(self, indentation=2, pre_indent=0):
-        """returns an xml version of this Video object
+    def write_xml(self, fp, indentation=2, pre_indent=0):
+        """writes an xml version of this Video object to the given file like
+        object
+
+        :param fp: A file like object that supports ``write()``.
         """
-        template = """%(pre_indent)s<video>
+        header_template = """%(pre_indent)s<video>
 %(pre_indent)s%(indentation)s<format>
 %(pre_indent)s%(indentation)s%(indentation)s<samplecharacteristics>
 %(pre_indent)s%(indentation)s%(indentation)s%(indentation)s<width>%(width)s</width>
 %(pre_indent)s%(indentation)s%(indentation)s%(indentation)s<height>%(height)s</height>
 %(pre_indent)s%(indentation)s%(indentation)s</samplecharacteristics>
 %(pre_indent)s%(indentation)s</format>
-%(tracks)s
-%(pre_indent)s</video>"""
-
-        track_data = []
-        for track in self.tracks:
-            track_data.append(
-                track.to_xml(indentation=indentation,
-                             pre_indent=indentation + pre_indent)
-            )
-        track_data_as_str = '\n'.join(track_data)
-
-        return template % {
+"""
+        fp.write(header_template % {
             'width': self.width,
             'height': self.height,
-            'tracks': track_data_as_str,
             'pre_indent': ' ' * pre_indent,
             'indentation': ' ' * indentation
-        }
+        })
+
+        for i, track in enumerate(self.tracks):
+            if i:
+                fp.write('\n')
+            track.write_xml(
+                fp,
+                indentation=indentation,
+                pre_indent=indentation + pre_indent
+            )
+
+        fp.write('\n%s</video>' % (' ' * pre_indent))
 
 
 class Track(EditBase):
     """XML compatibility class for Sequencer
     """
 
+    __slots__ = ('locked', 'enabled', 'clips')
+
     def __init__(self):
         self.locked = False
         self.enabled = True
         self.clips = []
 
+    def validate(self):
+        """validates the attribute values of the clips of this Track
+        """
+        for clip in self.clips:
+            clip.validate()
+
     def optimize_clips(self):
         """optimizes files across all clips to use the same file node if two or
-        more clips are using the same files
-        """
-        # check all clip files and set to the same file node if the path is
-        # the same
-        for i in range(len(self.clips)):
-            clip = self.clips[i]
-            # go over the rest of the clips
-            for j in range(i + 1, len(self.clips)):
-                compare_clip = self.clips[j]
-                if clip.file.pathurl == compare_clip.file.pathurl:
-                    compare_clip.file = clip.file
-
-                # also check the ids
-                if clip.id == compare_clip.id:
-                    # get the id randomized part
-                    random_part = clip.id.split(' ')[-1]
-                    if random_part != clip.id:
-                        random_id = int(random_part) + 1
-                        compare_clip.id = '%s %s' % (
-                            clip.id.split(' ')[0],
-                            random_id
-                        )
-                    else:
-                        random_id = 2
-                        compare_clip.id = '%s %s' % (clip.id, random_id)
+        more clips are using the same files, and makes the clip ids unique by
+        adding a number suffix to the duplicate ids
+        """
+        # use the first file node for each pathurl
+        files_by_pathurl = {}
+        for clip in self.clips:
+            file_ = clip.file
+            if file_ is None:
+                continue
+            clip.file = files_by_pathurl.setdefault(file_.pathurl, file_)
+
+        # make the clip ids unique
+        used_ids = set()
+        # stores the last used suffix number for a (base, start) pair, so the
+        # numbers in between are not checked again and again
+        last_suffixes = {}
+        for clip in self.clips:
+            clip_id = clip.id
+            if clip_id not in used_ids:
+                used_ids.add(clip_id)
+                continue
+
+            # get the id randomized part
+            parts = clip_id.rsplit(' ', 1)
+            if len(parts) == 2 and parts[1].isdigit():
+                base = parts[0]
+                start = int(parts[1]) + 1
+            else:
+                base = clip_id
+                start = 2
+
+            suffix = last_suffixes.get((base, start), start)
+            new_id = '%s %s' % (base, suffix)
+            while new_id in used_ids:
+                suffix += 1
+                new_id = '%s %s' % (base, suffix)
+
+            last_suffixes[(base, start)] = suffix
+            used_ids.add(new_id)
+            # the new id is generated from a valid id, no need to validate it
+            clip._id = new_id
 
     def from_xml(self, xml_node):
         """Fills attributes with the given XML node
@@ -584,50 +1200,68 @@ class Track(EditBase):
             clip.from_xml(clip_tag)
             self.clips.append(clip)
 
-    def to_xml(self, indentation=2, pre_indent=0):
-        """returns an xml version of this Track object
+    def write_xml(self, fp, indentation=2, pre_indent=0):
+        """writes an xml version of this Track object to the given file like
+        object
+
+        :param fp: A file like object that supports ``write()``.
         """
-        template = """%(pre_indent)s<track>
+        header_template = """%(pre_indent)s<track>
 %(pre_indent)s%(indentation)s<locked>%(locked)s</locked>
 %(pre_indent)s%(indentation)s<enabled>%(enabled)s</enabled>
-%(clips)s
-%(pre_indent)s</track>"""
-
-        clip_data = []
-        for clip in self.clips:
-            clip_data.append(
-                clip.to_xml(indentation=indentation,
-                            pre_indent=indentation + pre_indent)
-            )
-        clip_data_as_str = '\n'.join(clip_data)
-
-        return template % {
+"""
+        fp.write(header_template % {
             'locked': str(self.locked).upper(),
             'enabled': str(self.enabled).upper(),
-            'clips': clip_data_as_str,
             'pre_indent': ' ' * pre_indent,
             'indentation': ' ' * indentation
-        }
+        })
+
+        for i, clip in enumerate(self.clips):
+            if i:
+                fp.write('\n')
+            clip.write_xml(
+                fp,
+                indentation=indentation,
+                pre_indent=indentation + pre_indent
+            )
+
+        fp.write('\n%s</track>' % (' ' * pre_indent))
 
 
-class Clip(EditBase, NameMixin, DurationMixin):
+class Clip(EditBase, CompactNameMixin, CompactDurationMixin):
     """XML compatibility class for Clip
     """
 
+    __slots__ = ('_name', '_duration', '_id', 'start', 'end', 'enabled',
+                 'in_', 'out', 'file', 'type', '_rate')
+
     def __init__(self, id=None, name='', start=0.0, end=0.0, duration=0.0,
-                 enabled=True, in_=0, out=0, type_='Video', rate=None):
-        NameMixin.__init__(self, name=name)
-        DurationMixin.__init__(self, duration=duration)
+                 enabled=True, in_=0, out=0, type_='Video', rate=None,
+                 file=None):
+        CompactNameMixin.__init__(self, name=name)
+        CompactDurationMixin.__init__(self, duration=duration)
         self._id = self._validate_id(id)
         self.start = start
         self.end = end
         self.enabled = enabled
         self.in_ = in_
         self.out = out
-        self.file = None
+        self.file = file
         self.type = type_
-        self._rate = None
-        self.rate = rate
+        self._rate = self._validate_rate(rate)
+
+    def validate(self):
+        """validates the attribute values of this Clip and its File
+        """
+        self._name = self._validate_name(self._name)
+        self._duration = self._validate_duration(self._duration)
+        self._id = self._validate_id(self._id)
+        self._rate = self._validate_rate(self._rate)
+        if self._rate is not None:
+            self._rate.validate()
+        if self.file is not None:
+            self.file.validate()
 
     @classmethod
     def _validate_rate(cls, rate):
@@ -699,28 +1333,24 @@ class Clip(EditBase, NameMixin, DurationMixin):
 
             self.file = f
 
-    def to_xml(self, indentation=2, pre_indent=0):
-        """returns an xml version of this Clip object
+    def write_xml(self, fp, indentation=2, pre_indent=0):
+        """writes an xml version of this Clip object to the given file like
+        object
+
+        :param fp: A file like object that supports ``write()``.
         """
-        template = """%(pre_indent)s<clipitem id="%(id)s">
+        header_template = """%(pre_indent)s<clipitem id="%(id)s">
 %(pre_indent)s%(indentation)s<end>%(end)i</end>
 %(pre_indent)s%(indentation)s<name>%(name)s</name>
 %(pre_indent)s%(indentation)s<enabled>%(enabled)s</enabled>
 %(pre_indent)s%(indentation)s<start>%(start)i</start>
 %(pre_indent)s%(indentation)s<in>%(in)i</in>
-%(pre_indent)s%(indentation)s<duration>%(duration)i</duration>%(rate)s
+%(pre_indent)s%(indentation)s<duration>%(duration)i</duration>"""
+        out_template = """
 %(pre_indent)s%(indentation)s<out>%(out)i</out>
-%(file)s
-%(pre_indent)s</clipitem>"""
-
-        rate_xml = ''
-        if self.rate:
-            rate_xml = '\n%s' % self.rate.to_xml(
-                indentation=indentation,
-                pre_indent=pre_indent + indentation
-            )
+"""
 
-        return template % {
+        template_vars = {
             'id': self.id,
             'start': self.start,
             'end': self.end,
@@ -729,26 +1359,48 @@ class Clip(EditBase, NameMixin, DurationMixin):
             'duration': self.duration,
             'in': self.in_,
             'out': self.out,
-            'file': self.file.to_xml(indentation=indentation,
-                                     pre_indent=pre_indent + indentation),
             'pre_indent': ' ' * pre_indent,
             'indentation': ' ' * indentation,
-            'rate': rate_xml
         }
 
+        fp.write(header_template % template_vars)
+        if self.rate:
+            fp.write('\n')
+            self.rate.write_xml(
+                fp,
+                indentation=indentation,
+                pre_indent=pre_indent + indentation
+            )
+        fp.write(out_template % template_vars)
+        self.file.write_xml(
+            fp,
+            indentation=indentation,
+            pre_indent=pre_indent + indentation
+        )
+        fp.write('\n%s</clipitem>' % (' ' * pre_indent))
+
 
-class File(EditBase, NameMixin, DurationMixin):
+class File(EditBase, CompactNameMixin, CompactDurationMixin):
     """XML compatibility class for Sequencer
     """
 
+    __slots__ = ('_name', '_duration', '_pathurl', '_id', 'exported_once')
+
     def __init__(self, duration=0, name='', pathurl=''):
-        NameMixin.__init__(self, name=name)
-        DurationMixin.__init__(self, duration=duration)
+        CompactNameMixin.__init__(self, name=name)
+        CompactDurationMixin.__init__(self, duration=duration)
         self._pathurl = self._validate_pathurl(pathurl)
-        self._id = None
-        self.id = self._pathurl
+        self._id = self._validate_id(self._pathurl)
         self.exported_once = False
 
+    def validate(self):
+        """validates the attribute values of this File
+        """
+        self._name = self._validate_name(self._name)
+        self._duration = self._validate_duration(self._duration)
+        self._pathurl = self._validate_pathurl(self._pathurl)
+        self._id = self._validate_id(self._id)
+
     @property
     def id(self):
         """the getter for the _id attribute
@@ -831,8 +1483,12 @@ class File(EditBase, NameMixin, DurationMixin):
         if pathurl_node is not None:
             self.pathurl = pathurl_node.text
 
-    def to_xml(self, indentation=2, pre_indent=0):
-        """returns an xml version of this File object
+    def write_xml(self, fp, indentation=2, pre_indent=0):
+        """writes an xml version of this File object to the given file like
+        object, the file data is written only once, the following calls will
+        only write the id of the file
+
+        :param fp: A file like object that supports ``write()``.
         """
         if self.exported_once:
             template = """%(pre_indent)s<file id="%(id)s"/>"""
@@ -844,14 +1500,14 @@ class File(EditBase, NameMixin, DurationMixin):
 %(pre_indent)s</file>"""
             self.exported_once = True
 
-        return template % {
+        fp.write(template % {
             'id': self.id,
             'duration': self.duration,
             'name': self.name,
             'pathurl': self.pathurl,
             'pre_indent': ' ' * pre_indent,
             'indentation': ' ' * indentation
-        }
+        })
 
 
 class Rate(EditBase):
@@ -867,11 +1523,17 @@ class Rate(EditBase):
     """
     __timebase_default_value = '25'
 
+    __slots__ = ('_timebase', '_ntsc')
+
     def __init__(self, timebase=None, ntsc=False):
-        self._timebase = None
-        self._ntsc = None
-        self.timebase = self._validate_timebase(timebase)
-        self.ntsc = self._validate_ntsc(ntsc)
+        self._timebase = self._validate_timebase(timebase)
+        self._ntsc = self._validate_ntsc(ntsc)
+
+    def validate(self):
+        """validates the attribute values of this Rate
+        """
+        self._timebase = self._validate_timebase(self._timebase)
+        self._ntsc = self._validate_ntsc(self._ntsc)
 
     @classmethod
     def _validate_timebase(cls, timebase):
@@ -930,6 +1592,13 @@ class Rate(EditBase):
     def ntsc(self, ntsc):
         self._ntsc = self._validate_ntsc(ntsc)
 
+    @property
+    def timecode_converter(self):
+        """returns the shared :class:`.TimecodeConverter` instance for the
+        timebase of this Rate
+        """
+        return TimecodeConverter.get(self.timebase)
+
     def from_xml(self, xml_node):
         """Fills attributes with the given XML node
 
@@ -940,16 +1609,267 @@ class Rate(EditBase):
             self.timebase = rate_tag.find('timebase').text
             self.ntsc = rate_tag.find('ntsc').text.title() == 'True'
 
-    def to_xml(self, indentation=2, pre_indent=0):
-        """returns an xml version of this Media object
+    def write_xml(self, fp, indentation=2, pre_indent=0):
+        """writes an xml version of this Rate object to the given file like
+        object
+
+        :param fp: A file like object that supports ``write()``.
         """
         template = """%(pre_indent)s<rate>
 %(pre_indent)s%(indentation)s<timebase>%(timebase)s</timebase>
 %(pre_indent)s%(indentation)s<ntsc>%(ntsc)s</ntsc>
 %(pre_indent)s</rate>"""
-        return template % {
+        fp.write(template % {
             'timebase': self.timebase,
             'ntsc': 'TRUE' if self.ntsc else 'FALSE',
             'pre_indent': ' ' * pre_indent,
             'indentation': ' ' * indentation
-        }
+        })
+
+
+class ClipChange(object):
+    """Stores the change of a clip between two Sequences.
+
+    :param str status: One of the :class:`.SequenceDiff` status values.
+    :param old_clip: The :class:`.Clip` in the old Sequence, None for added
+      clips.
+    :param new_clip: The :class:`.Clip` in the new Sequence, None for removed
+      clips.
+    :param old_track_index: The index of the track of the old clip.
+    :param new_track_index: The index of the track of the new clip.
+    """
+
+    __slots__ = ('status', 'old_clip', 'new_clip', 'old_track_index',
+                 'new_track_index')
+
+    def __init__(self, status, old_clip=None, new_clip=None,
+                 old_track_index=None, new_track_index=None):
+        self.status = status
+        self.old_clip = old_clip
+        self.new_clip = new_clip
+        self.old_track_index = old_track_index
+        self.new_track_index = new_track_index
+
+    @property
+    def clip(self):
+        """returns the new clip or the old clip for removed clips
+        """
+        return self.new_clip if self.new_clip is not None else self.old_clip
+
+    def __repr__(self):
+        return '<%s %s: %s>' % (
+            self.__class__.__name__, self.status, self.clip.id
+        )
+
+
+class SequenceDiff(object):
+    """Finds the clip changes between two :class:`.Sequence` instances.
+
+    The clips are first matched by their ids and then the unmatched ones are
+    matched by their reels (the clip names) and source ranges, so a clip that
+    is renamed in the edit is still found. Each clip is then classified as:
+
+      * ``unchanged``: nothing is changed.
+      * ``retimed``: the source side (the reel, the source range or the file)
+        of the clip is changed, the media should be transcoded again.
+      * ``moved``: only the record side (the position in the sequence or the
+        track) is changed, just the shot ranges need to be updated.
+      * ``added``: the clip only exists in the new sequence.
+      * ``removed``: the clip only exists in the old sequence.
+
+    The matching is done with dictionary lookups, so it runs in linear time.
+
+    :param old_sequence: The previous :class:`.Sequence`.
+    :param new_sequence: The new :class:`.Sequence`.
+    """
+
+    UNCHANGED = 'unchanged'
+    RETIMED = 'retimed'
+    MOVED = 'moved'
+    ADDED = 'added'
+    REMOVED = 'removed'
+
+    def __init__(self, old_sequence, new_sequence):
+        self.old_sequence = old_sequence
+        self.new_sequence = new_sequence
+        self.changes = []
+        self._diff()
+
+    @classmethod
+    def _collect_clips(cls, sequence):
+        """returns a list of (track_index, clip) tuples of the video clips of
+        the given sequence
+        """
+        clips = []
+        if sequence is None or sequence.media is None \
+           or sequence.media.video is None:
+            return clips
+        for i, track in enumerate(sequence.media.video.tracks):
+            for clip in track.clips:
+                clips.append((i, clip))
+        return clips
+
+    @classmethod
+    def _source_key(cls, clip):
+        """returns the key to match the clips by their reel and source range
+        """
+        return clip.name, clip.in_, clip.out
+
+    @classmethod
+    def _pathurl(cls, clip):
+        """returns the pathurl of the file of the given clip
+        """
+        return clip.file.pathurl if clip.file is not None else None
+
+    def _classify(self, old_track_index, old_clip, new_track_index, new_clip):
+        """returns the status of a matched clip pair
+        """
+        if self._source_key(old_clip) != self._source_key(new_clip) \
+           or self._pathurl(old_clip) != self._pathurl(new_clip):
+            return self.RETIMED
+        if old_clip.start != new_clip.start or old_clip.end != new_clip.end \
+           or old_track_index != new_track_index:
+            return self.MOVED
+        return self.UNCHANGED
+
+    def _diff(self):
+        """matches the clips and fills the changes list
+        """
+        old_clips = self._collect_clips(self.old_sequence)
+        new_clips = self._collect_clips(self.new_sequence)
+
+        # index the old clips, keep them in order for duplicate keys
+        old_by_id = {}
+        for entry in old_clips:
+            old_by_id.setdefault(entry[1].id, []).append(entry)
+
+        matched_old = set()
+        pairs = []
+        unmatched_new = []
+        for new_entry in new_clips:
+            candidates = old_by_id.get(new_entry[1].id)
+            if candidates:
+                old_entry = candidates.pop(0)
+                matched_old.add(id(old_entry[1]))
+                pairs.append((old_entry, new_entry))
+            else:
+                unmatched_new.append(new_entry)
+
+        # try to match the rest by their reels and source ranges
+        old_by_source = {}
+        for entry in old_clips:
+            if id(entry[1]) not in matched_old:
+                old_by_source.setdefault(
+                    self._source_key(entry[1]), []
+                ).append(entry)
+
+        added = []
+        for new_entry in unmatched_new:
+            candidates = old_by_source.get(self._source_key(new_entry[1]))
+            if candidates:
+                old_entry = candidates.pop(0)
+                matched_old.add(id(old_entry[1]))
+                pairs.append((old_entry, new_entry))
+            else:
+                added.append(new_entry)
+
+        # keep the changes in the order of the new sequence
+        changes_by_new_clip = {}
+        for (old_track_index, old_clip), (new_track_index, new_clip) in pairs:
+            changes_by_new_clip[id(new_clip)] = ClipChange(
+                self._classify(
+                    old_track_index, old_clip, new_track_index, new_clip
+                ),
+                old_clip=old_clip,
+                new_clip=new_clip,
+                old_track_index=old_track_index,
+                new_track_index=new_track_index
+            )
+
+        for new_track_index, new_clip in added:
+            changes_by_new_clip[id(new_clip)] = ClipChange(
+                self.ADDED,
+                new_clip=new_clip,
+                new_track_index=new_track_index
+            )
+
+        self.changes = [
+            changes_by_new_clip[id(new_clip)] for i, new_clip in new_clips
+        ]
+
+        for old_track_index, old_clip in old_clips:
+            if id(old_clip) not in matched_old:
+                self.changes.append(
+                    ClipChange(
+                        self.REMOVED,
+                        old_clip=old_clip,
+                        old_track_index=old_track_index
+                    )
+                )
+
+    def get_changes(self, *statuses):
+        """returns the changes with the given statuses
+
+        :param statuses: The status values, like ``SequenceDiff.RETIMED``.
+        :return: list of :class:`.ClipChange`
+        """
+        return [change for change in self.changes if change.status in statuses]
+
+    @property
+    def unchanged(self):
+        """returns the unchanged clip changes
+        """
+        return self.get_changes(self.UNCHANGED)
+
+    @property
+    def retimed(self):
+        """returns the retimed clip changes
+        """
+        return self.get_changes(self.RETIMED)
+
+    @property
+    def moved(self):
+        """returns the moved clip changes
+        """
+        return self.get_changes(self.MOVED)
+
+    @property
+    def added(self):
+        """returns the added clip changes
+        """
+        return self.get_changes(self.ADDED)
+
+    @property
+    def removed(self):
+        """returns the removed clip changes
+        """
+        return self.get_changes(self.REMOVED)
+
+    @property
+    def has_changes(self):
+        """returns True if there is any change between the sequences
+        """
+        for change in self.changes:
+            if change.status != self.UNCHANGED:
+                return True
+        return False
+
+    @property
+    def clips_to_transcode(self):
+        """returns the clips of the new sequence which need their media to be
+        transcoded again, these are the added and retimed clips
+        """
+        return [change.new_clip
+                for change in self.get_changes(self.RETIMED, self.ADDED)]
+
+    @property
+    def clips_to_update(self):
+        """returns the clips of the new sequence which need their ranges to be
+        updated, these are the added, retimed and moved clips
+        """
+        return [
+            change.new_clip
+            for change in self.get_changes(
+                self.RETIMED, self.MOVED, self.ADDED
+            )
+        ]
@@ -114,7 +114,15 @@ class Avid2Resolve(object):
         """converts event paths with proper ones
         """
         from stalker import Shot
-        import timecode
+        from anima.edit import TimecodeConverter
+
+        # set the in and out points correctly
+        # stupid AVID places the source clips to either 8th or 1st hour
+        converter = TimecodeConverter.get(self.fps)
+        first_hour = converter.to_frame('01:00:00:00')
+        eigth_hour = converter.to_frame('07:59:00:00')
+        twelfth_hour = converter.to_frame('11:59:00:00')
+
         # do a db connection
         for e in self.events:
             # get the reel which shows the shot name
@@ -131,20 +139,18 @@ class Avid2Resolve(object):
                 else:
                     e.source_file = ''
 
-            # set the in and out points correctly
-            # stupid AVID places the source clips to either 8th or 1st hour
-            first_hour = timecode.Timecode(self.fps, start_timecode='01:00:00:00')
-            eigth_hour = timecode.Timecode(self.fps, start_timecode='07:59:00:00')
-            twelfth_hour = timecode.Timecode(self.fps, start_timecode='11:59:00:00')
-            if e.src_start_tc.frames >= twelfth_hour.frames:
-                e.src_start_tc -= twelfth_hour - 1
-                e.src_end_tc -= twelfth_hour - 1
-            elif e.src_start_tc.frames >= eigth_hour.frames:
-                e.src_start_tc -= eigth_hour - 1
-                e.src_end_tc -= eigth_hour - 1
-            elif e.src_start_tc.frames >= first_hour.frames:
-                e.src_start_tc -= first_hour - 1
-                e.src_end_tc -= first_hour - 1
+            src_start_frame = e.src_start_tc.frame_number
+            if src_start_frame >= twelfth_hour:
+                offset = twelfth_hour
+            elif src_start_frame >= eigth_hour:
+                offset = eigth_hour
+            elif src_start_frame >= first_hour:
+                offset = first_hour
+            else:
+                continue
+
+            e.src_start_tc.frames -= offset
+            e.src_end_tc.frames -= offset
 
     def to_xml(self):
         """return an eml version of this edl
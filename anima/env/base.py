@@ -70,6 +70,7 @@ class EnvironmentBase(object):
     has_publishers = False
     allow_publish_on_export = False
     extensions = []
+    version_query_batch_size = 500
 
     def __init__(self, name="", version=None):
         self._name = name
@@ -139,22 +140,8 @@ class EnvironmentBase(object):
         :param path: The path that wanted to be trimmed
         :return: str
         """
-        # get the repo first
-        repo = self.find_repo(path)
-
-        if not repo:
-            return path
-
-        # then try to trim the path
-        if path.startswith(repo.path):
-            return path[len(repo.path):]
-        elif path.startswith(repo.windows_path):
-            return path[len(repo.windows_path):]
-        elif path.startswith(repo.linux_path):
-            return path[len(repo.linux_path):]
-        elif path.startswith(repo.osx_path):
-            return path[len(repo.osx_path):]
-        return path
+        from anima.repository import RepositoryIndex
+        return RepositoryIndex.get().trim_repo_path(path)
 
     @classmethod
     def find_repo(cls, path):
@@ -163,9 +150,9 @@ class EnvironmentBase(object):
         :param str path: path in a repository
         :return: stalker.models.repository.Repository
         """
-        # first find the repository
-        from stalker import Repository
-        return Repository.find_repo(path)
+        # use the in memory index of the repository paths
+        from anima.repository import RepositoryIndex
+        return RepositoryIndex.get().find_repo(path)
 
     def get_versions_from_path(self, path):
         """Finds Version instances from the given path value.
@@ -192,8 +179,9 @@ class EnvironmentBase(object):
 
         # convert '\\' to '/'
         path = os.path.normpath(path).replace('\\', '/')
-        from stalker import Repository
-        os_independent_path = Repository.to_os_independent_path(path)
+        from anima.repository import RepositoryIndex
+        os_independent_path = \
+            RepositoryIndex.get().to_os_independent_path(path)
         logger.debug('os_independent_path: %s' % os_independent_path)
 
         from stalker import Version
@@ -221,22 +209,47 @@ class EnvironmentBase(object):
         :return: :class:`~stalker.models.version.Version`
         """
         logger.debug('full_path: %s' % full_path)
-        # convert '\\' to '/'
-        full_path = os.path.normpath(
-            os.path.expandvars(full_path)
-        ).replace('\\', '/')
+        version = cls.get_versions_from_full_paths([full_path])[0]
+        logger.debug('version: %s' % version)
+        return version
 
-        # trim repo path
-        from stalker import Repository, Version
-        os_independent_path = Repository.to_os_independent_path(full_path)
+    @classmethod
+    def get_versions_from_full_paths(cls, full_paths):
+        """Finds the Version instances of the given full_path values.
 
-        # try to get a version with that info
-        logger.debug('getting a version with path: %s' % full_path)
+        All the paths are converted to os independent paths and the Versions
+        are queried in batches of :attr:`.version_query_batch_size` paths, so
+        resolving a long list of paths doesn't run one query per path.
 
-        version = Version.query\
-            .filter(Version.full_path == os_independent_path).first()
-        logger.debug('version: %s' % version)
-        return version
+        :param full_paths: A list of full paths.
+
+        :return: A list of :class:`~stalker.models.version.Version` instances
+          in the same order with the given paths, the items are None for the
+          paths that don't match any Version.
+        """
+        from stalker import Version
+        from anima.repository import RepositoryIndex
+
+        # convert '\\' to '/' and trim repo path
+        os_independent_paths = \
+            RepositoryIndex.get().to_os_independent_paths([
+                os.path.normpath(
+                    os.path.expandvars(full_path)
+                ).replace('\\', '/')
+                for full_path in full_paths
+            ])
+
+        unique_paths = list(set(os_independent_paths))
+        versions_by_path = {}
+        batch_size = cls.version_query_batch_size
+        for i in range(0, len(unique_paths), batch_size):
+            batch = unique_paths[i:i + batch_size]
+            logger.debug('getting versions with paths: %s' % batch)
+            for version in Version.query\
+                    .filter(Version.full_path.in_(batch)).all():
+                versions_by_path.setdefault(version.full_path, version)
+
+        return [versions_by_path.get(path) for path in os_independent_paths]
 
     def get_current_version(self):
         """Returns the current Version instance from the environment.
@@ -248,9 +261,12 @@ class EnvironmentBase(object):
     def append_to_recent_files(self, path):
         """appends the given path to the recent files list
         """
-        # add the file to the recent file list
-        rfm = RecentFileManager()
-        rfm.add(self.name, path)
+        # add the file to the recent file list, the save is debounced so
+        # opening or saving a file doesn't wait for the recent files to be
+        # written
+        rfm = RecentFileManager.get()
+        rfm.add(self.name, path, save=False)
+        rfm.save_later()
 
     def get_version_from_recent_files(self):
         """This will try to create a :class:`.Version` instance by looking at
@@ -275,8 +291,9 @@ class EnvironmentBase(object):
             recent_files = None
 
         if recent_files is not None:
-            for recent_file in recent_files:
-                version = self.get_version_from_full_path(recent_file)
+            # resolve all of the recent files at once and return the first
+            # match in recent order
+            for version in self.get_versions_from_full_paths(recent_files):
                 if version is not None:
                     break
 
@@ -408,15 +425,23 @@ class EnvironmentBase(object):
         if caller:
             caller.step()
 
-        # reverse walk in DFS
-        dfs_version_references = []
-
         version = self.get_current_version()
         if not version:
             return reference_resolution
 
-        for v in version.walk_inputs():
-            dfs_version_references.append(v)
+        # load the whole input graph and the latest published versions at once
+        inputs_by_id, versions_by_id, latest_by_id, latest_inputs_by_id = \
+            self.get_version_input_graph(version)
+
+        # reverse walk in DFS, the graph is walked in memory so walking over
+        # the same versions that are referenced from different versions
+        # doesn't cost anything
+        dfs_version_references = []
+        ids_to_visit = [version.id]
+        while ids_to_visit:
+            current_id = ids_to_visit.pop(0)
+            ids_to_visit[0:0] = inputs_by_id.get(current_id, [])
+            dfs_version_references.append(current_id)
 
         if caller:
             caller.step()
@@ -432,67 +457,187 @@ class EnvironmentBase(object):
             '%s.check_referenced_versions()' % self.__class__.__name__
         )
 
+        def is_latest_published_version(version_id):
+            """the in memory version of Version.is_latest_published_version()
+            """
+            return versions_by_id[version_id].is_published \
+                and latest_by_id.get(version_id) == version_id
+
+        actions_by_id = {}
+        update_ids = set()
+        create_ids = set()
+
         # iterate back in the list
-        for v in reversed(dfs_version_references):
-            # check inputs first
-            to_be_updated_list = []
-            for ref_v in v.inputs:
-                if not ref_v.is_latest_published_version():
-                    to_be_updated_list.append(ref_v)
-
-            if to_be_updated_list:
-                action = 'create'
-                # check if there is a new published version of this version
-                # that is using all the updated versions of the references
-                latest_published_version = v.latest_published_version
-                if latest_published_version and \
-                        not v.is_latest_published_version():
-                    # so there is a new published version
-                    # check if its children needs any update
-                    # and the updated child versions are already
-                    # referenced to the this published version
-                    if all([ref_v.latest_published_version
-                            in latest_published_version.inputs
-                            for ref_v in to_be_updated_list]):
-                        # so all new versions are referenced to this published
-                        # version, just update to this latest published version
-                        action = 'update'
+        for v_id in reversed(dfs_version_references):
+            v = versions_by_id[v_id]
+            action = actions_by_id.get(v_id)
+            if action is None:
+                input_ids = inputs_by_id.get(v_id, [])
+
+                # check inputs first
+                to_be_updated_list = [
+                    ref_v_id for ref_v_id in input_ids
+                    if not is_latest_published_version(ref_v_id)
+                ]
+
+                if to_be_updated_list:
+                    action = 'create'
+                    # check if there is a new published version of this
+                    # version that is using all the updated versions of the
+                    # references
+                    latest_published_version_id = latest_by_id.get(v_id)
+                    if latest_published_version_id is not None and \
+                            not is_latest_published_version(v_id):
+                        # so there is a new published version
+                        # check if its children needs any update
+                        # and the updated child versions are already
+                        # referenced to the this published version
+                        latest_inputs = latest_inputs_by_id.get(
+                            latest_published_version_id, set()
+                        )
+                        if all([latest_by_id.get(ref_v_id) in latest_inputs
+                                for ref_v_id in to_be_updated_list]):
+                            # so all new versions are referenced to this
+                            # published version, just update to this latest
+                            # published version
+                            action = 'update'
+                else:
+                    # nothing needs to be updated,
+                    # so check if this version has a new version,
+                    # also there could be no reference under this referenced
+                    # version
+                    if is_latest_published_version(v_id):
+                        # do nothing
+                        action = 'leave'
                     else:
-                        # not all references are in the inputs
-                        # so we need to create a new version as usual
-                        # and update the references to the latest versions
+                        # update to latest published version
+                        action = 'update'
+
+                    # before setting the action check all the inputs in
+                    # resolution_dictionary, if any of them are update, or
+                    # create then set this one to 'create'
+                    if any(ref_v_id in update_ids or ref_v_id in create_ids
+                           for ref_v_id in input_ids):
                         action = 'create'
-            else:
-                # nothing needs to be updated,
-                # so check if this version has a new version,
-                # also there could be no reference under this referenced
-                # version
-                if v.is_latest_published_version():
-                    # do nothing
-                    action = 'leave'
-                else:
-                    # update to latest published version
-                    action = 'update'
-
-                # before setting the action check all the inputs in
-                # resolution_dictionary, if any of them are update, or create
-                # then set this one to 'create'
-                if any(rev_v in reference_resolution['update'] or
-                       rev_v in reference_resolution['create']
-                       for rev_v in v.inputs):
-                    action = 'create'
+
+                actions_by_id[v_id] = action
+                if action == 'update':
+                    update_ids.add(v_id)
+                elif action == 'create':
+                    create_ids.add(v_id)
 
             # so append this v to the related action list
             reference_resolution[action].append(v)
 
-            # from stalker import Version
-            # assert isinstance(v, Version)
             caller.step(message=v.nice_name)
 
         caller.end_progress()
 
         return reference_resolution
 
+    @classmethod
+    def get_version_input_graph(cls, version):
+        """Loads the deep inputs of the given version and the latest published
+        versions of all of them with a constant number of queries.
+
+        The inputs are walked in the database with a recursive query over the
+        ``Version_Inputs`` table, then the Versions, their latest published
+        versions and the inputs of the latest published versions are queried
+        in one go.
+
+        :param version: A :class:`~stalker.models.version.Version` instance.
+        :return: A tuple of four dictionaries, all keyed by the version ids:
+
+          * the list of input version ids,
+          * the :class:`~stalker.models.version.Version` instances,
+          * the id of the latest published version of the version, this is
+            missing for versions that doesn't have any published version,
+          * the set of input version ids of the latest published versions.
+        """
+        from sqlalchemy import and_, func
+        from sqlalchemy.orm import aliased
+        from stalker import Version
+        from stalker.db.session import DBSession
+        from stalker.models.version import Version_Inputs
+
+        # walk the inputs with a recursive CTE
+        inputs = DBSession.query(
+            Version_Inputs.c.version_id,
+            Version_Inputs.c.link_id
+        ).filter(Version_Inputs.c.version_id == version.id)\
+            .cte(name='deep_inputs', recursive=True)
+        parent_inputs = aliased(inputs, name='parent_inputs')
+        inputs = inputs.union(
+            DBSession.query(
+                Version_Inputs.c.version_id,
+                Version_Inputs.c.link_id
+            ).filter(Version_Inputs.c.version_id == parent_inputs.c.link_id)
+        )
+        edges = DBSession.query(inputs.c.version_id, inputs.c.link_id).all()
+
+        # query the versions
+        version_ids = set([version.id])
+        for version_id, link_id in edges:
+            version_ids.add(link_id)
+
+        batch_size = cls.version_query_batch_size
+        versions_by_id = {version.id: version}
+        version_ids = list(version_ids)
+        for i in range(0, len(version_ids), batch_size):
+            for v in Version.query\
+                    .filter(Version.id.in_(version_ids[i:i + batch_size]))\
+                    .all():
+                versions_by_id[v.id] = v
+
+        # the inputs that are not a Version are skipped
+        inputs_by_id = {}
+        for version_id, link_id in edges:
+            if link_id in versions_by_id:
+                inputs_by_id.setdefault(version_id, []).append(link_id)
+
+        # query the latest published versions per task and take
+        task_ids = list(set([v.task_id for v in versions_by_id.values()]))
+        latest_by_key = {}
+        for i in range(0, len(task_ids), batch_size):
+            latest_version_numbers = DBSession.query(
+                Version.task_id,
+                Version.take_name,
+                func.max(Version.version_number).label('version_number')
+            ).filter(Version.task_id.in_(task_ids[i:i + batch_size]))\
+                .filter(Version.is_published == True)\
+                .group_by(Version.task_id, Version.take_name)\
+                .subquery()
+
+            for v in Version.query.join(
+                    latest_version_numbers,
+                    and_(
+                        Version.task_id == latest_version_numbers.c.task_id,
+                        Version.take_name ==
+                        latest_version_numbers.c.take_name,
+                        Version.version_number ==
+                        latest_version_numbers.c.version_number
+                    )).filter(Version.is_published == True).all():
+                latest_by_key[(v.task_id, v.take_name)] = v.id
+
+        latest_by_id = {}
+        for v in versions_by_id.values():
+            latest_id = latest_by_key.get((v.task_id, v.take_name))
+            if latest_id is not None:
+                latest_by_id[v.id] = latest_id
+
+        # and the inputs of the latest published versions
+        latest_ids = list(set(latest_by_key.values()))
+        latest_inputs_by_id = {}
+        for i in range(0, len(latest_ids), batch_size):
+            for version_id, link_id in DBSession.query(
+                    Version_Inputs.c.version_id,
+                    Version_Inputs.c.link_id)\
+                    .filter(Version_Inputs.c.version_id.in_(
+                        latest_ids[i:i + batch_size])).all():
+                latest_inputs_by_id.setdefault(version_id, set()).add(link_id)
+
+        return inputs_by_id, versions_by_id, latest_by_id, latest_inputs_by_id
+
     def get_referenced_versions(self, parent_ref=None):
         """Returns the :class:`~stalker.models.version.Version` instances which
         are referenced in to the current scene
@@ -636,23 +781,24 @@ class EnvironmentBase(object):
     def create_local_copy(cls, version):
         """Creates a local copy of the given version
 
+        The copy is done by the :class:`anima.backup.LocalBackupService` in a
+        background thread, so this method returns immediately.
+
         :param version:
         :return:
         """
-        output_path = os.path.join(
-            cls.local_backup_path(),
-            version.absolute_path.replace(':', '')
-        ).replace('\\', '/')
+        from anima.backup import LocalBackupService
+        backup_path = cls.local_backup_path()
 
         output_full_path = os.path.join(
-            cls.local_backup_path(),
+            backup_path,
             version.absolute_full_path.replace(':', '')
         ).replace('\\', '/')
 
         # do nothing if the version and the copy is on the same drive
         # (ex: do not duplicate the file)
-        if len(os.path.commonprefix([output_full_path,
-                                     version.absolute_full_path])):
+        if LocalBackupService.is_on_same_device(backup_path,
+                                                version.absolute_full_path):
             logger.debug(
                 'Local copy file: %s is on the same drive with the source '
                 'file: %s' % (output_full_path, version.absolute_full_path)
@@ -660,25 +806,10 @@ class EnvironmentBase(object):
             logger.debug('Not duplicating it!')
             return
 
-        # create intermediate folders
-        try:
-            os.makedirs(output_path)
-        except OSError:
-            # already exists
-            pass
-
-        import shutil
-
-        try:
-            shutil.copy(
-                version.absolute_full_path,
-                output_full_path
-            )
-        except IOError:
-            # no space left
-            pass
-
-        logger.debug('created copy to: %s' % output_full_path)
+        LocalBackupService.get(backup_path).submit(
+            version.absolute_full_path,
+            output_full_path
+        )
 
     @classmethod
     def get_shot(cls, version):
@@ -16,7 +16,6 @@ except ImportError:
 from anima import logger
 from anima.env import empty_reference_resolution
 from anima.env.base import EnvironmentBase
-from anima.recent import RecentFileManager
 
 
 class Fusion(EnvironmentBase):
@@ -293,8 +292,7 @@ class Fusion(EnvironmentBase):
         # create a local copy
         self.create_local_copy(version)
 
-        rfm = RecentFileManager()
-        rfm.add(self.name, version.absolute_full_path)
+        self.append_to_recent_files(version.absolute_full_path)
 
         return True
 
@@ -379,8 +377,7 @@ class Fusion(EnvironmentBase):
 
         self.fusion.LoadComp(version_full_path.encode())
 
-        rfm = RecentFileManager()
-        rfm.add(self.name, version.absolute_full_path)
+        self.append_to_recent_files(version.absolute_full_path)
 
         # # set the project_directory
         # self.project_directory = os.path.dirname(version.absolute_path)
@@ -416,37 +413,6 @@ class Fusion(EnvironmentBase):
         ).replace('\\', '/')
         return self.get_version_from_full_path(full_path)
 
-    def get_version_from_recent_files(self):
-        """It will try to create a
-        :class:`~oyProjectManager.models.version.Version` instance by looking
-        at the recent files list.
-
-        It will return None if it can not find one.
-
-        :return: :class:`~oyProjectManager.models.version.Version`
-        """
-        # full_path = self.fusion_prefs["LastCompFile"]
-        # return self.get_version_from_full_path(full_path)
-
-        version = None
-        rfm = RecentFileManager()
-
-        try:
-            recent_files = rfm[self.name]
-        except KeyError:
-            logger.debug('no recent files')
-            recent_files = None
-
-        if recent_files is not None:
-            for i in range(len(recent_files)):
-                version = self.get_version_from_full_path(recent_files[i])
-                if version is not None:
-                    break
-
-            logger.debug("version from recent files is: %s" % version)
-
-        return version
-
     def get_version_from_project_dir(self):
         """Tries to find a Version from the current project directory
 
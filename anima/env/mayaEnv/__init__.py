@@ -17,6 +17,7 @@ from anima.env import empty_reference_resolution
 from anima.env.base import EnvironmentBase
 from anima.env.mayaEnv import extension  # register extensions
 from anima.exc import PublishError
+from anima.perf import trace
 from anima.representation import Representation
 from anima.ui.progress_dialog import ProgressDialogManager
 
@@ -275,6 +276,7 @@ workspace -fr "furAttrMap" "Outputs/data/renderData/fur/furAttrMap";
         logger.debug('set_arnold_texture_search_path() took '
                      '%f seconds' % (end - start))
 
+    @trace('Maya.save_as')
     def save_as(self, version, run_pre_publishers=True):
         """The save_as action for maya environment.
 
@@ -457,6 +459,7 @@ workspace -fr "furAttrMap" "Outputs/data/renderData/fur/furAttrMap";
         logger.debug('save_as took %f seconds' % (end - start))
         return True
 
+    @trace('Maya.export_as')
     def export_as(self, version):
         """the export action for maya environment
         """
@@ -512,6 +515,7 @@ workspace -fr "furAttrMap" "Outputs/data/renderData/fur/furAttrMap";
 
         return True
 
+    @trace('Maya.open')
     def open(self, version, force=False, representation=None,
              reference_depth=0, skip_update_check=False, prompt=True):
         """The open action for Maya environment.
@@ -577,9 +581,11 @@ workspace -fr "furAttrMap" "Outputs/data/renderData/fur/furAttrMap";
                     prompt=prompt
                 )
                 # list all references and switch their paths
-                for ref in pm.listReferences():
+                references = pm.listReferences()
+                resolver = self.load_representations(references)
+                for ref in references:
                     logger.debug('switching: %s' % ref.path)
-                    ref.to_repr(representation)
+                    ref.to_repr(representation, resolver=resolver)
                     # force load reference
                     ref.load()
             else:
@@ -651,6 +657,7 @@ workspace -fr "furAttrMap" "Outputs/data/renderData/fur/furAttrMap";
             )
         return True
 
+    @trace('Maya.reference')
     def reference(self, version, use_namespace=True):
         """References the given Version instance to the current Maya scene.
 
@@ -1007,9 +1014,28 @@ workspace -fr "furAttrMap" "Outputs/data/renderData/fur/furAttrMap";
         """
         from anima import __string_types__
         assert isinstance(path, __string_types__)
-        path = os.path.expandvars(path)
-        repo = cls.find_repo(path)
-        return repo is not None
+        from anima.repository import RepositoryIndex
+        return RepositoryIndex.get().is_in_repo(os.path.expandvars(path))
+
+    @classmethod
+    def load_representations(cls, references):
+        """loads the representations of the versions of the given references
+        with a constant number of queries, so switching the references to
+        other representations doesn't query the database per reference
+
+        :param references: A list of pymel FileReference instances.
+        :return: :class:`anima.representation.RepresentationResolver` that
+          also stores the versions of the given references, pass it to the
+          representation methods of the references, like
+          ``FileReference.to_repr()``.
+        """
+        from anima.representation import RepresentationResolver
+        paths = [ref.path for ref in references]
+        versions = cls.get_versions_from_full_paths(paths)
+        resolver = RepresentationResolver()
+        resolver.set_versions(paths, versions)
+        resolver.load(versions)
+        return resolver
 
     @classmethod
     def move_to_local(cls, version, file_path, type_name):
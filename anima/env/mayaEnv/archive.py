@@ -138,8 +138,8 @@ sourceimages/3dPaintTextures"""
         """
         # create a new Default Project
         tempdir = tempfile.gettempdir()
-        from stalker import Repository
-        all_repos = Repository.query.all()
+        from anima.repository import RepositoryIndex
+        repo_index = RepositoryIndex.get()
 
         default_project_path = \
             self.create_default_project(path=tempdir, name=project_name)
@@ -160,9 +160,7 @@ sourceimages/3dPaintTextures"""
                     continue
 
             # fix different OS paths
-            for repo in all_repos:
-                if repo.is_in_repo(ref_path):
-                    ref_path = repo.to_native_path(ref_path)
+            ref_path = repo_index.to_native_path(ref_path)
 
             new_ref_paths = \
                 self._move_file_and_fix_references(
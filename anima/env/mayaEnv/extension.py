@@ -98,138 +98,174 @@ class FileReferenceExtension(object):
         return None
 
     @extends(FileReference)
-    def to_repr(self, repr_name):
+    def get_version(self, resolver=None):
+        """returns the Stalker Version instance related to this reference
+
+        :param resolver: A :class:`anima.representation.RepresentationResolver`
+          instance, the version is taken from it if it is stored there by
+          :meth:`anima.env.mayaEnv.Maya.load_representations`, otherwise it is
+          queried and stored in the resolver.
+        :return: :class:`.Version`
+        """
+        path = self.path
+        if resolver is not None and resolver.has_version(path):
+            return resolver.get_version(path)
+
+        from anima.env.mayaEnv import Maya
+        m = Maya()
+        v = m.get_version_from_full_path(path)
+        if resolver is not None:
+            resolver.set_versions([path], [v])
+        return v
+
+    @extends(FileReference)
+    def get_representation(self, resolver=None):
+        """returns the :class:`.Representation` of the related version or None
+
+        :param resolver: A :class:`anima.representation.RepresentationResolver`
+          instance that is shared by the references of the same operation, a
+          new one is used if it is not given.
+        """
+        v = self.get_version(resolver=resolver)
+        if v is None:
+            return None
+        return Representation(version=v, resolver=resolver)
+
+    @extends(FileReference)
+    def to_repr(self, repr_name, resolver=None):
         """Replaces the current reference with the representation with the
         given repr_name.
 
         :param str repr_name: The desired repr name
+        :param resolver: A :class:`anima.representation.RepresentationResolver`
+          instance that is shared by the references of the same operation, a
+          new one is used if it is not given.
         :return:
         """
-        rep_v = self.find_repr(repr_name)
+        rep = self.get_representation(resolver=resolver)
+        if rep is None:
+            return
+
+        rep_v = rep.find(repr_name)
         from stalker import Repository
-        if rep_v is not None and rep_v != self.version:
+        if rep_v is not None and rep_v != rep.version:
             self.replaceWith(
                 Repository.to_os_independent_path(rep_v.absolute_full_path)
             )
+            if resolver is not None:
+                resolver.set_versions([self.path], [rep_v])
 
     @extends(FileReference)
-    def find_repr(self, repr_name):
+    def find_repr(self, repr_name, resolver=None):
         """Finds the representation with the given repr_name.
 
         :param str repr_name: The desired repr name
+        :param resolver: A :class:`anima.representation.RepresentationResolver`
+          instance, a new one is used if it is not given.
         :return: :class:`.Version`
         """
-        from anima.env.mayaEnv import Maya
-        m = Maya()
-        v = m.get_version_from_full_path(self.path)
-
-        if v is None:
+        rep = self.get_representation(resolver=resolver)
+        if rep is None:
             return
 
-        rep = Representation(version=v)
-        rep_v = rep.find(repr_name)
-
-        return rep_v
+        return rep.find(repr_name)
 
     @extends(FileReference)
-    def list_all_repr(self):
+    def list_all_repr(self, resolver=None):
         """Returns a list of strings representing all the representation names
         of this FileReference
 
+        :param resolver: A :class:`anima.representation.RepresentationResolver`
+          instance, a new one is used if it is not given.
         :return: list of str
         """
-        from anima.env.mayaEnv import Maya
-        m = Maya()
-        v = m.get_version_from_full_path(self.path)
-
-        if v is None:
+        rep = self.get_representation(resolver=resolver)
+        if rep is None:
             return []
 
-        rep = Representation(version=v)
         return rep.list_all()
 
     @extends(FileReference)
-    def to_base(self):
+    def to_base(self, resolver=None):
         """Loads the original version
         """
-        self.to_repr(Representation.base_repr_name)
+        self.to_repr(Representation.base_repr_name, resolver=resolver)
 
     @extends(FileReference)
-    def is_base(self):
+    def is_base(self, resolver=None):
         """returns True or False depending to if this is the base
         representation for this reference
-        """
-        from anima.env.mayaEnv import Maya
-        m = Maya()
-        v = m.get_version_from_full_path(self.path)
 
-        if v is None:
+        :param resolver: A :class:`anima.representation.RepresentationResolver`
+          instance, a new one is used if it is not given.
+        """
+        rep = self.get_representation(resolver=resolver)
+        if rep is None:
             return True
 
-        rep = Representation(version=v)
         return rep.is_base()
 
     @extends(FileReference)
-    def has_repr(self, repr_name):
+    def has_repr(self, repr_name, resolver=None):
         """checks if the reference has the given representation
 
         :param str repr_name: The name of the desired representation
+        :param resolver: A :class:`anima.representation.RepresentationResolver`
+          instance, a new one is used if it is not given.
         :return:
         """
-        from anima.env.mayaEnv import Maya
-        m = Maya()
-        v = m.get_version_from_full_path(self.path)
-
-        if v is None:
+        rep = self.get_representation(resolver=resolver)
+        if rep is None:
             return False
 
-        rep = Representation(version=v)
         return rep.has_repr(repr_name)
 
     @extends(FileReference)
-    def is_repr(self, repr_name):
+    def is_repr(self, repr_name, resolver=None):
         """returns True or False depending to if this is the requested repr
 
         :param str repr_name: The representation name
+        :param resolver: A :class:`anima.representation.RepresentationResolver`
+          instance, a new one is used if it is not given.
         :return:
         """
-        from anima.env.mayaEnv import Maya
-        m = Maya()
-        v = m.get_version_from_full_path(self.path)
-
-        if v is None:
+        rep = self.get_representation(resolver=resolver)
+        if rep is None:
             return False
 
-        rep = Representation(version=v)
         return rep.is_repr(repr_name=repr_name)
 
     @extends(FileReference)
-    @property
-    def repr(self):
-        """the representation name of the related version
-        """
-        from anima.env.mayaEnv import Maya
-        m = Maya()
-        v = m.get_version_from_full_path(self.path)
+    def get_repr(self, resolver=None):
+        """returns the representation name of the related version
 
-        if v is None:
+        :param resolver: A :class:`anima.representation.RepresentationResolver`
+          instance, a new one is used if it is not given.
+        """
+        rep = self.get_representation(resolver=resolver)
+        if rep is None:
             return None
 
-        rep = Representation(version=v)
         return rep.repr
 
     @extends(FileReference)
-    def get_base(self):
-        """returns the base version instance
+    @property
+    def repr(self):
+        """the representation name of the related version
         """
-        from anima.env.mayaEnv import Maya
-        m = Maya()
-        v = m.get_version_from_full_path(self.path)
+        return self.get_repr()
 
-        if v is None:
+    @extends(FileReference)
+    def get_base(self, resolver=None):
+        """returns the base version instance
+
+        :param resolver: A :class:`anima.representation.RepresentationResolver`
+          instance, a new one is used if it is not given.
+        """
+        rep = self.get_representation(resolver=resolver)
+        if rep is None:
             return True
 
-        rep = Representation(version=v)
         return rep.find(rep.base_repr_name)
 
     @extends(FileReference)
@@ -237,9 +273,7 @@ class FileReferenceExtension(object):
     def version(self):
         """returns the Stalker Version instance related to this reference
         """
-        from anima.env.mayaEnv import Maya
-        m = Maya()
-        return m.get_version_from_full_path(self.path)
+        return self.get_version()
 
 
 class SequenceManagerExtension(object):
@@ -470,19 +504,12 @@ class SequenceManagerExtension(object):
                 (self.__class__.__name__, path.__class__.__name__)
             )
 
-        from xml.etree import ElementTree
-
+        seq = Sequence()
         try:
-            tree = ElementTree.parse(path)
+            seq.read_xml(path)
         except IOError:
             raise IOError('Please supply a valid path to an XML file!')
 
-        root = tree.getroot()
-        seq = Sequence()
-        xml_seq = root.getchildren()[0]
-
-        seq.from_xml(xml_seq)
-
         self.from_seq(seq)
 
     @extends(pm.nodetypes.SequenceManager)
@@ -16,6 +16,7 @@ import pymel.core as pm
 from pymel import core as pm
 from stalker import LocalSession
 from anima.env import mayaEnv
+from anima.perf import trace
 
 
 class ShotExporter2(object):
@@ -41,12 +42,14 @@ class ShotExporter2(object):
         for shot in self.shot_list:
             shot_name = shot.full_shot_name
 
+    @trace('ShotExporter2.export_all_shots')
     def export_all_shots(self):
         """exports all shots in the scene
         """
         for shot in self.shot_list:
             self.export(shot)
 
+    @trace('ShotExporter2.export')
     def export(self, shot):
         """exports the given shot
         """
@@ -504,28 +507,21 @@ class ShotExporter(object):
         # query all shots in sequencer
         self.shot_list = self.sequencer.shots.get()
 
-        # query shots in time based descending order
+        # index the shots by their sequence ranges, the sequence end time is
+        # included in the shot, so add 1 to get a half open range
+        from anima.edit import IntervalIndex
         shots = self.shot_list
-        shots_sorted = []
-        shots_mid_frames = []
-        mid_frames = []
+        shot_ranges = []
+        mid_frames = {}
         for shot in shots:
             start = shot.getSequenceStartTime()
             end = shot.getSequenceEndTime()
-            mid_frame = int(start+((end-start)/2))
-            shots_mid_frames.append([shot, mid_frame])
-            mid_frames.append(mid_frame)
-
-        mid_frames.sort()
-        inc = -1
-        for frame in mid_frames:
-            inc += 1
-            for shot in shots_mid_frames:
-                if frame == shot[1]:
-                    if shot[0] not in shots_sorted:
-                        shots_sorted.append(shot[0])
+            shot_ranges.append((start, end + 1, shot))
+            mid_frames[shot] = int(start+((end-start)/2))
+        self.shot_index = IntervalIndex(shot_ranges)
 
-        self.shots_descending = shots_sorted
+        # query shots in time based descending order
+        self.shots_descending = sorted(shots, key=lambda x: mid_frames[x])
 
         # query all shot tasks from current scene
         shot_task = None
@@ -619,39 +615,33 @@ class ShotExporter(object):
     def check_shot_overlapping(self):
         """check if any shots are overlapping
         """
-        shots_sorted = self.shots_descending
-
-        if len(shots_sorted) > 1:
-            overlapping_shots = []
-            ind = 0
-            for shot in shots_sorted:
-                ind += 1
-                start = shots_sorted[ind].getSequenceStartTime()
-                end = shot.getSequenceEndTime()
-                if end >= start:
-                    overlapping_shots.append('%s & %s' % (shot, shots_sorted[ind]))
-                if ind == (len(shots_sorted)-1):
-                    break
+        overlapping_shots = [
+            '%s & %s' % (shot1, shot2)
+            for shot1, shot2 in self.shot_index.overlaps()
+        ]
 
-            if overlapping_shots:
-                message = 'Overlapped Shots:\r\n'
-                message += '\r'
-                for shots_info in overlapping_shots:
-                    message += '[ %s ] are overlapping\n' % shots_info
-                pm.confirmDialog(title='Error', message=message, button='OK')
-                raise RuntimeError('There Are overlapping shots in Sequencer.')
+        if overlapping_shots:
+            message = 'Overlapped Shots:\r\n'
+            message += '\r'
+            for shots_info in overlapping_shots:
+                message += '[ %s ] are overlapping\n' % shots_info
+            pm.confirmDialog(title='Error', message=message, button='OK')
+            raise RuntimeError('There Are overlapping shots in Sequencer.')
 
     def check_shot_order(self):
         """check if all shots are sequentially ordered with consecutive shot names
         """
-        shots_sorted = self.shots_descending
-
+        # walk the shots in their sequence order, the shot names are queried
+        # only once per shot
         non_sequential_shots = []
-        for i in range(len(shots_sorted)):
-            if i is len(shots_sorted)-1:
-                break
-            if int(shots_sorted[i].getShotName()) >= int(shots_sorted[i+1].getShotName()):
-                non_sequential_shots.append(shots_sorted[i])
+        previous_shot = None
+        previous_number = None
+        for start, end, shot in self.shot_index:
+            shot_number = int(shot.getShotName())
+            if previous_shot is not None and previous_number >= shot_number:
+                non_sequential_shots.append(previous_shot)
+            previous_shot = shot
+            previous_number = shot_number
         if non_sequential_shots:
             message = 'Shot Numbers are not Ordered in Sequencer:\r\n'
             message += '\r'
@@ -677,18 +667,15 @@ class ShotExporter(object):
         """
         min_frame = self.sequencer.getAttr('minFrame')
         max_frame = self.sequencer.getAttr('maxFrame')
-        seq_length = (max_frame - min_frame) + 1
-        shot_length = 0
 
-        shots = self.shot_list
-        for shot in shots:
-            start_frame = shot.getAttr('startFrame')
-            end_frame = shot.getAttr('endFrame')
-            shot_length += (end_frame - start_frame) + 1
+        gaps = self.shot_index.gaps(min_frame, max_frame + 1)
 
-        if seq_length != shot_length:
+        if gaps:
             message = 'There are Gaps between shots:\r\n'
             message += '\r'
+            for gap_start, gap_end in gaps:
+                message += '[ %s - %s ]\n' % (gap_start, gap_end - 1)
+            message += '\r'
             message += 'Please fix gaps from Camera Sequencer.\r\n'
             pm.confirmDialog(title='Error', message=message, button='OK')
             raise RuntimeError('There are gaps between Shot Nodes.')
@@ -938,6 +925,7 @@ class ShotExporter(object):
             pm.select(cl=1)
             shot.set_camera(shot_camera[0])
 
+    @trace('ShotExporter.pre_publish_previs')
     def pre_publish_previs(self):
         """checks if all necessities are met for exporting previs to animation shots
         """
@@ -979,6 +967,7 @@ class ShotExporter(object):
         if ok == 'OK, Continue':
             pass
 
+    @trace('ShotExporter.save_previs_to_shots')
     def save_previs_to_shots(self, take_name):
         """exports previs to animation shots
         """
@@ -12,7 +12,8 @@ import maya.cmds as mc
 import tempfile
 
 from anima.publish import (clear_publishers, publisher, staging,
-                           POST_PUBLISHER_TYPE, ProgressControllerBase)
+                           POST_PUBLISHER_TYPE, ProgressControllerBase,
+                           fingerprint, file_fingerprint)
 from anima.exc import PublishError
 from anima.representation import Representation
 from anima.utils import utc_to_local
@@ -322,9 +323,11 @@ def check_representations(progress_controller=None):
             return
 
         references = pm.listReferences()
+        from anima.env.mayaEnv import Maya
+        resolver = Maya.load_representations(references)
         progress_controller.maximum = len(references)
         for ref in references:
-            ref_repr = ref.repr
+            ref_repr = ref.get_repr(resolver=resolver)
             if ref_repr is None:
                 # skip this one this is not related to a Stalker Version
                 progress_controller.increment()
@@ -933,6 +936,37 @@ def check_empty_shapes(progress_controller=None):
         )
 
 
+def mesh_uv_cache_key():
+    """returns a fingerprint of the UVs of all the meshes in the scene, it is
+    used as the cache key of the slow UV publishers, so they are not run again
+    unless the UVs are changed
+
+    The UV values are hashed as raw bytes without converting them to strings,
+    and the key is calculated once for the publishers sharing it in a
+    :func:`anima.publish.run_publishers` call.
+    """
+    import array
+    import hashlib
+
+    def to_bytes(type_code, values):
+        data = array.array(type_code, values)
+        if hasattr(data, 'tobytes'):
+            return data.tobytes()
+        # Python 2
+        return data.tostring()
+
+    md5 = hashlib.md5()
+    for node in pm.ls(type='mesh'):
+        u, v = node.getUVs()
+        uv_counts, uv_ids = node.getAssignedUVs()
+        md5.update(node.name().encode('utf-8'))
+        md5.update(to_bytes('d', u))
+        md5.update(to_bytes('d', v))
+        md5.update(to_bytes('l', uv_counts))
+        md5.update(to_bytes('l', uv_ids))
+    return md5.hexdigest()
+
+
 @publisher('model')
 def check_uv_existence(progress_controller=None):
     """All objects have UVs
@@ -1035,7 +1069,7 @@ def check_out_of_space_uvs(progress_controller=None):
         )
 
 
-@publisher('model')
+@publisher('model', cache_key=mesh_uv_cache_key)
 def check_uv_border_crossing(progress_controller=None):
     """UV shells are not crossing uv borders
 
@@ -1145,7 +1179,7 @@ def check_uv_border_crossing(progress_controller=None):
         )
 
 
-@publisher('model')
+@publisher('model', cache_key=mesh_uv_cache_key)
 def check_uvs(progress_controller=None):
     """All polygons have non-zero uv area
 
@@ -1260,7 +1294,36 @@ def disable_internal_reflections_in_aiStandard(progress_controller=None):
     progress_controller.complete()
 
 
-@publisher(LOOK_DEV_TYPES)
+def texture_cache_key():
+    """returns a fingerprint of the texture paths in the scene and the folders
+    that they are in, it is used as the cache key of
+    check_all_renderer_specific_textures(), so the file server is not checked
+    again unless the textures or the texture folders are changed
+    """
+    workspace_path = pm.workspace.path
+    maya_version = int(pm.about(v=1))
+    paths = []
+    for node in pm.ls(type='file'):
+        if maya_version <= 2014:
+            paths.append(node.fileTextureName.get())
+        else:
+            paths.append(node.computedFileTextureNamePattern.get())
+    for node in pm.ls(type='aiImage'):
+        paths.append(node.filename.get())
+
+    folders = []
+    for path in paths:
+        if path:
+            path = os.path.expandvars(path)
+            if not os.path.isabs(path):
+                path = os.path.join(workspace_path, path)
+            folders.append(os.path.dirname(os.path.normpath(path)))
+
+    current_renderer = pm.PyNode('defaultRenderGlobals').currentRenderer.get()
+    return fingerprint(current_renderer, paths, file_fingerprint(folders))
+
+
+@publisher(LOOK_DEV_TYPES, cache_key=texture_cache_key)
 def check_all_renderer_specific_textures(progress_controller=None):
     """TX or RSTEXBIN textures exists
 
@@ -562,21 +562,35 @@ class Reference(object):
                 if ref is not None and ref not in references:
                     references.append(ref)
 
+            # resolve the versions of the parent references in the same
+            # batch
+            all_references = list(references)
+            for ref in references:
+                parent_ref = ref.parent()
+                while parent_ref is not None \
+                        and parent_ref not in all_references:
+                    all_references.append(parent_ref)
+                    parent_ref = parent_ref.parent()
+
+            from anima.env.mayaEnv import Maya
             from anima.env.mayaEnv.repr_tools import RepresentationGenerator
+            resolver = Maya.load_representations(all_references)
 
             # now go over each reference
             for ref in references:
-                if not ref.is_repr(repr_name):
+                if not ref.is_repr(repr_name, resolver=resolver):
                     parent_ref = ref
                     while parent_ref is not None:
                         # check if it is a look dev node
-                        v = parent_ref.version
+                        v = parent_ref.get_version(resolver=resolver)
                         if v:
                             task = v.task
                             if RepresentationGenerator.is_look_dev_task(task) \
                                or RepresentationGenerator.is_vegetation_task(task):
                                 # convert it to repr
-                                parent_ref.to_repr(repr_name)
+                                parent_ref.to_repr(
+                                    repr_name, resolver=resolver
+                                )
                                 break
                             else:
                                 # go to parent ref
@@ -585,8 +599,11 @@ class Reference(object):
                             parent_ref = parent_ref.parent()
         elif apply_to == 2:
             # apply to all references
-            for ref in pm.listReferences():
-                ref.to_repr(repr_name)
+            from anima.env.mayaEnv import Maya
+            references = pm.listReferences()
+            resolver = Maya.load_representations(references)
+            for ref in references:
+                ref.to_repr(repr_name, resolver=resolver)
 
     @classmethod
     def generate_repr_of_scene_caller(cls):
@@ -504,8 +504,12 @@ class RepresentationGenerator(object):
 
         # check if all references have an BBOX repr first
         refs_with_no_bbox_repr = []
-        for ref in pm.listReferences():
-            if ref.version and not ref.has_repr('BBOX'):
+        from anima.env.mayaEnv import Maya
+        references = pm.listReferences()
+        resolver = Maya.load_representations(references)
+        for ref in references:
+            if ref.get_version(resolver=resolver) \
+               and not ref.has_repr('BBOX', resolver=resolver):
                 refs_with_no_bbox_repr.append(ref)
 
         if len(refs_with_no_bbox_repr):
@@ -601,8 +605,12 @@ class RepresentationGenerator(object):
 
         # check if all references have an GPU repr first
         refs_with_no_gpu_repr = []
-        for ref in pm.listReferences():
-            if ref.version and not ref.has_repr('GPU'):
+        from anima.env.mayaEnv import Maya
+        references = pm.listReferences()
+        resolver = Maya.load_representations(references)
+        for ref in references:
+            if ref.get_version(resolver=resolver) \
+               and not ref.has_repr('GPU', resolver=resolver):
                 refs_with_no_gpu_repr.append(ref)
 
         if len(refs_with_no_gpu_repr):
@@ -1154,8 +1162,12 @@ class RepresentationGenerator(object):
 
         # check if all references have an ASS repr first
         refs_with_no_ass_repr = []
-        for ref in pm.listReferences():
-            if ref.version and not ref.has_repr('ASS'):
+        from anima.env.mayaEnv import Maya
+        references = pm.listReferences()
+        resolver = Maya.load_representations(references)
+        for ref in references:
+            if ref.get_version(resolver=resolver) \
+               and not ref.has_repr('ASS', resolver=resolver):
                 refs_with_no_ass_repr.append(ref)
 
         if len(refs_with_no_ass_repr):
@@ -1595,8 +1607,12 @@ class RepresentationGenerator(object):
 
         # check if all references have an ASS repr first
         refs_with_no_ass_repr = []
-        for ref in pm.listReferences():
-            if ref.version and not ref.has_repr('RS'):
+        from anima.env.mayaEnv import Maya
+        references = pm.listReferences()
+        resolver = Maya.load_representations(references)
+        for ref in references:
+            if ref.get_version(resolver=resolver) \
+               and not ref.has_repr('RS', resolver=resolver):
                 refs_with_no_ass_repr.append(ref)
 
         if len(refs_with_no_ass_repr):
@@ -168,17 +168,19 @@ class Nuke(EnvironmentBase):
 
         :return: :class:`~oyProjectManager.models.version.Version`
         """
-        # use the last file from the recent file list
+        # collect the recent file list
+        recent_files = []
         i = 1
         while True:
             try:
-                full_path = nuke.recentFile(i)
+                recent_files.append(nuke.recentFile(i))
             except RuntimeError:
-                # no recent file anymore just return None
-                return None
+                # no recent file anymore
+                break
             i += 1
 
-            version = self.get_version_from_full_path(full_path)
+        # and resolve them at once
+        for version in self.get_versions_from_full_paths(recent_files):
             if version is not None:
                 return version
 
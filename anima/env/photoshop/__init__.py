@@ -13,7 +13,6 @@ import comtypes.client
 from anima import logger
 from anima.env import empty_reference_resolution
 from anima.env.base import EnvironmentBase
-from anima.recent import RecentFileManager
 
 
 class Photoshop(EnvironmentBase):
@@ -142,8 +141,7 @@ class Photoshop(EnvironmentBase):
         version_full_path = version_full_path.replace('/', '\\')
         self.photoshop.Load(version_full_path)
 
-        rfm = RecentFileManager()
-        rfm.add(self.name, version.absolute_full_path)
+        self.append_to_recent_files(version.absolute_full_path)
 
         return empty_reference_resolution()
 
@@ -171,36 +169,3 @@ class Photoshop(EnvironmentBase):
             logger.debug("version from current file: %s" % version)
 
         return version
-
-    def get_version_from_recent_files(self):
-        """It will try to create a
-        :class:`~stalker.models.version.Version` instance by looking at
-        the recent files list.
-
-        It will return None if it can not find one.
-
-        :return: :class:`~stalker.models.version.Version`
-        """
-        version = None
-
-        logger.debug("trying to get the version from recent file list")
-        # read the fileName from recent files list
-        # try to get the a valid asset file from starting the last recent file
-
-        rfm = RecentFileManager()
-
-        try:
-            recent_files = rfm[self.name]
-        except KeyError:
-            logger.debug("no recent files")
-            recent_files = None
-
-        if recent_files is not None:
-            for i in range(len(recent_files)):
-                version = self.get_version_from_full_path(recent_files[i])
-                if version is not None:
-                    break
-
-            logger.debug("version from recent files is: %s" % version)
-
-        return version
\ No newline at end of file
@@ -4,15 +4,360 @@
 # This module is part of anima and is released under the MIT
 # License: http://www.opensource.org/licenses/MIT
 
+import json
+import math
+import os
+import threading
 import time
 
-indentation = 0
 tab_stop = 3
 
 
+class Span(object):
+    """A finished or running span of the :class:`.Tracer`.
+
+    :param str name: The name of the span.
+    :param float start: The start time in seconds.
+    :param int depth: The nesting depth of this span in its thread.
+    :param int thread_id: The id of the thread that the span is started in.
+    :param dict args: Extra data to be stored in the trace.
+    """
+
+    __slots__ = ('name', 'start', 'end', 'depth', 'thread_id', 'args')
+
+    def __init__(self, name, start, depth=0, thread_id=None, args=None):
+        self.name = name
+        self.start = start
+        self.end = None
+        self.depth = depth
+        self.thread_id = thread_id
+        self.args = args
+
+    @property
+    def duration(self):
+        """the duration of the span in seconds, 0 if it is still running
+        """
+        if self.end is None:
+            return 0.0
+        return self.end - self.start
+
+
+class _SpanContext(object):
+    """The context manager returned by :meth:`.Tracer.span`
+    """
+
+    __slots__ = ('tracer', 'name', 'args', 'span')
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.span = None
+
+    def __enter__(self):
+        self.span = self.tracer.start_span(self.name, self.args)
+        return self.span
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.tracer.end_span(self.span)
+
+
+class _NullSpanContext(object):
+    """The context manager returned by :meth:`.Tracer.span` when the tracer
+    is disabled, it does nothing
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+_null_span_context = _NullSpanContext()
+
+
+def _percentile(sorted_values, percent):
+    """returns the given percentile of the given sorted values with the
+    nearest rank method
+    """
+    if not sorted_values:
+        return 0.0
+    index = int(math.ceil(percent / 100.0 * len(sorted_values))) - 1
+    return sorted_values[max(index, 0)]
+
+
+class Tracer(object):
+    """Records named spans to find where the time goes.
+
+    The spans can be nested, the nesting is tracked per thread. The durations
+    are aggregated per span name and can be exported as a log line per span
+    name, as a JSON summary or in the Chrome trace event format, which can be
+    opened in ``chrome://tracing`` or https://ui.perfetto.dev.
+
+    Usage::
+
+      from anima.perf import tracer
+
+      with tracer.span('load scene', path=path):
+          ...
+
+      @tracer.trace('save_as')
+      def save_as(self, version):
+          ...
+
+      tracer.save_chrome_trace('/tmp/anima_trace.json')
+
+    The tracer does nothing if it is disabled, which is the default unless the
+    ``ANIMA_TRACE`` environment variable is set to a non empty value. Use
+    :meth:`.enable` and :meth:`.disable` to turn it on and off.
+
+    :param bool enabled: Enables the tracer.
+    :param int max_spans: The maximum number of spans that are kept for the
+      Chrome trace export, the older ones are dropped. The aggregated
+      durations are not affected.
+    """
+
+    def __init__(self, enabled=False, max_spans=100000):
+        self.enabled = enabled
+        self.max_spans = max_spans
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._spans = []
+        self._durations = {}
+        self._start_time = time.time()
+
+    def enable(self):
+        """enables the tracer
+        """
+        self.enabled = True
+
+    def disable(self):
+        """disables the tracer
+        """
+        self.enabled = False
+
+    def reset(self):
+        """removes all the recorded spans
+        """
+        with self._lock:
+            self._spans = []
+            self._durations = {}
+            self._start_time = time.time()
+
+    def _get_stack(self):
+        """returns the span stack of the current thread
+        """
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack
+
+    def start_span(self, name, args=None):
+        """starts a new span in the current thread, prefer :meth:`.span` or
+        :meth:`.trace` over this
+
+        :param str name: The name of the span.
+        :param dict args: Extra data to be stored in the trace.
+        :return: :class:`.Span`
+        """
+        stack = self._get_stack()
+        span = Span(
+            name,
+            time.time(),
+            depth=len(stack),
+            thread_id=threading.current_thread().ident,
+            args=args
+        )
+        stack.append(span)
+        return span
+
+    def end_span(self, span, record=True):
+        """ends the given span and records it
+
+        :param span: A :class:`.Span` returned by :meth:`.start_span`.
+        :param bool record: Records the span if True (the default), the span
+          is only removed from the stack of the current thread otherwise.
+        """
+        span.end = time.time()
+        stack = self._get_stack()
+        # the spans are ended in reverse order, but skip the ones that are
+        # not ended properly
+        while stack:
+            if stack.pop() is span:
+                break
+
+        if not record:
+            return
+
+        with self._lock:
+            self._spans.append(span)
+            if len(self._spans) > self.max_spans:
+                del self._spans[:len(self._spans) - self.max_spans]
+            self._durations.setdefault(span.name, []).append(span.duration)
+
+    def span(self, name, **kwargs):
+        """returns a context manager that records a span with the given name
+
+        :param str name: The name of the span.
+        :param kwargs: Extra data to be stored in the trace.
+        """
+        if not self.enabled:
+            return _null_span_context
+        return _SpanContext(self, name, kwargs or None)
+
+    def trace(self, name=None):
+        """a decorator that records a span for every call of the decorated
+        function
+
+        :param str name: The name of the span, the default is the name of the
+          function.
+        """
+        def wrapper(f):
+            span_name = name or f.__name__
+
+            def wrapped_f(*args, **kwargs):
+                if not self.enabled:
+                    return f(*args, **kwargs)
+                span = self.start_span(span_name)
+                try:
+                    return f(*args, **kwargs)
+                finally:
+                    self.end_span(span)
+
+            wrapped_f.__name__ = f.__name__
+            wrapped_f.__doc__ = f.__doc__
+            return wrapped_f
+
+        if callable(name):
+            # used without arguments
+            f = name
+            name = None
+            return wrapper(f)
+
+        return wrapper
+
+    @property
+    def spans(self):
+        """a copy of the recorded spans
+        """
+        with self._lock:
+            return list(self._spans)
+
+    def get_stats(self):
+        """returns the aggregated durations per span name
+
+        :return dict: The ``count``, ``total``, ``min``, ``max``, ``p50`` and
+          ``p95`` values in seconds keyed by the span names.
+        """
+        with self._lock:
+            durations = dict(
+                (name, list(values))
+                for name, values in self._durations.items()
+            )
+
+        stats = {}
+        for name, values in durations.items():
+            values.sort()
+            stats[name] = {
+                'count': len(values),
+                'total': sum(values),
+                'min': values[0],
+                'max': values[-1],
+                'p50': _percentile(values, 50),
+                'p95': _percentile(values, 95),
+            }
+        return stats
+
+    def get_log_lines(self):
+        """returns one line per span name sorted by the total durations
+
+        :return: list of str
+        """
+        stats = self.get_stats()
+        lines = []
+        for name in sorted(stats, key=lambda x: -stats[x]['total']):
+            data = stats[name]
+            lines.append(
+                '%s: count=%s total=%0.3f p50=%0.3f p95=%0.3f max=%0.3f sec' %
+                (name, data['count'], data['total'], data['p50'],
+                 data['p95'], data['max'])
+            )
+        return lines
+
+    def log(self, logger=None):
+        """writes the summary to the given logger at info level
+
+        :param logger: A :class:`logging.Logger`, the default is the anima
+          logger.
+        """
+        if logger is None:
+            from anima import logger
+        for line in self.get_log_lines():
+            logger.info(line)
+
+    def to_json(self):
+        """returns the summary as a JSON string
+        """
+        return json.dumps(self.get_stats(), sort_keys=True, indent=2)
+
+    def to_chrome_trace(self):
+        """returns the recorded spans in the Chrome trace event format
+
+        :return dict:
+        """
+        pid = os.getpid()
+        events = []
+        for span in self.spans:
+            event = {
+                'name': span.name,
+                'ph': 'X',
+                'ts': int((span.start - self._start_time) * 1e6),
+                'dur': int(span.duration * 1e6),
+                'pid': pid,
+                'tid': span.thread_id,
+            }
+            if span.args:
+                event['args'] = dict(
+                    (key, str(value)) for key, value in span.args.items()
+                )
+            events.append(event)
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def save_json(self, path):
+        """saves the JSON summary to the given path
+
+        :param str path: The output file path.
+        """
+        with open(path, 'w') as f:
+            f.write(self.to_json())
+
+    def save_chrome_trace(self, path):
+        """saves the recorded spans to the given path in the Chrome trace
+        event format
+
+        :param str path: The output file path.
+        """
+        with open(path, 'w') as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+# the shared tracer
+tracer = Tracer(enabled=bool(os.environ.get('ANIMA_TRACE')))
+span = tracer.span
+trace = tracer.trace
+
+
 def measure_time(f_name):
     """This is a decorator that measures performance of the decorated function
 
+    It prints the start and the duration of every call, indented by the
+    nesting depth of the calls in the current thread. The calls are also
+    recorded by the shared :class:`.Tracer` if it is enabled.
+
     :param f_name: The name of the decorated function
     """
 
@@ -22,23 +367,16 @@ def measure_time(f_name):
             f_inner_name = f.__name__
 
         def wrapped_f(*args, **kwargs):
-            global indentation
-            global tab_stop
-
-            start = time.time()
+            span = tracer.start_span(f_inner_name)
+            indentation = span.depth * tab_stop
             print("%s%11s start" % (" " * indentation, f_inner_name))
-            indentation += tab_stop
             try:
-                return_data = f(*args, **kwargs)
-            except TypeError:
-                    return_data = f(*args)
+                return f(*args, **kwargs)
             finally:
-                end = time.time()
-                indentation -= tab_stop
-
-                print('%s%11s: %0.3f sec' % (" " * indentation, f_inner_name, (end - start)))
-
-            return return_data
+                tracer.end_span(span, record=tracer.enabled)
+                print('%s%11s: %0.3f sec' % (
+                    " " * indentation, f_inner_name, span.duration
+                ))
 
         return wrapped_f
     return wrapper
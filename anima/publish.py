@@ -6,6 +6,20 @@
 """This module contains scripts those run when a new Version is published. It
 is a way of checking the quality of the published versions.
 """
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import queue
+except ImportError:  # Python 2
+    import Queue as queue
+
+
+# the CPU time of the current thread if it is supported
+_cpu_clock = getattr(time, 'thread_time', None) \
+    or getattr(time, 'process_time', None) or time.clock
+
 PRE_PUBLISHER_TYPE = 0
 POST_PUBLISHER_TYPE = 1
 
@@ -15,11 +29,57 @@ publishers = {
     POST_PUBLISHER_TYPE: {}
 }
 
+# the options of the publishers, keyed by the callables
+publisher_options = {}
+
 # This is a storage for intermediate data like newly created versions etc.
 staging = {}
 
 
-def register_publisher(callable_, type_name='', publisher_type=PRE_PUBLISHER_TYPE):
+class PublisherOptions(object):
+    """Stores how a publisher should be run.
+
+    :param depends_on: A list of publishers or publisher names that should
+      pass before this publisher runs. The publishers that are not going to be
+      run are ignored.
+    :param bool parallel_safe: If True the publisher only reads the scene and
+      doesn't need to run in the main thread, so it can run concurrently with
+      the other parallel safe publishers. Only set it for the publishers that
+      don't use the DCC API and the database session, like checking the
+      existence of files on the file server.
+    :param cache_key: A callable that returns a fingerprint of the inputs of
+      the publisher, like a hash of the related nodes or the paths and mtimes
+      of the related files. If the publisher passed before with the same
+      fingerprint it is not run again. The fingerprint should be cheaper to
+      calculate than running the publisher. See :class:`.PublisherCache`.
+    :param bool side_effects: Set it to True for the publishers that change
+      the scene or anything else, they are never cached even if they have a
+      cache_key.
+    """
+
+    __slots__ = ('depends_on', 'parallel_safe', 'cache_key', 'side_effects')
+
+    def __init__(self, depends_on=None, parallel_safe=False, cache_key=None,
+                 side_effects=False):
+        if depends_on is None:
+            depends_on = []
+        elif not isinstance(depends_on, (list, tuple)):
+            depends_on = [depends_on]
+        self.depends_on = list(depends_on)
+        self.parallel_safe = parallel_safe
+        self.cache_key = cache_key
+        self.side_effects = side_effects
+
+    @property
+    def is_cacheable(self):
+        """True if the results of the publisher can be cached
+        """
+        return self.cache_key is not None and not self.side_effects
+
+
+def register_publisher(callable_, type_name='', publisher_type=PRE_PUBLISHER_TYPE,
+                       depends_on=None, parallel_safe=False, cache_key=None,
+                       side_effects=False):
     """Registers a function as a publisher for defined task types.
 
     :param function callable_: The callable that is the publisher.
@@ -28,6 +88,15 @@ def register_publisher(callable_, type_name='', publisher_type=PRE_PUBLISHER_TYP
       of is an empty string the given callable_ will be registered as a generic
       publisher and will always run first.
     :param int publisher_type: 0 for pre publishers 1 for post publishers.
+    :param depends_on: A publisher, a publisher name or a list of them that
+      should pass before this publisher runs.
+    :param bool parallel_safe: If True the publisher can run concurrently with
+      the other parallel safe publishers in a worker thread. See
+      :class:`.PublisherOptions`.
+    :param cache_key: A callable that returns a fingerprint of the inputs of
+      the publisher, the publisher is not run again while it returns the same
+      value after the publisher passes.
+    :param bool side_effects: If True the publisher is never cached.
     :return:
     """
 
@@ -49,15 +118,39 @@ def register_publisher(callable_, type_name='', publisher_type=PRE_PUBLISHER_TYP
         # it should have only one item
         register_one(type_name, publisher_type)
 
+    if depends_on or parallel_safe or cache_key or side_effects \
+       or callable_ not in publisher_options:
+        publisher_options[callable_] = PublisherOptions(
+            depends_on=depends_on,
+            parallel_safe=parallel_safe,
+            cache_key=cache_key,
+            side_effects=side_effects
+        )
+
 
-def publisher(type_name='', publisher_type=PRE_PUBLISHER_TYPE):
+def publisher(type_name='', publisher_type=PRE_PUBLISHER_TYPE,
+              depends_on=None, parallel_safe=False, cache_key=None,
+              side_effects=False):
     """A decorator to easily register a method or function as a publisher
 
     :param str type_name: The name of this publisher type.
     :param int publisher_type: 0 for pre 1 for post publishers
+    :param depends_on: A publisher, a publisher name or a list of them that
+      should pass before this publisher runs.
+    :param bool parallel_safe: If True the publisher can run concurrently with
+      the other parallel safe publishers in a worker thread.
+    :param cache_key: A callable that returns a fingerprint of the inputs of
+      the publisher.
+    :param bool side_effects: If True the publisher is never cached.
     """
     def wrapper(f):
-        register_publisher(f, type_name, publisher_type)
+        register_publisher(
+            f, type_name, publisher_type,
+            depends_on=depends_on,
+            parallel_safe=parallel_safe,
+            cache_key=cache_key,
+            side_effects=side_effects
+        )
         return f
 
     if callable(type_name):
@@ -69,20 +162,671 @@ def publisher(type_name='', publisher_type=PRE_PUBLISHER_TYPE):
     return wrapper
 
 
-def run_publishers(type_name='', publisher_type=PRE_PUBLISHER_TYPE):
-    """Runs all the publishers registered under the given type name
+def get_publishers(type_name='', publisher_type=PRE_PUBLISHER_TYPE):
+    """returns the publishers that are going to be run for the given type
+    name, the generic publishers are first
 
     :param str type_name: A string holding the type name
-    :param int publisher_type: The type of publisher to run. Use
-      ``publish.PRE_PUBLISHER_TYPE`` or ``publish.POST_PUBLISHER_TYPE``
-    :return:
+    :param int publisher_type: The type of publishers.
+    :return: list of callables
     """
+    result = []
     if type_name != '':
-        for f in publishers[publisher_type].get('', []):  # run generic
-            f()                                           # publishers first
+        # generic publishers first
+        result.extend(publishers[publisher_type].get('', []))
 
     for f in publishers[publisher_type].get(type_name.lower(), []):
-        f()
+        if f not in result:
+            result.append(f)
+    return result
+
+
+class PublisherResult(object):
+    """The result of a publisher run.
+
+    :param publisher: The publisher callable.
+    :param str status: One of ``PublisherResult.PASSED``,
+      ``PublisherResult.FAILED`` or ``PublisherResult.SKIPPED``.
+    :param exception: The exception raised by the publisher.
+    :param float duration: The wall time of the publisher in seconds.
+    :param bool cached: True if the publisher is not run as it passed before
+      with the same inputs.
+    :param str traceback: The formatted traceback of the exception.
+    :param float cpu_time: The CPU time of the publisher in seconds.
+    :param profile: A :class:`pstats.Stats` instance if the publisher is
+      profiled.
+    """
+
+    PASSED = 'passed'
+    FAILED = 'failed'
+    SKIPPED = 'skipped'
+
+    __slots__ = ('publisher', 'status', 'exception', 'duration', 'cached',
+                 'traceback', 'cpu_time', 'profile')
+
+    def __init__(self, publisher, status=PASSED, exception=None, duration=0.0,
+                 cached=False, traceback=None, cpu_time=0.0, profile=None):
+        self.publisher = publisher
+        self.status = status
+        self.exception = exception
+        self.duration = duration
+        self.cached = cached
+        self.traceback = traceback
+        self.cpu_time = cpu_time
+        self.profile = profile
+
+    def format_profile(self, limit=20):
+        """returns the profile stats of the publisher sorted by the cumulative
+        time, or an empty string if it is not profiled
+
+        :param int limit: The number of functions to list.
+        :return: str
+        """
+        if self.profile is None:
+            return ''
+        try:
+            from StringIO import StringIO
+        except ImportError:
+            from io import StringIO
+        stream = StringIO()
+        self.profile.stream = stream
+        self.profile.sort_stats('cumulative').print_stats(limit)
+        return stream.getvalue()
+
+    @property
+    def name(self):
+        """the name of the publisher
+        """
+        return getattr(self.publisher, '__name__', str(self.publisher))
+
+    def __repr__(self):
+        return '<PublisherResult %s: %s (%0.3f sec)>' % (
+            self.name, self.status, self.duration
+        )
+
+
+class PublishReport(object):
+    """The results of a :func:`.run_publishers` call, in the order of the
+    publishers.
+    """
+
+    def __init__(self, type_name='', publisher_type=PRE_PUBLISHER_TYPE):
+        self.type_name = type_name
+        self.publisher_type = publisher_type
+        self.results = []
+        self.duration = 0.0
+
+    @property
+    def cpu_time(self):
+        """the total CPU time of the publishers
+        """
+        return sum(result.cpu_time for result in self.results)
+
+    def get_timing_lines(self):
+        """returns a line per publisher sorted by the durations
+
+        :return: list of str
+        """
+        lines = []
+        for result in sorted(self.results, key=lambda x: -x.duration):
+            lines.append(
+                '%s: %0.3f sec (cpu %0.3f sec) %s%s' % (
+                    result.name, result.duration, result.cpu_time,
+                    result.status, ' (cached)' if result.cached else ''
+                )
+            )
+        return lines
+
+    def _filter(self, status):
+        return [result for result in self.results if result.status == status]
+
+    @property
+    def passed(self):
+        """the results of the passed publishers
+        """
+        return self._filter(PublisherResult.PASSED)
+
+    @property
+    def failed(self):
+        """the results of the failed publishers
+        """
+        return self._filter(PublisherResult.FAILED)
+
+    @property
+    def skipped(self):
+        """the results of the publishers that are not run because one of
+        their dependencies didn't pass
+        """
+        return self._filter(PublisherResult.SKIPPED)
+
+    @property
+    def succeeded(self):
+        """True if all the publishers are passed
+        """
+        return all(result.status == PublisherResult.PASSED
+                   for result in self.results)
+
+    def raise_errors(self):
+        """raises the error of the failed publisher, if more than one
+        publisher failed with a :class:`anima.exc.PublishError` their messages
+        are combined in one PublishError
+        """
+        from anima.exc import PublishError
+        exceptions = [result.exception for result in self.failed]
+        if not exceptions:
+            return
+
+        for exception in exceptions:
+            if not isinstance(exception, PublishError):
+                # an unexpected error, raise it as it is
+                raise exception
+
+        if len(exceptions) == 1:
+            raise exceptions[0]
+
+        raise PublishError(
+            '<br><br>'.join([str(exception) for exception in exceptions])
+        )
+
+
+class PublisherCache(object):
+    """Stores the fingerprints of the inputs of the passed publishers.
+
+    A publisher with a ``cache_key`` is not run again if it passed before and
+    its ``cache_key`` returns the same fingerprint, so pressing Publish again
+    after fixing one thing only runs the publishers whose inputs are changed.
+    The fingerprints are stored per task and take name of the published
+    version, as every press of Publish creates a new version, so the checks
+    of the Publish Checker for the current version are used by the publish.
+
+    In a :meth:`.memoize_keys` block each ``cache_key`` callable is called
+    only once for the publishers sharing it, until a publisher that is not
+    cacheable runs, as it may change the scene.
+    """
+
+    def __init__(self):
+        self._keys = {}
+        self._lock = threading.Lock()
+        # the fingerprints keyed by the cache_key callables, None if they are
+        # not memoized
+        self._fingerprints = None
+
+    @contextmanager
+    def memoize_keys(self):
+        """memoizes the fingerprints calculated in the with block
+        """
+        with self._lock:
+            if self._fingerprints is not None:
+                # already memoizing
+                nested = True
+            else:
+                nested = False
+                self._fingerprints = {}
+        try:
+            yield
+        finally:
+            if not nested:
+                with self._lock:
+                    self._fingerprints = None
+
+    def clear_memoized_keys(self):
+        """clears the memoized fingerprints, called when the scene may be
+        changed
+        """
+        with self._lock:
+            if self._fingerprints is not None:
+                self._fingerprints = {}
+
+    def _get_fingerprint(self, cache_key):
+        """returns the fingerprint of the given cache_key callable, the
+        memoized one is used if there is one
+        """
+        with self._lock:
+            fingerprints = self._fingerprints
+            if fingerprints is not None and cache_key in fingerprints:
+                return fingerprints[cache_key]
+        key = cache_key()
+        if fingerprints is not None:
+            with self._lock:
+                # do not store it if the fingerprints are cleared meanwhile
+                if self._fingerprints is fingerprints:
+                    fingerprints[cache_key] = key
+        return key
+
+    def get_key(self, f):
+        """returns the fingerprint of the inputs of the given publisher or
+        None if it can not be cached
+
+        :param f: A publisher callable.
+        """
+        options = publisher_options.get(f)
+        if options is None or not options.is_cacheable:
+            return None
+        try:
+            key = self._get_fingerprint(options.cache_key)
+        except Exception:
+            # do not cache if the fingerprint can not be calculated
+            return None
+        if key is None:
+            return None
+        version = staging.get('version')
+        return (
+            getattr(version, 'task_id', None),
+            getattr(version, 'take_name', None),
+            key
+        )
+
+    def is_passed(self, f, key):
+        """returns True if the given publisher passed with the given
+        fingerprint
+
+        :param f: A publisher callable.
+        :param key: The value returned by :meth:`.get_key`.
+        """
+        if key is None:
+            return False
+        with self._lock:
+            return self._keys.get(f) == key
+
+    def set_passed(self, f, key):
+        """stores the given fingerprint for the given passed publisher
+        """
+        with self._lock:
+            if key is None:
+                self._keys.pop(f, None)
+            else:
+                self._keys[f] = key
+
+    def invalidate(self, f=None):
+        """removes the stored fingerprint of the given publisher
+
+        :param f: A publisher callable, all the fingerprints are removed if it
+          is None.
+        """
+        with self._lock:
+            if f is None:
+                self._keys.clear()
+            else:
+                self._keys.pop(f, None)
+
+
+def fingerprint(*values):
+    """returns a short md5 hex digest of the given values, to be used in the
+    publisher cache keys
+
+    :param values: Any values with a stable ``repr``.
+    :return: str
+    """
+    import hashlib
+    md5 = hashlib.md5()
+    for value in values:
+        md5.update(repr(value).encode('utf-8'))
+    return md5.hexdigest()
+
+
+def file_fingerprint(paths):
+    """returns a fingerprint of the given file or folder paths, it is changed
+    when any of the files are created, deleted or modified
+
+    The mtime of a folder changes when a file is added to or removed from it,
+    so a folder can be used in place of the files in it.
+
+    :param paths: A list of file or folder paths.
+    :return: str
+    """
+    import os
+    stats = []
+    for path in sorted(set(paths)):
+        try:
+            stat = os.stat(path)
+            stats.append((path, stat.st_mtime, stat.st_size))
+        except OSError:
+            stats.append((path, None, None))
+    return fingerprint(stats)
+
+
+# the shared cache of the passed publishers
+publisher_cache = PublisherCache()
+
+
+def run_publisher(f, progress_controller=None, use_cache=True, profile=False):
+    """runs the given publisher and returns its result, the publisher is not
+    run if its cached result can be used
+
+    :param f: A publisher callable.
+    :param progress_controller: A :class:`.ProgressControllerBase` instance
+      that is passed to the publisher.
+    :param bool use_cache: Uses the :class:`.PublisherCache` if True (the
+      default).
+    :param bool profile: Profiles the publisher with cProfile if True, the
+      stats are stored in :attr:`.PublisherResult.profile`.
+    :return: :class:`.PublisherResult`
+    """
+    from anima.perf import tracer
+    start = time.time()
+    cpu_start = _cpu_clock()
+
+    key = publisher_cache.get_key(f) if use_cache else None
+    if publisher_cache.is_passed(f, key):
+        if progress_controller is not None:
+            progress_controller.complete()
+        return PublisherResult(
+            f, duration=time.time() - start,
+            cpu_time=_cpu_clock() - cpu_start, cached=True
+        )
+
+    profiler = None
+    if profile:
+        import cProfile
+        profiler = cProfile.Profile()
+
+    result = PublisherResult(f)
+    try:
+        with tracer.span('publisher.%s' % f.__name__):
+            if profiler is not None:
+                profiler.enable()
+            try:
+                if progress_controller is None:
+                    f()
+                else:
+                    f(progress_controller=progress_controller)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+    except Exception as e:
+        import traceback
+        publisher_cache.invalidate(f)
+        result.status = PublisherResult.FAILED
+        result.exception = e
+        result.traceback = traceback.format_exc()
+    else:
+        if use_cache:
+            publisher_cache.set_passed(f, key)
+
+    options = publisher_options.get(f)
+    if options is None \
+       or not (options.is_cacheable or options.parallel_safe):
+        # it may have changed the scene
+        publisher_cache.clear_memoized_keys()
+
+    result.duration = time.time() - start
+    result.cpu_time = _cpu_clock() - cpu_start
+    if profiler is not None:
+        import pstats
+        result.profile = pstats.Stats(profiler)
+    return result
+
+
+class PublisherStats(object):
+    """Aggregates the durations of the publishers across the runs in a local
+    JSON file.
+
+    The data is stored per task type name and publisher name, for each
+    publisher the number of runs and failures and the total and maximum wall
+    and CPU times are stored. The cached and skipped results are not counted.
+
+    :param str path: The path of the stats file, the default is
+      ``defaults.publisher_stats_file_name`` under
+      ``defaults.local_cache_folder``.
+    """
+
+    def __init__(self, path=None):
+        if path is None:
+            path = self.default_path()
+        self.path = path
+
+    @classmethod
+    def default_path(cls):
+        """returns the default stats file path
+        """
+        import os
+        from anima import defaults
+        return os.path.normpath(
+            os.path.expandvars(
+                os.path.expanduser(
+                    os.path.join(
+                        defaults.local_cache_folder,
+                        defaults.publisher_stats_file_name
+                    )
+                )
+            )
+        )
+
+    def load(self):
+        """returns the stats data
+
+        :return dict:
+        """
+        import json
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return data
+
+    def record(self, report):
+        """adds the results in the given report to the stats file
+
+        :param report: A :class:`.PublishReport` instance.
+        """
+        import json
+        import os
+        import tempfile
+        from anima.recent import FileLock
+
+        folder = os.path.dirname(self.path)
+        try:
+            os.makedirs(folder)
+        except OSError:
+            # already exists
+            pass
+
+        with FileLock(self.path):
+            data = self.load()
+            type_data = data.setdefault(report.type_name.lower(), {})
+            for result in report.results:
+                if result.cached or result.status == PublisherResult.SKIPPED:
+                    continue
+                entry = type_data.setdefault(
+                    result.name,
+                    {'count': 0, 'failed': 0, 'wall_total': 0.0,
+                     'wall_max': 0.0, 'cpu_total': 0.0, 'cpu_max': 0.0}
+                )
+                entry['count'] += 1
+                if result.status == PublisherResult.FAILED:
+                    entry['failed'] += 1
+                entry['wall_total'] += result.duration
+                entry['wall_max'] = max(entry['wall_max'], result.duration)
+                entry['cpu_total'] += result.cpu_time
+                entry['cpu_max'] = max(entry['cpu_max'], result.cpu_time)
+                entry['wall_last'] = result.duration
+
+            fd, temp_path = tempfile.mkstemp(dir=folder)
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(data, f, sort_keys=True, indent=1)
+                if os.name == 'nt' and os.path.exists(self.path):
+                    os.remove(self.path)
+                os.rename(temp_path, self.path)
+            except (IOError, OSError):
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+
+    def get(self, type_name, publisher_name, data=None):
+        """returns the stats of the given publisher for the given task type
+
+        :param str type_name: The task type name.
+        :param str publisher_name: The name of the publisher.
+        :param dict data: The data returned by :meth:`.load`, it is loaded if
+          skipped.
+        :return dict: With the ``count``, ``failed``, ``wall_total``,
+          ``wall_max``, ``wall_last``, ``wall_average``, ``cpu_total``,
+          ``cpu_max`` and ``cpu_average`` keys or None.
+        """
+        if data is None:
+            data = self.load()
+        entry = data.get(type_name.lower(), {}).get(publisher_name)
+        if not entry or not entry.get('count'):
+            return None
+        entry = dict(entry)
+        entry['wall_average'] = entry['wall_total'] / entry['count']
+        entry['cpu_average'] = entry['cpu_total'] / entry['count']
+        return entry
+
+    def get_slowest(self, type_name, limit=10):
+        """returns the slowest publishers of the given task type by their
+        average wall times
+
+        :param str type_name: The task type name.
+        :param int limit: The maximum number of publishers.
+        :return: A list of (publisher name, stats) tuples.
+        """
+        data = self.load()
+        entries = []
+        for name in data.get(type_name.lower(), {}):
+            entry = self.get(type_name, name, data)
+            if entry is not None:
+                entries.append((name, entry))
+        entries.sort(key=lambda x: -x[1]['wall_average'])
+        return entries[:limit]
+
+
+def run_publishers(type_name='', publisher_type=PRE_PUBLISHER_TYPE,
+                   raise_errors=True, max_workers=None, use_cache=True,
+                   profile=False, record_stats=None):
+    """Runs all the publishers registered under the given type name
+
+    All the publishers are run even if some of them fail, except the ones
+    that depend on a failed publisher. The publishers run in the main thread
+    in the order that they are registered, the parallel safe ones run in
+    worker threads as soon as their dependencies pass. The main thread
+    publishers don't run while any parallel safe publisher is running, as they
+    may change the scene.
+
+    :param str type_name: A string holding the type name
+    :param int publisher_type: The type of publisher to run. Use
+      ``publish.PRE_PUBLISHER_TYPE`` or ``publish.POST_PUBLISHER_TYPE``
+    :param bool raise_errors: If True (the default) the errors of the failed
+      publishers are raised after all the publishers are run. See
+      :meth:`.PublishReport.raise_errors`.
+    :param int max_workers: The maximum number of the parallel safe
+      publishers that run at the same time, the default is
+      ``defaults.publisher_max_workers``.
+    :param bool use_cache: If True (the default) the publishers that passed
+      before with the same inputs are not run again. See
+      :class:`.PublisherCache`.
+    :param bool profile: Profiles the publishers with cProfile if True.
+    :param bool record_stats: Adds the durations to the
+      :class:`.PublisherStats` file, the default is
+      ``defaults.record_publisher_stats``.
+    :return: :class:`.PublishReport`
+    """
+    from anima import defaults
+    if max_workers is None:
+        max_workers = defaults.publisher_max_workers
+    if record_stats is None:
+        record_stats = defaults.record_publisher_stats
+
+    start = time.time()
+    to_run = get_publishers(type_name, publisher_type)
+    names = dict((f.__name__, f) for f in to_run if hasattr(f, '__name__'))
+
+    # resolve the dependencies
+    dependencies = {}
+    for f in to_run:
+        options = publisher_options.get(f) or PublisherOptions()
+        dependencies[f] = []
+        for dependency in options.depends_on:
+            if not callable(dependency):
+                dependency = names.get(dependency)
+            if dependency in to_run and dependency is not f:
+                dependencies[f].append(dependency)
+
+    def is_parallel_safe(f):
+        options = publisher_options.get(f)
+        return options is not None and options.parallel_safe \
+            and max_workers > 0
+
+    results = {}
+    finished = queue.Queue()
+    running = set()
+    pending = list(to_run)
+
+    def run_in_thread(f):
+        finished.put(run_publisher(f, use_cache=use_cache, profile=profile))
+
+    # calculate the cache keys that are shared by the publishers once
+    with publisher_cache.memoize_keys():
+        while pending or running:
+            # skip the publishers with failed dependencies
+            changed = True
+            while changed:
+                changed = False
+                for f in list(pending):
+                    if any(dependency in results and
+                           results[dependency].status !=
+                           PublisherResult.PASSED
+                           for dependency in dependencies[f]):
+                        results[f] = \
+                            PublisherResult(f, PublisherResult.SKIPPED)
+                        pending.remove(f)
+                        changed = True
+
+            ready = [f for f in pending
+                     if all(dependency in results
+                            for dependency in dependencies[f])]
+
+            # start the parallel safe ones
+            for f in ready:
+                if is_parallel_safe(f) and len(running) < max_workers:
+                    pending.remove(f)
+                    running.add(f)
+                    thread = threading.Thread(target=run_in_thread, args=(f,))
+                    thread.daemon = True
+                    thread.start()
+
+            if not running:
+                main_thread_ready = \
+                    [f for f in ready if not is_parallel_safe(f)]
+                if main_thread_ready:
+                    f = main_thread_ready[0]
+                    pending.remove(f)
+                    results[f] = \
+                        run_publisher(f, use_cache=use_cache, profile=profile)
+                    continue
+                if pending:
+                    # the rest are waiting for dependencies that can't be
+                    # satisfied, a circular dependency
+                    for f in pending:
+                        results[f] = PublisherResult(
+                            f, PublisherResult.SKIPPED
+                        )
+                    pending = []
+                continue
+
+            result = finished.get()
+            running.discard(result.publisher)
+            results[result.publisher] = result
+
+    report = PublishReport(type_name, publisher_type)
+    report.results = [results[f] for f in to_run]
+    report.duration = time.time() - start
+
+    if record_stats and report.results:
+        try:
+            PublisherStats().record(report)
+        except (IOError, OSError, ValueError):
+            # do not let the stats break the publish
+            pass
+
+    if raise_errors:
+        report.raise_errors()
+
+    return report
 
 
 def clear_publishers():
@@ -90,6 +834,8 @@ def clear_publishers():
     """
     publishers[PRE_PUBLISHER_TYPE].clear()
     publishers[POST_PUBLISHER_TYPE].clear()
+    publisher_options.clear()
+    publisher_cache.invalidate()
 
 
 class ProgressControllerBase(object):
@@ -3,8 +3,126 @@
 #
 # This module is part of anima and is released under the MIT
 # License: http://www.opensource.org/licenses/MIT
+import atexit
 import json
 import os
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+
+# the parsed cache files, keyed by their paths, stores
+# ((mtime, size, inode), data) tuples
+_data_cache = {}
+
+# the managers that have unsaved changes
+_pending_managers = set()
+_pending_managers_lock = threading.Lock()
+
+
+def _copy_data(data):
+    """returns a copy of the given recent files data
+    """
+    return dict((env_name, list(paths)) for env_name, paths in data.items())
+
+
+def _get_file_stamp(path):
+    """returns the (mtime, size, inode) of the given file or None if it doesn't
+    exist, the files are always replaced by renaming a temp file so the inode
+    changes on every save even if the mtime resolution is low
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return getattr(stat, 'st_mtime_ns', stat.st_mtime), stat.st_size, \
+        stat.st_ino
+
+
+def _get_pending_managers(path=None):
+    """returns the managers that have unsaved changes
+
+    :param str path: If given only the managers using the given cache file are
+      returned.
+    """
+    with _pending_managers_lock:
+        managers = list(_pending_managers)
+    return [
+        manager for manager in managers
+        if path is None or manager.cache_file_full_path() == path
+    ]
+
+
+def flush_pending_saves(path=None):
+    """saves the pending changes of all the managers in this process
+
+    :param str path: If given only the managers using the given cache file are
+      saved.
+    """
+    for manager in _get_pending_managers(path):
+        manager.flush()
+
+
+class FileLock(object):
+    """An advisory lock that uses a separate lock file, which is shared between
+    the processes on the same machine.
+
+    It uses ``fcntl.flock`` on Linux and OSX and ``msvcrt.locking`` on
+    Windows.
+
+    :param str path: The path of the file to be locked, ``.lock`` is appended
+      to it to get the lock file path.
+    """
+
+    def __init__(self, path):
+        self.path = '%s.lock' % path
+        self._lock_file = None
+
+    def acquire(self):
+        """acquires the lock, blocks until it is acquired
+        """
+        self._lock_file = open(self.path, 'a+')
+        if fcntl is not None:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            self._lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self._lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except IOError:
+                    # LK_LOCK only retries for 10 seconds
+                    pass
+
+    def release(self):
+        """releases the lock
+        """
+        if self._lock_file is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                self._lock_file.seek(0)
+                msvcrt.locking(self._lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
 
 
 class RecentFileManager(object):
@@ -25,14 +143,47 @@ class RecentFileManager(object):
     instance is stored in %HOME/.cache/anima/ folder.
 
     The RecentFileManager instance is restored from the cache folder when a new
-    one is created. So it is kind of a Singleton.
+    one is created. So it is kind of a Singleton. The parsed data is cached per
+    process and the file is parsed again only if its modification time or size
+    is changed, so creating a new RecentFileManager is cheap. Use :meth:`.get`
+    to get the shared manager of this process.
+
+    The changes are saved under an advisory lock. The file is read again
+    before saving, the changes of this instance are merged on top of it, so the
+    changes from other applications are not lost, and the data is written to a
+    temp file which is renamed to the cache file path, so the readers never
+    see a half written file.
+
+    Use :meth:`.save_later` to debounce the saves. The changes are then saved
+    after ``defaults.recent_files_save_delay`` seconds or when the process
+    exits, the changes saved within the delay are written at once. The new
+    managers in this process see the pending changes without saving them.
     """
 
+    _instance = None
+    _instance_lock = threading.Lock()
+
     def __new__(cls):
         """restore from locally saved one
         """
         return super(RecentFileManager, cls).__new__(cls)
 
+    @classmethod
+    def get(cls):
+        """returns the shared manager of this process, creates it if it
+        doesn't exist
+
+        The shared manager is not restored again, its changes are merged with
+        the current data of the file when they are saved, so use it to add
+        files and create a new manager to read the latest data.
+
+        :return: :class:`.RecentFileManager`
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
     @classmethod
     def cache_file_full_path(cls):
         """:return str: the cache file full path
@@ -50,87 +201,278 @@ class RecentFileManager(object):
         )
 
     def __init__(self):
-        self.recent_files = dict()
+        self._recent_files = dict()
+        # the changes that are not saved yet, as (operation, args) tuples
+        self._changes = []
+        self._lock = threading.RLock()
+        self._save_timer = None
         self.restore()
 
+    @property
+    def recent_files(self):
+        """the recent files dictionary, keyed by the environment names
+        """
+        return self._recent_files
+
+    @recent_files.setter
+    def recent_files(self, recent_files):
+        """setter for the recent_files property
+        """
+        with self._lock:
+            self._recent_files = recent_files
+            self._changes.append(('replace', (recent_files,)))
+
     def save(self):
         """save itself to local cache
+
+        The file is read again under the lock and the changes in this instance
+        are merged on top of the current data of the file before writing it.
         """
-        dumped_data = json.dumps(
-            self.recent_files,
-            sort_keys=True,
-            indent=4,
-            separators=(',', ': ')
-        )
-        self._write_data(dumped_data)
+        with self._lock:
+            self._cancel_save_timer()
+            file_full_path = self.cache_file_full_path()
+
+            # create the path first
+            file_path = os.path.dirname(file_full_path)
+            try:
+                os.makedirs(file_path)
+            except OSError:
+                # dir exists
+                pass
+
+            with FileLock(file_full_path):
+                if self._changes:
+                    recent_files = self._merge_changes(
+                        self._read_data(file_full_path)
+                    )
+                else:
+                    recent_files = self._recent_files
+
+                dumped_data = json.dumps(
+                    recent_files,
+                    sort_keys=True,
+                    separators=(',', ':')
+                )
+                self._write_data(dumped_data)
+
+                _data_cache[file_full_path] = (
+                    _get_file_stamp(file_full_path),
+                    _copy_data(recent_files)
+                )
+
+            self._recent_files = recent_files
+            self._changes = []
+            with _pending_managers_lock:
+                _pending_managers.discard(self)
+
+    def save_later(self, delay=None):
+        """saves the changes after the given delay, the saves requested within
+        the delay are combined into one
+
+        :param float delay: The delay in seconds, the default is None which
+          uses ``defaults.recent_files_save_delay``.
+        """
+        if delay is None:
+            from anima import defaults
+            delay = defaults.recent_files_save_delay
+
+        with self._lock:
+            with _pending_managers_lock:
+                _pending_managers.add(self)
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(delay, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def flush(self):
+        """saves the pending changes if there are any
+        """
+        with self._lock:
+            self._cancel_save_timer()
+            with _pending_managers_lock:
+                is_pending = self in _pending_managers
+            if is_pending:
+                self.save()
+
+    def _cancel_save_timer(self):
+        """cancels the debounced save
+        """
+        if self._save_timer is not None:
+            if self._save_timer is not threading.current_thread():
+                self._save_timer.cancel()
+            self._save_timer = None
+
+    def _merge_changes(self, recent_files):
+        """applies the changes of this instance to the given data
+
+        :param dict recent_files: The recent files data read from the file.
+        :return dict: the merged data
+        """
+        from anima import defaults
+        for operation, args in self._changes:
+            if operation == 'replace':
+                recent_files = _copy_data(args[0] or {})
+            elif operation == 'set':
+                env_name, paths = args
+                recent_files[env_name] = list(paths)
+            elif operation == 'add':
+                env_name, file_path = args
+                paths = recent_files.setdefault(env_name, [])
+                if file_path in paths:
+                    paths.remove(file_path)
+                paths.insert(0, file_path)
+                recent_files[env_name] = paths[:defaults.max_recent_files]
+            elif operation == 'remove':
+                env_name, file_path = args
+                paths = recent_files.get(env_name, [])
+                if file_path in paths:
+                    paths.remove(file_path)
+        return recent_files
 
     def _write_data(self, data):
         """Writes the given data to the cache file
 
+        The data is written to a temp file first and then it is renamed to the
+        cache file path.
+
         :param data: the data to be written (generally serialized
           RecentFilesManager class itself).
         """
+        import tempfile
         file_full_path = self.cache_file_full_path()
-
-        # create the path first
         file_path = os.path.dirname(file_full_path)
+
+        fd, temp_file_path = tempfile.mkstemp(
+            dir=file_path,
+            prefix='.%s.' % os.path.basename(file_full_path)
+        )
         try:
-            os.makedirs(file_path)
-        except OSError:
-            # dir exists
-            pass
-        finally:
-            with open(file_full_path, 'w+') as data_file:
-                data_file.writelines(data)
+            with os.fdopen(fd, 'w') as data_file:
+                data_file.write(data)
+            replace = getattr(os, 'replace', None)
+            if replace is not None:
+                replace(temp_file_path, file_full_path)
+            else:
+                # Python 2 can not rename over an existing file on Windows
+                if os.name == 'nt' and os.path.exists(file_full_path):
+                    os.remove(file_full_path)
+                os.rename(temp_file_path, file_full_path)
+        except (IOError, OSError):
+            if os.path.exists(temp_file_path):
+                os.remove(temp_file_path)
+            raise
 
-    def restore(self):
-        """restore from local cache folder
+    @classmethod
+    def _read_data(cls, file_full_path):
+        """reads the recent files data from the given file, the file is parsed
+        only if it is changed after the last read
+
+        :param str file_full_path: The cache file path.
+        :return dict: a copy of the data
         """
+        stamp = _get_file_stamp(file_full_path)
+        if stamp is None:
+            _data_cache.pop(file_full_path, None)
+            return {}
+
+        cached = _data_cache.get(file_full_path)
+        if cached is not None and cached[0] == stamp:
+            return _copy_data(cached[1])
+
         try:
-            with open(RecentFileManager.cache_file_full_path(), 'r') as s:
-                self.recent_files = json.loads(s.read())
+            with open(file_full_path, 'r') as s:
+                data = json.loads(s.read())
         except (IOError, ValueError):
-            pass
+            return {}
+
+        if not isinstance(data, dict):
+            return {}
+
+        _data_cache[file_full_path] = (stamp, data)
+        return _copy_data(data)
+
+    def restore(self):
+        """restore from local cache folder
+
+        The pending changes of the other managers in this process, that are
+        scheduled with :meth:`.save_later`, are applied on top of the data of
+        the file without saving them. The unsaved changes of this instance are
+        discarded.
+        """
+        file_full_path = self.cache_file_full_path()
+        recent_files = self._read_data(file_full_path)
+        for manager in _get_pending_managers(file_full_path):
+            if manager is not self:
+                with manager._lock:
+                    recent_files = manager._merge_changes(recent_files)
 
         # limit maximum recent files
         from anima import defaults
-        for env in self.recent_files:
-            self.recent_files[env] = \
-                self.recent_files[env][:defaults.max_recent_files]
+        for env in recent_files:
+            recent_files[env] = recent_files[env][:defaults.max_recent_files]
+
+        with self._lock:
+            self._changes = []
+            self._recent_files = recent_files
 
-    def add(self, env_name, file_path):
+    def add(self, env_name, file_path, save=True):
         """Saves the given file_path under the given environment name
 
         :param env_name: The name of the environment
         :param file_path: The file_path
+        :param bool save: Saves the changes immediately if True (the default),
+          use :meth:`.save_later` to save the changes otherwise.
         :return: None
         """
-        if env_name not in self.recent_files:
-            self.recent_files[env_name] = []
+        from anima import defaults
+        with self._lock:
+            if env_name not in self._recent_files:
+                self._recent_files[env_name] = []
 
-        if file_path in self.recent_files[env_name]:
-            self.recent_files[env_name].remove(file_path)
+            if file_path in self._recent_files[env_name]:
+                self._recent_files[env_name].remove(file_path)
 
-        self.recent_files[env_name].insert(0, file_path)
+            self._recent_files[env_name].insert(0, file_path)
 
-        # clamp max files stored
-        from anima import defaults
-        self.recent_files[env_name] = \
-            self.recent_files[env_name][:defaults.max_recent_files]
+            # clamp max files stored
+            self._recent_files[env_name] = \
+                self._recent_files[env_name][:defaults.max_recent_files]
+
+            self._changes.append(('add', (env_name, file_path)))
 
-        self.save()
+            if save:
+                self.save()
 
     def remove(self, env_name, file_path):
         """Removes the given path from the recent files list
         """
-        self[env_name].remove(file_path)
+        with self._lock:
+            self[env_name].remove(file_path)
+            self._changes.append(('remove', (env_name, file_path)))
+
+    def clear(self, env_name):
+        """clears the recent files of the given environment and saves the
+        changes immediately
+
+        The pending changes of the managers in this process are saved first,
+        so the files that are added with :meth:`.save_later` before clearing
+        do not come back when they are saved.
+
+        :param str env_name: The name of the environment
+        """
+        file_full_path = self.cache_file_full_path()
+        flush_pending_saves(file_full_path)
+        with self._lock:
+            self.restore()
+            self[env_name] = []
+            self.save()
 
     def __getitem__(self, item):
         """
         :param str item: The name of the environment
         :return:
         """
-        return self.recent_files[item]
+        return self._recent_files[item]
 
     def __setitem__(self, key, value):
         """
@@ -139,4 +481,15 @@ class RecentFileManager(object):
         :param list value: the value
         :return:
         """
-        self.recent_files[key] = value
+        with self._lock:
+            self._recent_files[key] = value
+            self._changes.append(('set', (key, value)))
+
+
+def _flush_at_exit():
+    """saves the pending changes when the interpreter exits
+    """
+    flush_pending_saves()
+
+
+atexit.register(_flush_at_exit)
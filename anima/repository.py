@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2020, Anima Istanbul
+#
+# This module is part of anima and is released under the MIT
+# License: http://www.opensource.org/licenses/MIT
+import os
+import platform
+
+
+class RepositoryRoot(object):
+    """Stores the root paths of a :class:`stalker.Repository`.
+
+    The plain path values are used instead of the Repository instances, so
+    the index can outlive the database session that the repositories are
+    queried with.
+
+    :param int id: The id of the repository.
+    :param str env_var: The environment variable name of the repository.
+    :param str windows_path: The Windows path of the repository.
+    :param str linux_path: The Linux path of the repository.
+    :param str osx_path: The OSX path of the repository.
+    """
+
+    __slots__ = ('id', 'env_var', 'windows_path', 'linux_path', 'osx_path')
+
+    def __init__(self, id=None, env_var='', windows_path='', linux_path='',
+                 osx_path=''):
+        self.id = id
+        self.env_var = env_var
+        self.windows_path = windows_path
+        self.linux_path = linux_path
+        self.osx_path = osx_path
+
+    @property
+    def path(self):
+        """returns the repository path for the current OS
+        """
+        platform_system = platform.system()
+        if platform_system == 'Windows':
+            return self.windows_path
+        elif platform_system == 'Darwin':
+            return self.osx_path
+        return self.linux_path
+
+    @property
+    def repository(self):
+        """returns the :class:`stalker.Repository` instance
+        """
+        from stalker import Repository
+        return Repository.query.get(self.id)
+
+
+class RepositoryIndex(object):
+    """A prefix tree of the repository root paths of all the operating
+    systems.
+
+    It maps a path to its repository and the path relative to the repository
+    root by walking the path once, instead of checking every repository path
+    of every repository for every path. The Windows paths are matched case
+    insensitively and the Linux and OSX paths case sensitively as
+    :meth:`stalker.Repository.find_repo` does, and the longest matching root
+    wins, so nested repositories are also supported. The paths starting with
+    the environment variable of a repository (``$REPO1/...``) are also
+    matched even if the variable is not set.
+
+    Use :meth:`.get` to get the shared index, which is filled once with a
+    single query and refreshed when a Repository is inserted, updated or
+    deleted in this process. Use :meth:`.refresh` to refresh it explicitly.
+
+    :param roots: A list of :class:`.RepositoryRoot` instances.
+    """
+
+    _instance = None
+    _listeners_added = False
+
+    # the key that holds the matching root in a trie node
+    _leaf_key = None
+
+    def __init__(self, roots=None):
+        self.roots = []
+        self._case_sensitive_trie = {}
+        self._case_insensitive_trie = {}
+        if roots is not None:
+            self.update(roots)
+
+    @classmethod
+    def get(cls):
+        """returns the shared index, creates it if it doesn't exist
+
+        :return: :class:`.RepositoryIndex`
+        """
+        if cls._instance is None:
+            index = cls()
+            index.refresh()
+            cls._instance = index
+            cls._add_listeners()
+        return cls._instance
+
+    @classmethod
+    def invalidate(cls, *args):
+        """removes the shared index, so it is filled again the next time it is
+        needed
+        """
+        cls._instance = None
+
+    @classmethod
+    def _add_listeners(cls):
+        """invalidates the shared index when a repository is changed
+        """
+        if cls._listeners_added:
+            return
+        from sqlalchemy import event
+        from stalker import Repository
+        for event_name in ['after_insert', 'after_update', 'after_delete']:
+            event.listen(Repository, event_name, cls.invalidate)
+        cls._listeners_added = True
+
+    def refresh(self):
+        """fills the index with the repositories in the database
+        """
+        from stalker import Repository
+        self.update([
+            RepositoryRoot(
+                id=repo.id,
+                env_var=repo.env_var,
+                windows_path=repo.windows_path,
+                linux_path=repo.linux_path,
+                osx_path=repo.osx_path
+            ) for repo in Repository.query.all()
+        ])
+
+    def update(self, roots):
+        """rebuilds the index with the given roots
+
+        :param roots: A list of :class:`.RepositoryRoot` instances.
+        """
+        self.roots = list(roots)
+        self._case_sensitive_trie = {}
+        self._case_insensitive_trie = {}
+        for root in self.roots:
+            for prefix in [root.linux_path, root.osx_path]:
+                self._insert(self._case_sensitive_trie, prefix, root)
+            self._insert(
+                self._case_insensitive_trie,
+                (root.windows_path or '').lower(),
+                root
+            )
+            if root.env_var:
+                for prefix in ['$%s/' % root.env_var,
+                               '${%s}/' % root.env_var]:
+                    self._insert(self._case_sensitive_trie, prefix, root)
+
+    @classmethod
+    def _insert(cls, trie, prefix, root):
+        """inserts the given prefix to the given trie, the first root added
+        with a prefix is kept as the Repository.find_repo() does
+        """
+        if not prefix:
+            return
+        node = trie
+        for char in prefix:
+            node = node.setdefault(char, {})
+        if cls._leaf_key not in node:
+            node[cls._leaf_key] = (root, len(prefix))
+
+    @classmethod
+    def _search(cls, trie, path):
+        """returns the (root, prefix length) of the longest prefix of the
+        given path in the given trie or None
+        """
+        match = None
+        node = trie
+        leaf_key = cls._leaf_key
+        for char in path:
+            node = node.get(char)
+            if node is None:
+                break
+            if leaf_key in node:
+                match = node[leaf_key]
+        return match
+
+    def _find(self, path):
+        """returns the (root, prefix length, path) of the given path, the
+        returned path is the expanded version of the given path if only that
+        one is matching
+        """
+        if not path:
+            return None, 0, path
+
+        path = path.replace('\\', '/')
+        match = self._search(self._case_sensitive_trie, path)
+        insensitive_match = \
+            self._search(self._case_insensitive_trie, path.lower())
+
+        if insensitive_match is not None \
+           and (match is None or insensitive_match[1] > match[1]):
+            match = insensitive_match
+
+        if match is None:
+            # try with the expanded version
+            expanded_path = os.path.expandvars(path)
+            if expanded_path != path:
+                return self._find(expanded_path)
+            return None, 0, path
+
+        return match[0], match[1], path
+
+    def find_root(self, path):
+        """returns the :class:`.RepositoryRoot` of the given path
+
+        :param str path: A path.
+        :return: :class:`.RepositoryRoot` or None
+        """
+        return self._find(path)[0]
+
+    def find_repo(self, path):
+        """returns the :class:`stalker.Repository` of the given path
+
+        :param str path: A path.
+        :return: :class:`stalker.Repository` or None
+        """
+        root = self.find_root(path)
+        if root is None:
+            return None
+        return root.repository
+
+    def is_in_repo(self, path):
+        """returns True if the given path is in any repository
+
+        :param str path: A path.
+        :return: bool
+        """
+        return self.find_root(path) is not None
+
+    def split(self, path):
+        """returns the :class:`.RepositoryRoot` and the path relative to the
+        repository root of the given path
+
+        :param str path: A path.
+        :return: A (RepositoryRoot, str) tuple, the root is None and the path
+          is returned as it is if the path is not in any repository.
+        """
+        if path:
+            path = os.path.normpath(path).replace('\\', '/')
+        root, prefix_length, matched_path = self._find(path)
+        if root is None:
+            return None, path
+        return root, matched_path[prefix_length:].lstrip('/')
+
+    def trim_repo_path(self, path):
+        """returns the path relative to the repository root of the given path,
+        the path is returned as it is if it is not in any repository
+
+        :param str path: A path.
+        :return: str
+        """
+        root, relative_path = self.split(path)
+        if root is None:
+            return path
+        return relative_path
+
+    def to_os_independent_path(self, path):
+        """returns the os independent version of the given path, like
+        ``$REPO1/Project/Task/file.ma``
+
+        :param str path: A path.
+        :return: str
+        """
+        root, relative_path = self.split(path)
+        if root is None:
+            return path
+        return '$%s/%s' % (root.env_var, relative_path)
+
+    def to_os_independent_paths(self, paths):
+        """returns the os independent versions of the given paths
+
+        :param paths: A list of paths.
+        :return: list of str
+        """
+        return [self.to_os_independent_path(path) for path in paths]
+
+    def to_native_path(self, path):
+        """returns the version of the given path for the current OS
+
+        :param str path: A path.
+        :return: str
+        """
+        root, relative_path = self.split(path)
+        if root is None:
+            return path
+        return '%s/%s' % (root.path.rstrip('/'), relative_path)
+
+    def to_native_paths(self, paths):
+        """returns the versions of the given paths for the current OS
+
+        :param paths: A list of paths.
+        :return: list of str
+        """
+        return [self.to_native_path(path) for path in paths]
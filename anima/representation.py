@@ -36,9 +36,20 @@ class Representation(object):
     base_repr_name = 'Base'
     repr_separator = '@'
 
-    def __init__(self, version=None):
+    def __init__(self, version=None, resolver=None):
         self._version = None
         self.version = version
+        self._resolver = resolver
+
+    @property
+    def resolver(self):
+        """the :class:`.RepresentationResolver` that is used to query the
+        other representations, a new resolver is created for this
+        representation if it is not set
+        """
+        if self._resolver is None:
+            self._resolver = RepresentationResolver()
+        return self._resolver
 
     def _validate_version(self, version):
         """Validates the given version value
@@ -148,16 +159,7 @@ class Representation(object):
 
         # find any version that starts with the base_repr_name
         # under the same task
-        from stalker import Version
-        from stalker.db.session import DBSession
-        from sqlalchemy import distinct
-        take_names = map(
-            lambda x: x[0],
-            DBSession.query(distinct(Version.take_name))
-            .filter(Version.task == self.version.task)
-            .all()
-        )
-        take_names.sort()
+        take_names = self.resolver.get_take_names(self.version)
 
         repr_names = []
         for take_name in take_names:
@@ -185,13 +187,7 @@ class Representation(object):
                 base_take_name, self.repr_separator, repr_name
             )
 
-        from stalker import Version
-        return Version.query\
-            .filter_by(task=self.version.task)\
-            .filter_by(take_name=take_name)\
-            .filter_by(is_published=True)\
-            .order_by(Version.version_number.desc())\
-            .first()
+        return self.resolver.get_published_version(self.version, take_name)
 
     @property
     def repr(self):
@@ -209,3 +205,152 @@ class Representation(object):
             repr_name = self.base_repr_name
 
         return repr_name
+
+
+class RepresentationResolver(object):
+    """Answers the representation queries of many versions from memory.
+
+    All the take names and the latest published versions of each take are
+    queried per task, for all the tasks of the given versions in one go, and
+    are cached per task. So switching all the references of a scene to another
+    representation needs a constant number of queries instead of a couple of
+    queries per reference.
+
+    Use :meth:`.load` to fill the cache for a list of versions up front, the
+    tasks that are not loaded are loaded when they are first needed. The
+    versions of the file paths, like the paths of the references in a scene,
+    can be stored with :meth:`.set_versions` so they are not queried again per
+    path.
+
+    The cached data is not updated with the versions that are created or
+    published later, so create a resolver per operation, like switching the
+    references of a scene, and share it between the :class:`.Representation`
+    instances of that operation. Use :meth:`.invalidate` to invalidate the
+    cached data explicitly.
+    """
+
+    # the number of task ids used in one query
+    batch_size = 500
+
+    def __init__(self):
+        # the sorted take names keyed by task id
+        self._take_names = {}
+        # the latest published version per take name keyed by task id
+        self._published_versions = {}
+        # the versions of the file paths, None for the paths with no version
+        self._versions_by_path = {}
+
+    def set_versions(self, paths, versions):
+        """stores the versions of the given file paths
+
+        :param paths: A list of file paths.
+        :param versions: A list of :class:`stalker.Version` instances or None
+          in the same order with the paths.
+        """
+        for path, version in zip(paths, versions):
+            self._versions_by_path[path] = version
+
+    def has_version(self, path):
+        """returns True if the version of the given file path is stored, the
+        stored version can be None
+        """
+        return path in self._versions_by_path
+
+    def get_version(self, path):
+        """returns the stored version of the given file path or None
+
+        :param str path: The file path.
+        :return: :class:`stalker.Version` or None
+        """
+        return self._versions_by_path.get(path)
+
+    def invalidate(self, task_id=None):
+        """removes the cached data of the given task
+
+        :param int task_id: The id of the task, all the cached data is removed
+          if it is None.
+        """
+        if task_id is None:
+            self._take_names = {}
+            self._published_versions = {}
+        else:
+            self._take_names.pop(task_id, None)
+            self._published_versions.pop(task_id, None)
+
+    def load(self, versions):
+        """loads the representations of the tasks of the given versions, the
+        tasks that are already loaded are skipped
+
+        :param versions: A list of :class:`stalker.Version` instances.
+        """
+        task_ids = []
+        for version in versions:
+            if version is None:
+                continue
+            task_id = version.task_id
+            if task_id not in self._take_names and task_id not in task_ids:
+                task_ids.append(task_id)
+
+        if not task_ids:
+            return
+
+        from sqlalchemy import and_, func
+        from stalker import Version
+        from stalker.db.session import DBSession
+
+        for task_id in task_ids:
+            self._take_names[task_id] = []
+            self._published_versions[task_id] = {}
+
+        for i in range(0, len(task_ids), self.batch_size):
+            batch_task_ids = task_ids[i:i + self.batch_size]
+
+            for task_id, take_name in DBSession.query(
+                    Version.task_id,
+                    Version.take_name)\
+                    .filter(Version.task_id.in_(batch_task_ids))\
+                    .distinct().all():
+                self._take_names[task_id].append(take_name)
+
+            latest_version_numbers = DBSession.query(
+                Version.task_id,
+                Version.take_name,
+                func.max(Version.version_number).label('version_number')
+            ).filter(Version.task_id.in_(batch_task_ids))\
+                .filter(Version.is_published == True)\
+                .group_by(Version.task_id, Version.take_name)\
+                .subquery()
+
+            for v in Version.query.join(
+                    latest_version_numbers,
+                    and_(
+                        Version.task_id == latest_version_numbers.c.task_id,
+                        Version.take_name ==
+                        latest_version_numbers.c.take_name,
+                        Version.version_number ==
+                        latest_version_numbers.c.version_number
+                    )).filter(Version.is_published == True).all():
+                self._published_versions[v.task_id][v.take_name] = v
+
+        for task_id in task_ids:
+            self._take_names[task_id].sort()
+
+    def get_take_names(self, version):
+        """returns the sorted take names of the task of the given version
+
+        :param version: A :class:`stalker.Version` instance.
+        :return: list of str
+        """
+        self.load([version])
+        return self._take_names[version.task_id]
+
+    def get_published_version(self, version, take_name):
+        """returns the latest published version of the task of the given
+        version with the given take name
+
+        :param version: A :class:`stalker.Version` instance.
+        :param str take_name: The take name.
+        :return: :class:`stalker.Version` or None
+        """
+        self.load([version])
+        return self._published_versions[version.task_id].get(take_name)
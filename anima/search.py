@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2020, Anima Istanbul
+#
+# This module is part of anima and is released under the MIT
+# License: http://www.opensource.org/licenses/MIT
+import array
+import threading
+import time
+
+from anima import logger
+
+
+class TaskNameIndex(object):
+    """An in-memory index of the task names for searching as you type.
+
+    The index keeps ``(id, name, path)`` tuples of the tasks sorted by name,
+    where the path is the project code and the names of the parents of the
+    task joined with ``' | '``. The names are indexed by their lower case
+    trigrams, so a search for a text of three or more characters only checks
+    the tasks that have all the trigrams of the text. Shorter texts are
+    matched by scanning the names. The tasks whose names start with the text
+    come first.
+
+    Use :meth:`.get` to get the shared index of the projects of the logged in
+    user, it is filled and refreshed in a background thread, the searches
+    always use the last complete data.
+
+    :param entries: A list of ``(id, name, path)`` tuples.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    refresh_interval = 300  # in seconds
+
+    def __init__(self, entries=None):
+        # (entries, lower case names, trigrams) replaced at once
+        self._data = ([], [], {})
+        self.updated = None
+        self._refresh_thread = None
+        self._refresh_lock = threading.Lock()
+        if entries is not None:
+            self.update(entries)
+
+    @classmethod
+    def get(cls):
+        """returns the shared index, starts filling it in the background if
+        it is not filled yet or it is too old
+
+        :return: :class:`.TaskNameIndex`
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+        index = cls._instance
+        if index.is_expired:
+            index.refresh(wait=False)
+        return index
+
+    @property
+    def is_ready(self):
+        """returns True if the index is filled at least once
+        """
+        return self.updated is not None
+
+    @property
+    def is_expired(self):
+        """returns True if the index should be refreshed
+        """
+        return self.updated is None \
+            or time.time() - self.updated > self.refresh_interval
+
+    @property
+    def entries(self):
+        """returns the ``(id, name, path)`` tuples sorted by name
+        """
+        return self._data[0]
+
+    @classmethod
+    def trigrams(cls, text):
+        """returns the set of the trigrams of the given lower case text
+        """
+        return set(text[i:i + 3] for i in range(len(text) - 2))
+
+    def update(self, entries):
+        """rebuilds the index with the given entries
+
+        :param entries: A list of ``(id, name, path)`` tuples.
+        """
+        entries = sorted(entries, key=lambda x: (x[1].lower(), x[2]))
+        names = [entry[1].lower() for entry in entries]
+        trigrams = {}
+        for i, name in enumerate(names):
+            for trigram in self.trigrams(name):
+                rows = trigrams.get(trigram)
+                if rows is None:
+                    rows = trigrams[trigram] = array.array('l')
+                rows.append(i)
+
+        self._data = (entries, names, trigrams)
+        self.updated = time.time()
+
+    def search(self, text, limit=50):
+        """returns the ``(id, name, path)`` tuples of the tasks whose names
+        contain the given text case insensitively
+
+        :param str text: The text to search for.
+        :param int limit: The maximum number of results.
+        :return: list
+        """
+        text = text.strip().lower()
+        if not text:
+            return []
+
+        entries, names, trigrams = self._data
+        if len(text) < 3:
+            candidates = range(len(names))
+        else:
+            rows_list = sorted(
+                [trigrams.get(trigram, ()) for trigram in self.trigrams(text)],
+                key=len
+            )
+            candidates = set(rows_list[0])
+            for rows in rows_list[1:]:
+                if not candidates:
+                    break
+                candidates.intersection_update(rows)
+            candidates = sorted(candidates)
+
+        starts_with = []
+        contains = []
+        for i in candidates:
+            position = names[i].find(text)
+            if position == 0:
+                starts_with.append(i)
+                if len(starts_with) >= limit:
+                    break
+            elif position > 0 and len(contains) < limit:
+                contains.append(i)
+
+        return [entries[i] for i in (starts_with + contains)[:limit]]
+
+    @classmethod
+    def query_tasks(cls, project_ids=None):
+        """returns the ``(id, name, path)`` tuples of the tasks of the given
+        projects, only the needed columns are queried
+
+        :param list project_ids: The ids of the projects, the default is the
+          projects of the logged in user, or all the projects if there is no
+          logged in user.
+        :return: list
+        """
+        from stalker import LocalSession, Project, Task
+        from stalker.db.session import DBSession
+
+        if project_ids is None:
+            logged_in_user = LocalSession().logged_in_user
+            if logged_in_user:
+                project_ids = \
+                    [project.id for project in logged_in_user.projects]
+
+        project_query = DBSession.query(Project.id, Project.code)
+        task_query = DBSession.query(
+            Task.id, Task.name, Task.parent_id, Task.project_id
+        )
+        if project_ids is not None:
+            project_query = project_query.filter(Project.id.in_(project_ids))
+            task_query = task_query.filter(Task.project_id.in_(project_ids))
+
+        project_codes = dict(project_query.all())
+        tasks = task_query.all()
+        tasks_by_id = dict((task.id, task) for task in tasks)
+
+        paths = {}
+
+        def get_path(task):
+            """returns the path of the given task without recursion
+            """
+            chain = []
+            current = task
+            while current is not None and current.id not in paths:
+                chain.append(current)
+                current = tasks_by_id.get(current.parent_id)
+            for current in reversed(chain):
+                parent = tasks_by_id.get(current.parent_id)
+                if parent is None:
+                    paths[current.id] = \
+                        project_codes.get(current.project_id, '')
+                else:
+                    paths[current.id] = \
+                        '%s | %s' % (paths[parent.id], parent.name)
+            return paths[task.id]
+
+        return [(task.id, task.name, get_path(task)) for task in tasks]
+
+    def refresh(self, project_ids=None, wait=True):
+        """refills the index from the database
+
+        :param list project_ids: The ids of the projects, see
+          :meth:`.query_tasks`.
+        :param bool wait: If False the index is refilled in a background
+          thread with its own database session and this returns immediately.
+        """
+        if wait:
+            self.update(self.query_tasks(project_ids))
+            return
+
+        with self._refresh_lock:
+            if self._refresh_thread is not None \
+               and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(
+                target=self._refresh,
+                args=(project_ids,),
+                name='TaskNameIndex'
+            )
+            self._refresh_thread.daemon = True
+            self._refresh_thread.start()
+
+    def _refresh(self, project_ids):
+        """refills the index in the background thread
+        """
+        from stalker.db.session import DBSession
+        try:
+            self.update(self.query_tasks(project_ids))
+        except Exception as e:
+            logger.debug('could not refresh the task name index: %s' % e)
+        finally:
+            # DBSession is thread local, this closes the session of this
+            # thread only
+            DBSession.remove()
@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2020, Anima Istanbul
+#
+# This module is part of anima and is released under the MIT
+# License: http://www.opensource.org/licenses/MIT
+import collections
+import threading
+
+try:
+    import queue
+except ImportError:  # Python 2
+    import Queue as queue
+
+from anima import logger
+
+
+TimeLogDay = collections.namedtuple(
+    'TimeLogDay', ['date', 'seconds', 'time_logs']
+)
+
+
+class TimeLogCalendarLoader(object):
+    """Loads the daily time logs of a resource month by month.
+
+    Only the time logs starting in the requested month are queried, and the
+    names of their tasks are resolved through a task path map that is shared
+    by all the loaders, so a task and its parents are queried only once. The
+    months around the loaded month are prefetched in a background thread with
+    its own database session, so moving between the months does not wait for
+    the database. Only the ORM is used, the queries run on both SQLite and
+    PostgreSQL.
+
+    The days of a month are returned as a list of :class:`.TimeLogDay`
+    instances sorted by date, the ``time_logs`` of a day are
+    ``(start, end, task_name)`` tuples sorted by their start, where the task
+    name is in ``Name (CODE | Parent | ...)`` form.
+
+    :param int prefetch_months: The number of months to prefetch before and
+      after the loaded month.
+    """
+
+    # shared by all the loaders
+    _task_names = {}  # task id -> task name
+    _task_paths = {}  # task id -> "CODE | Parent | ..."
+    _project_codes = {}  # project id -> project code
+    _task_paths_lock = threading.Lock()
+
+    def __init__(self, prefetch_months=1):
+        self.prefetch_months = prefetch_months
+
+        # (resource_id, year, month) -> list of TimeLogDay
+        self._months = {}
+        # (resource_id, year, month) -> threading.Event of the prefetch
+        self._loading = {}
+        self._lock = threading.Lock()
+
+        self._requests = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+    @classmethod
+    def add_months(cls, year, month, count):
+        """returns the (year, month) that is count months after the given
+        month, count can be negative
+        """
+        index = year * 12 + month - 1 + count
+        return index // 12, index % 12 + 1
+
+    @classmethod
+    def get_month_range(cls, year, month):
+        """returns the start of the given month and the start of the next
+        month as datetimes to be compared with the TimeLog.start values
+        """
+        import datetime
+        start = datetime.datetime(year, month, 1)
+        next_year, next_month = cls.add_months(year, month, 1)
+        end = datetime.datetime(next_year, next_month, 1)
+
+        # TODO: Remove this in a later version
+        import stalker
+        from distutils.version import LooseVersion
+        if LooseVersion(stalker.__version__) >= LooseVersion('0.2.18'):
+            # inject timezone info
+            import pytz
+            start = start.replace(tzinfo=pytz.utc)
+            end = end.replace(tzinfo=pytz.utc)
+
+        return start, end
+
+    @classmethod
+    def query_time_logs(cls, resource_id, year, month):
+        """returns the (task_id, start, end) of the time logs of the given
+        resource that start in the given month, sorted by their start
+        """
+        from stalker import TimeLog
+        from stalker.db.session import DBSession
+        start, end = cls.get_month_range(year, month)
+        return DBSession.query(TimeLog.task_id, TimeLog.start, TimeLog.end)\
+            .filter(TimeLog.resource_id == resource_id)\
+            .filter(TimeLog.start >= start)\
+            .filter(TimeLog.start < end)\
+            .order_by(TimeLog.start)\
+            .all()
+
+    @classmethod
+    def query_task_paths(cls, task_ids):
+        """queries the names and paths of the given tasks and their parents
+        that are not in the task path map yet, the parents are queried level
+        by level with one query per level
+
+        :param task_ids: The ids of the tasks.
+        """
+        from stalker import Project, Task
+        from stalker.db.session import DBSession
+
+        tasks = {}
+        ids = set(task_ids)
+        while ids:
+            rows = DBSession.query(
+                Task.id, Task.name, Task.parent_id, Task.project_id
+            ).filter(Task.id.in_(ids)).all()
+            ids = set()
+            for row in rows:
+                tasks[row.id] = row
+            for row in rows:
+                if row.parent_id is not None \
+                   and row.parent_id not in tasks \
+                   and row.parent_id not in cls._task_paths:
+                    ids.add(row.parent_id)
+
+        project_codes = {}
+        project_ids = set(
+            task.project_id for task in tasks.values()
+            if task.project_id not in cls._project_codes
+        )
+        if project_ids:
+            project_codes.update(
+                DBSession.query(Project.id, Project.code)
+                .filter(Project.id.in_(project_ids))
+                .all()
+            )
+
+        def get_project_code(project_id):
+            code = project_codes.get(project_id)
+            if code is None:
+                code = cls._project_codes.get(project_id, '')
+            return code
+
+        paths = {}
+
+        def get_path(task_id):
+            """returns the path of the given task without recursion
+            """
+            path = paths.get(task_id)
+            if path is None:
+                path = cls._task_paths.get(task_id)
+            return path
+
+        for task in tasks.values():
+            chain = []
+            current = task
+            while current is not None and get_path(current.id) is None:
+                chain.append(current)
+                current = tasks.get(current.parent_id)
+            for current in reversed(chain):
+                parent_path = None
+                if current.parent_id is not None:
+                    parent_path = get_path(current.parent_id)
+                if parent_path is None:
+                    paths[current.id] = get_project_code(current.project_id)
+                else:
+                    parent = tasks.get(current.parent_id)
+                    parent_name = parent.name if parent is not None \
+                        else cls._task_names[current.parent_id]
+                    paths[current.id] = '%s | %s' % (parent_path, parent_name)
+
+        with cls._task_paths_lock:
+            cls._project_codes.update(project_codes)
+            cls._task_names.update(
+                (task.id, task.name) for task in tasks.values()
+            )
+            cls._task_paths.update(paths)
+
+    @classmethod
+    def get_task_paths(cls, task_ids):
+        """returns a dictionary of the task ids and the task paths in
+        ``CODE | Parent | ...`` form, the missing tasks are queried
+        """
+        missing = set(
+            task_id for task_id in task_ids if task_id not in cls._task_paths
+        )
+        if missing:
+            cls.query_task_paths(missing)
+
+        return dict(
+            (task_id, cls._task_paths[task_id])
+            for task_id in task_ids
+            if task_id in cls._task_paths
+        )
+
+    @classmethod
+    def get_task_names(cls, task_ids):
+        """returns a dictionary of the task ids and the task names in
+        ``Name (CODE | Parent | ...)`` form, the missing tasks are queried
+        """
+        return dict(
+            (task_id, u'%s (%s)' % (cls._task_names[task_id], path))
+            for task_id, path in cls.get_task_paths(task_ids).items()
+        )
+
+    @classmethod
+    def clear_task_paths(cls):
+        """clears the shared task path map
+        """
+        with cls._task_paths_lock:
+            cls._task_names.clear()
+            cls._task_paths.clear()
+            cls._project_codes.clear()
+
+    def query_month(self, resource_id, year, month):
+        """queries the days of the given month
+
+        :return: list of :class:`.TimeLogDay`
+        """
+        time_logs = self.query_time_logs(resource_id, year, month)
+        task_names = self.get_task_names(
+            set(time_log[0] for time_log in time_logs)
+        )
+
+        days = collections.OrderedDict()
+        for task_id, start, end in time_logs:
+            days.setdefault(start.date(), []).append(
+                (start, end, task_names.get(task_id, u''))
+            )
+
+        return [
+            TimeLogDay(
+                date,
+                sum((end - start).total_seconds() for start, end, _ in logs),
+                logs
+            )
+            for date, logs in days.items()
+        ]
+
+    def get_month(self, resource_id, year, month):
+        """returns the days of the given month if it is loaded, or None
+        """
+        return self._months.get((resource_id, year, month))
+
+    def load(self, resource_id, year, month):
+        """returns the days of the given month, it is queried only if it is
+        not loaded or prefetched yet, then the months around it are
+        prefetched
+
+        :param int resource_id: The id of the resource.
+        :param int year: The year.
+        :param int month: The month, 1 to 12.
+        :return: list of :class:`.TimeLogDay`
+        """
+        key = (resource_id, year, month)
+        days = self._months.get(key)
+        if days is None:
+            with self._lock:
+                event = self._loading.get(key)
+            if event is not None:
+                # it is being prefetched, do not query it again
+                event.wait()
+                days = self._months.get(key)
+
+        if days is None:
+            days = self.query_month(resource_id, year, month)
+            with self._lock:
+                self._months[key] = days
+
+        self.prefetch(resource_id, year, month)
+        return days
+
+    def prefetch(self, resource_id, year, month):
+        """prefetches the months around the given month in the background
+        """
+        for i in range(1, self.prefetch_months + 1):
+            for count in (-i, i):
+                key = (resource_id,) + self.add_months(year, month, count)
+                with self._lock:
+                    if key in self._months or key in self._loading:
+                        continue
+                    self._loading[key] = threading.Event()
+                self._requests.put(key)
+
+        with self._worker_lock:
+            if self._worker is None and not self._requests.empty():
+                self._worker = threading.Thread(
+                    target=self._work,
+                    name='TimeLogCalendarLoader'
+                )
+                self._worker.daemon = True
+                self._worker.start()
+
+    def wait(self):
+        """waits until the prefetched months are loaded
+        """
+        with self._lock:
+            events = list(self._loading.values())
+        for event in events:
+            event.wait()
+
+    def clear(self):
+        """clears the loaded months
+        """
+        with self._lock:
+            self._months.clear()
+
+    def _work(self):
+        """the worker loop, stops when there are no more months to prefetch
+        """
+        from stalker.db.session import DBSession
+        try:
+            while True:
+                with self._worker_lock:
+                    try:
+                        key = self._requests.get_nowait()
+                    except queue.Empty:
+                        self._worker = None
+                        return
+
+                days = None
+                try:
+                    days = self.query_month(*key)
+                except Exception as e:
+                    logger.debug('could not prefetch time logs: %s' % e)
+
+                with self._lock:
+                    if days is not None:
+                        self._months[key] = days
+                    event = self._loading.pop(key, None)
+                if event is not None:
+                    event.set()
+        finally:
+            # DBSession is thread local, this closes the session of this
+            # thread only
+            DBSession.remove()
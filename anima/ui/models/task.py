@@ -3,6 +3,16 @@
 #
 # This module is part of anima and is released under the MIT
 # License: http://www.opensource.org/licenses/MIT
+import array
+import collections
+import itertools
+import threading
+import time
+
+try:
+    import queue
+except ImportError:  # Python 2
+    import Queue as queue
 
 from anima import logger
 from anima.ui.lib import QtCore, QtGui, QtWidgets
@@ -60,23 +70,110 @@ class TaskIcon(QtGui.QIcon):
 
 
 class TaskNameCompleter(QtWidgets.QCompleter):
+    """Completes task names as the user types.
+
+    The searches are debounced and served from the shared
+    :class:`anima.search.TaskNameIndex`, which is filled in the background.
+    Until the index is ready only the first matching tasks are queried from
+    the database and their paths are resolved through the task path map of
+    :class:`anima.time_log.TimeLogCalendarLoader`. In both cases the results
+    are shown as ``name (CODE | Parent | ...)`` in a single reused model, use
+    :meth:`.get_task_id` to get the id of a completion.
+    """
+
+    debounce_interval = 150  # in milliseconds
+    limit = 50
+
     def __init__(self, parent):
         QtWidgets.QCompleter.__init__(self, [], parent)
+        self.completion_prefix = ''
+        self.results = []
+        self._task_ids = {}
+
+        self._model = QtGui.QStringListModel(self)
+        self.setModel(self._model)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.debounce_interval)
+        QtCore.QObject.connect(
+            self._timer,
+            QtCore.SIGNAL('timeout()'),
+            self.search
+        )
+
+        # start filling the index
+        from anima.search import TaskNameIndex
+        TaskNameIndex.get()
 
     def update(self, completion_prefix):
+        """schedules a search for the given text, the previous scheduled
+        search is discarded
+        """
+        self.completion_prefix = completion_prefix
+        self._timer.start()
+
+    @classmethod
+    def query_tasks(cls, text, limit=50):
+        """returns the ``(id, name, path)`` tuples of the tasks whose names
+        contain the given text, the path is the project code and the names of
+        the parents of the task joined with ``' | '`` as in
+        :class:`anima.search.TaskNameIndex`
+
+        :param str text: The text to search for.
+        :param int limit: The maximum number of results.
+        :return: list
+        """
         from stalker import Task
-        tasks = Task.query \
-            .filter(Task.name.ilike('%' + completion_prefix + '%')) \
+        from stalker.db.session import DBSession
+        from anima.time_log import TimeLogCalendarLoader
+        tasks = DBSession.query(Task.id, Task.name)\
+            .filter(Task.name.ilike('%' + text + '%'))\
+            .order_by(Task.name)\
+            .limit(limit)\
             .all()
-        logger.debug('completer tasks : %s' % tasks)
-        task_names = [task.name for task in tasks]
-        model = QtGui.QStringListModel(task_names)
-        self.setModel(model)
+
+        # the parents are queried level by level and cached
+        paths = TimeLogCalendarLoader.get_task_paths(
+            [task_id for task_id, name in tasks]
+        )
+        return [
+            (task_id, name, paths.get(task_id, ''))
+            for task_id, name in tasks
+        ]
+
+    def search(self):
+        """searches the tasks and updates the completions
+        """
+        from anima.search import TaskNameIndex
+        text = self.completion_prefix.strip()
+        index = TaskNameIndex.get()
+        if not text:
+            results = []
+        elif index.is_ready:
+            results = index.search(text, limit=self.limit)
+        else:
+            results = self.query_tasks(text, limit=self.limit)
+        logger.debug('completer tasks : %s' % len(results))
+
+        self.results = results
+        self._task_ids = {}
+        completions = []
+        for task_id, name, path in results:
+            completion = '%s (%s)' % (name, path)
+            self._task_ids[completion] = task_id
+            completions.append(completion)
+        self._model.setStringList(completions)
         # self.setCompletionPrefix(completion_prefix)
         self.setCompletionPrefix('')
 
-        # if completion_prefix.strip() != '':
-        self.complete()
+        if completions:
+            self.complete()
+
+    def get_task_id(self, completion):
+        """returns the task id of the given completion text
+        """
+        return self._task_ids.get(completion)
 
 
 # class TaskItemDelegate(QtWidgets.QStyledItemDelegate):
@@ -158,183 +255,648 @@ class TaskNameCompleter(QtWidgets.QCompleter):
 #             # )
 
 
-class TaskItem(QtGui.QStandardItem):
-    """Implements the Task as a QStandardItem
+class TaskLoadRequest(object):
+    """A request to load the child tasks of a task in the background.
+
+    :param loader: The :class:`.TaskLoader` that created the request.
+    :param int task_id: The id of the parent task or project.
+    :param str entity_type: The entity type of the parent.
+    :param bool prefetch: True if the request is for prefetching.
+    """
+
+    __slots__ = ('id', 'loader', 'task_id', 'entity_type', 'prefetch',
+                 'cancelled')
+
+    def __init__(self, loader, task_id, entity_type, prefetch=False):
+        self.id = next(TaskLoader._counter)
+        self.loader = loader
+        self.task_id = task_id
+        self.entity_type = entity_type
+        self.prefetch = prefetch
+        self.cancelled = False
+
+
+class TaskLoader(object):
+    """Loads the child tasks of :class:`.TaskItem` s in a background thread.
 
+    All the loaders share one worker thread, which uses its own thread local
+    ``DBSession``. The results are passed back to the GUI thread through a
+    queue which is polled with a QTimer, and are added to the items in
+    batches, so expanding a big folder doesn't freeze the UI.
 
-    :param entity: An entity that has id, name, entity_type, status_id and
-      has_children fields
+    When the children of an item are loaded, the children of its first
+    ``prefetch_limit`` child tasks are prefetched with a lower priority, and
+    the prefetched data is used when those items are expanded.
+
+    :param bool prefetch: Enables prefetching, the default is True.
     """
 
-    task_entity_types = ['Task', 'Asset', 'Shot', 'Sequence']
+    batch_size = 100
+    poll_interval = 20  # in milliseconds
+    time_budget = 0.02  # time spent adding items per poll in seconds
+    prefetch_limit = 8
+    prefetch_timeout = 60  # in seconds
+    max_prefetched = 200
+
+    # shared between all the loaders
+    _requests = queue.PriorityQueue()
+    _counter = itertools.count(1)
+    _worker = None
+    _worker_lock = threading.Lock()
+
+    # request priorities
+    LOAD = 0
+    PREFETCH = 1
+
+    def __init__(self, prefetch=True):
+        self.prefetch = prefetch
+        self._results = queue.Queue()
+        # request id -> (request, TaskItem), only accessed in the GUI thread
+        self._pending = {}
+        # request id -> the rows added so far, used for prefetching
+        self._loaded = {}
+        # task id -> prefetch request
+        self._prefetching = {}
+        # task id -> (time, rows)
+        self._prefetched = {}
+        self._timer = None
+
+    def load(self, item):
+        """starts loading the children of the given item, the results are
+        added to the item with :meth:`.TaskItem.add_children` and
+        :meth:`.TaskItem.finish_loading` in the GUI thread
+
+        :param item: A :class:`.TaskItem` instance.
+        :return: :class:`.TaskLoadRequest`
+        """
+        task_id = item.task.id
+        prefetch_request = self._prefetching.pop(task_id, None)
+        if prefetch_request:
+            prefetch_request.cancelled = True
 
-    def __init__(self, *args, **kwargs):
-        self.task = kwargs.pop('task', None)
-        self.loaded = False
-        self.fetched_all = False
+        request = \
+            TaskLoadRequest(self, task_id, item.task.entity_type)
+        self._pending[request.id] = (request, item)
+        self._put(self.LOAD, request)
+        return request
 
-        QtGui.QStandardItem.__init__(self, *args, **kwargs)
-        logger.debug(
-            'TaskItem.__init__() is started for item: %s' % self.text()
-        )
-        self.parent = None
-        self.setEditable(False)
-        logger.debug(
-            'TaskItem.__init__() is finished for item: %s' % self.text()
-        )
+    def cancel(self, request):
+        """cancels the given request, the results of it are ignored
 
-        icon = TaskIcon(self.task.entity_type)
-        self.setData(icon, QtCore.Qt.DecorationRole)
-        self.setData(self.task.name, QtCore.Qt.DisplayRole)
+        :param request: A :class:`.TaskLoadRequest` instance.
+        """
+        request.cancelled = True
+        self._pending.pop(request.id, None)
+        self._loaded.pop(request.id, None)
+        if self._prefetching.get(request.task_id) is request:
+            del self._prefetching[request.task_id]
+
+    def cancel_all(self):
+        """cancels all the requests of this loader, call it before deleting
+        the model that uses this loader
+        """
+        for request, item in self._pending.values():
+            request.cancelled = True
+        for request in self._prefetching.values():
+            request.cancelled = True
+        self._pending = {}
+        self._loaded = {}
+        self._prefetching = {}
+        self._prefetched = {}
+        if self._timer:
+            self._timer.stop()
+
+    def get_prefetched(self, task_id):
+        """returns and removes the prefetched children data of the given task,
+        returns None if it is not prefetched or it is too old
+
+        :param int task_id: The id of the parent task or project.
+        :return: list
+        """
+        data = self._prefetched.pop(task_id, None)
+        if data and time.time() - data[0] < self.prefetch_timeout:
+            return data[1]
 
-    def clone(self):
-        """returns a copy of this item
+    def clear_prefetched(self):
+        """clears the prefetched data, call it when the tasks are modified
         """
-        logger.debug('TaskItem.clone() is started for item: %s' % self.text())
-        new_item = TaskItem(task=self.task)
-        new_item.parent = self.parent
-        new_item.fetched_all = self.fetched_all
-        logger.debug('TaskItem.clone() is finished for item: %s' % self.text())
-        return new_item
+        for request in self._prefetching.values():
+            request.cancelled = True
+        self._prefetching = {}
+        self._prefetched = {}
 
-    def canFetchMore(self):
-        logger.debug(
-            'TaskItem.canFetchMore() is started for item: %s' % self.text()
-        )
-        # return_value = False
-        if self.task and self.task.id and not self.fetched_all:
-            return_value = self.task.has_children
-        else:
-            return_value = False
-        logger.debug(
-            'TaskItem.canFetchMore() is finished for item: %s' % self.text()
-        )
-        return return_value
+    def prefetch_children(self, rows):
+        """prefetches the children of the tasks in the given rows which are
+        likely to be expanded next
 
-    def fetchMore(self):
-        logger.debug(
-            'TaskItem.fetchMore() is started for item: %s' % self.text()
-        )
+        :param list rows: The child task data returned by
+          :meth:`.query_children`.
+        """
+        if not self.prefetch:
+            return
 
-        if self.canFetchMore():
-            from sqlalchemy.orm import aliased
-            from sqlalchemy.dialects.postgresql import array_agg
-            from stalker import Task, User
-            from stalker.models.task import Task_Resources
-            from stalker.db.session import DBSession
-
-            inner_tasks = aliased(Task)
-            subquery = DBSession.query(Task.id) \
-                .filter(Task.id == inner_tasks.parent_id)
-
-            query = DBSession.query(
-                Task.id,
-                Task.name,
-                Task.entity_type,
-                Task.status_id,
-                subquery.exists().label('has_children'),
-                array_agg(User.name).label('resources')
-            ) \
-                .outerjoin(Task_Resources, Task.__table__.c.id == Task_Resources.c.task_id) \
-                .outerjoin(User, Task_Resources.c.resource_id == User.id) \
-                .group_by(
-                Task.id,
-                Task.name,
-                Task.entity_type,
-                Task.status_id,
-                subquery.exists().label('has_children')
+        count = 0
+        for row in rows:
+            if count >= self.prefetch_limit \
+               or len(self._prefetched) + len(self._prefetching) \
+               >= self.max_prefetched:
+                break
+            if not row.has_children:
+                continue
+            count += 1
+            if row.id in self._prefetched or row.id in self._prefetching:
+                continue
+            request = TaskLoadRequest(
+                self, row.id, row.entity_type, prefetch=True
             )
+            self._prefetching[row.id] = request
+            self._put(self.PREFETCH, request)
+
+    @classmethod
+    def query_children(cls, task_id, entity_type):
+        """returns the data of the child tasks of the given task or project,
+        it only uses the ids so it can be called from any thread
+
+        :param int task_id: The id of the parent task or project.
+        :param str entity_type: The entity type of the parent.
+        :return: A list of rows with id, name, entity_type, status_id,
+          has_children and resources fields.
+        """
+        from sqlalchemy.orm import aliased
+        from sqlalchemy.dialects.postgresql import array_agg
+        from stalker import Task, User
+        from stalker.models.task import Task_Resources
+        from stalker.db.session import DBSession
+
+        inner_tasks = aliased(Task)
+        subquery = DBSession.query(Task.id) \
+            .filter(Task.id == inner_tasks.parent_id)
+
+        query = DBSession.query(
+            Task.id,
+            Task.name,
+            Task.entity_type,
+            Task.status_id,
+            subquery.exists().label('has_children'),
+            array_agg(User.name).label('resources')
+        ) \
+            .outerjoin(Task_Resources, Task.__table__.c.id == Task_Resources.c.task_id) \
+            .outerjoin(User, Task_Resources.c.resource_id == User.id) \
+            .group_by(
+            Task.id,
+            Task.name,
+            Task.entity_type,
+            Task.status_id,
+            subquery.exists().label('has_children')
+        )
 
-            if self.task.entity_type != 'Project':
-                # query child tasks
-                query = query.filter(Task.parent_id == self.task.id)
-            else:
-                # query only root tasks
-                query = query.filter(Task.project_id == self.task.id)\
-                    .filter(Task.parent_id==None)
+        if entity_type != 'Project':
+            # query child tasks
+            query = query.filter(Task.parent_id == task_id)
+        else:
+            # query only root tasks
+            query = query.filter(Task.project_id == task_id)\
+                .filter(Task.parent_id==None)
 
-            tasks = query.order_by(Task.name).all()
+        return query.order_by(Task.name).all()
 
-            # # model = self.model() # This will cause a SEGFAULT
-            # # TODO: update it later on
+    def _put(self, priority, request):
+        """queues the given request and starts polling the results
+        """
+        self._requests.put((priority, request.id, request))
+        self._start_worker()
+
+        if self._timer is None:
+            self._timer = QtCore.QTimer()
+            self._timer.setInterval(self.poll_interval)
+            QtCore.QObject.connect(
+                self._timer,
+                QtCore.SIGNAL('timeout()'),
+                self.process_results
+            )
+        if not self._timer.isActive():
+            self._timer.start()
 
-            # start = time.time()
-            from anima import defaults
-            task_items = []
-            for task in tasks:
-                task_item = TaskItem(0, 4, task=task)
-                task_item.parent = self
-
-                # color with task status
-                task_item.setData(
-                    QtGui.QColor(
-                        *defaults.status_colors_by_id[task.status_id]
-                    ),
-                    QtCore.Qt.BackgroundRole
+    @classmethod
+    def _start_worker(cls):
+        """starts the shared worker thread if it is not running
+        """
+        with cls._worker_lock:
+            if cls._worker is None or not cls._worker.is_alive():
+                cls._worker = threading.Thread(
+                    target=cls._work,
+                    name='TaskLoader'
                 )
+                cls._worker.daemon = True
+                cls._worker.start()
 
-                # use black text
-                task_item.setForeground(
-                    QtGui.QBrush(QtGui.QColor(0, 0, 0))
+    @classmethod
+    def _work(cls):
+        """the worker loop
+        """
+        from stalker.db.session import DBSession
+        while True:
+            priority, request_id, request = cls._requests.get()
+            if request.cancelled:
+                continue
+
+            rows = []
+            error = None
+            try:
+                # use the loader of the request, so the loaders can override
+                # query_children() and batch_size
+                rows = request.loader.query_children(
+                    request.task_id, request.entity_type
+                )
+            except Exception as e:
+                error = e
+            finally:
+                # DBSession is thread local, this closes the session of this
+                # thread only
+                DBSession.remove()
+
+            results = request.loader._results
+            if request.prefetch or error:
+                results.put((request, rows, True, error))
+                continue
+
+            batch_size = request.loader.batch_size
+            for i in range(0, len(rows), batch_size):
+                if request.cancelled:
+                    break
+                is_last = i + batch_size >= len(rows)
+                results.put((request, rows[i:i + batch_size], is_last, None))
+            if not rows:
+                results.put((request, rows, True, None))
+
+    def process_results(self):
+        """adds the loaded children to the items, it is called periodically
+        in the GUI thread while there are requests in progress
+        """
+        deadline = time.time() + self.time_budget
+        while time.time() < deadline:
+            try:
+                request, rows, done, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            if request.cancelled:
+                continue
+
+            if error:
+                logger.debug(
+                    'could not load children of task %s: %s' %
+                    (request.task_id, error)
                 )
 
-                task_items.append(task_item)
+            if request.prefetch:
+                self._prefetching.pop(request.task_id, None)
+                if not error:
+                    self._prefetched[request.task_id] = (time.time(), rows)
+                continue
 
-            if task_items:
-                # self.appendRows(task_items)
-                for task_item in task_items:
-                    # TODO: Create a custom QStandardItem for each data type in different columns
-                    entity_type_item = QtGui.QStandardItem()
-                    entity_type_item.setData(task_item.task.entity_type, QtCore.Qt.DisplayRole)
+            if request.id not in self._pending:
+                continue
+            item = self._pending[request.id][1]
+            loaded = self._loaded.setdefault(request.id, [])
+            loaded.extend(rows)
 
-                    resources_item = QtGui.QStandardItem()
-                    if task_item.task.resources != [None]:
-                        resources_item.setData(', '.join(map(str, task_item.task.resources)), QtCore.Qt.DisplayRole)
+            try:
+                item.add_children(rows)
+                if done:
+                    self.cancel(request)
+                    item.finish_loading(error)
+            except RuntimeError:
+                # the item is deleted along with its model
+                self.cancel(request)
+                continue
 
-                    self.appendRow([task_item, entity_type_item, resources_item])
+            if done and not error:
+                self.prefetch_children(loaded)
 
-            self.fetched_all = True
+        if not self._pending and not self._prefetching \
+           and self._results.empty():
+            self._timer.stop()
 
-        logger.debug(
-            'TaskItem.fetchMore() is finished for item: %s' % self.text()
-        )
+
+TaskData = collections.namedtuple(
+    'TaskData',
+    ['id', 'name', 'entity_type', 'status_id', 'has_children', 'resources']
+)
+
+
+class TaskItem(object):
+    """A handle to a task in a :class:`.TaskTreeModel`.
+
+    The model keeps the data of the tasks in arrays, the items are created on
+    demand by :meth:`.TaskTreeModel.itemFromIndex` and keep the API of the
+    QStandardItem based items that were used before.
+
+    :param model: The :class:`.TaskTreeModel` instance.
+    :param int task_row: The row of the task in the arrays of the model.
+    """
+
+    task_entity_types = ['Task', 'Asset', 'Shot', 'Sequence']
+
+    def __init__(self, model, task_row):
+        self._model = model
+        self.task_row = task_row
+
+    def __eq__(self, other):
+        return isinstance(other, TaskItem) \
+            and other._model is self._model \
+            and other.task_row == self.task_row
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((id(self._model), self.task_row))
+
+    def model(self):
+        """returns the model of this item
+        """
+        return self._model
+
+    def index(self, column=0):
+        """returns the QModelIndex of this item
+        """
+        return self._model.get_index(self.task_row, column)
+
+    def text(self):
+        """returns the name of the task
+        """
+        return self._model.names[self.task_row]
+
+    @property
+    def task(self):
+        """returns the :class:`.TaskData` of this item, it is None for the
+        loading placeholder
+        """
+        return self._model.get_task_data(self.task_row)
+
+    @property
+    def parent(self):
+        """returns the parent item or None for projects
+        """
+        parent_row = self._model.parent_rows[self.task_row]
+        if parent_row >= 0:
+            return TaskItem(self._model, parent_row)
+
+    @property
+    def load_request(self):
+        """returns the :class:`.TaskLoadRequest` that is loading the children
+        of this item
+        """
+        return self._model.load_requests.get(self.task_row)
+
+    def canFetchMore(self):
+        return self._model.can_fetch_more(self.task_row)
+
+    def fetchMore(self):
+        self._model.fetch_children(self.task_row)
 
     def hasChildren(self):
-        logger.debug(
-            'TaskItem.hasChildren() is started for item: %s' % self.text()
-        )
-        return_value = self.task.has_children
+        return bool(self._model.has_children[self.task_row])
 
-        logger.debug(
-            'TaskItem.hasChildren() is finished for item: %s' % self.text()
-        )
-        return return_value
+    def load_children(self):
+        """loads the children of this item in the current thread, cancels
+        the background loading if there is any
+        """
+        self._model.load_children(self.task_row)
 
-    def type(self, *args, **kwargs):
+    def add_children(self, tasks):
+        """adds the given child task data, called by the :class:`.TaskLoader`
         """
+        self._model.add_children(self.task_row, tasks)
+
+    def finish_loading(self, error=None):
+        """called by the :class:`.TaskLoader` when all the children are added
+        """
+        self._model.finish_loading(self.task_row, error)
+
+    def cancel_loading(self):
+        """cancels the background loading of the children
         """
-        return QtGui.QStandardItem.UserType + 1
+        self._model.cancel_loading(self.task_row)
 
     def reload(self):
         """reloads the self data
         """
-        # delete all the children and fetch them again
-        for i in range(self.rowCount()):
-            self.removeRow(0)
-        self.fetched_all = False
-        self.fetchMore()
+        self._model.reload_row(self.task_row)
 
 
-class TaskTreeModel(QtGui.QStandardItemModel):
+class TaskTreeModel(QtCore.QAbstractItemModel):
     """Implements the model view for the task hierarchy
+
+    The data of the tasks are kept in parallel arrays and a task is
+    referred by its row in these arrays. The rows of the children of a task
+    are kept in :attr:`.children`, and the :class:`QModelIndex` es carry the
+    row of the task as their internal id. Icons, colors and fonts are shared.
+
+    The child tasks are loaded in a background thread by a
+    :class:`.TaskLoader`, call :meth:`.cancel_all_fetches` before deleting the
+    model.
     """
 
+    headers = ['Name', 'Type', 'Resources', 'Dependencies']
+
+    # shared display data
+    _icons = {}
+    _status_colors = {}
+    _foreground = None
+    _project_font = None
+
     def __init__(self, *args, **kwargs):
-        QtGui.QStandardItemModel.__init__(self, *args, **kwargs)
+        QtCore.QAbstractItemModel.__init__(self, *args, **kwargs)
         logger.debug('TaskTreeModel.__init__() is started')
         self.root = None
+        self.loader = TaskLoader()
+        self._clear()
         logger.debug('TaskTreeModel.__init__() is finished')
 
+    def _clear(self):
+        """clears the task data
+        """
+        self.ids = array.array('l')
+        self.parent_rows = array.array('l')
+        # the positions of the tasks under their parents
+        self.positions = array.array('l')
+        self.names = []
+        self.entity_types = []
+        self.status_ids = array.array('l')
+        self.has_children = bytearray()
+        self.fetched = bytearray()
+        self.resources = []
+        # the rows of the child tasks or None
+        self.children = []
+        self.root_rows = []
+        self.rows_by_id = {}
+        # row -> TaskLoadRequest
+        self.load_requests = {}
+        # row -> row of the loading placeholder
+        self.loading_rows = {}
+
+    def _add_row(self, parent_row, task_id, name, entity_type, status_id,
+                 has_children, resources):
+        """adds a row to the arrays and returns it, the row is not added to
+        the children of its parent
+        """
+        row = len(self.ids)
+        self.ids.append(task_id)
+        self.parent_rows.append(parent_row)
+        self.positions.append(0)
+        self.names.append(name)
+        self.entity_types.append(entity_type)
+        self.status_ids.append(-1 if status_id is None else status_id)
+        self.has_children.append(1 if has_children else 0)
+        self.fetched.append(0)
+        self.resources.append(resources)
+        self.children.append(None)
+        if task_id:
+            self.rows_by_id[task_id] = row
+        return row
+
+    def _discard_row(self, row):
+        """removes the given row and its children from the id index and
+        cancels loading its children, the data stays in the arrays until the
+        model is populated again
+        """
+        if self.rows_by_id.get(self.ids[row]) == row:
+            del self.rows_by_id[self.ids[row]]
+        request = self.load_requests.pop(row, None)
+        if request:
+            self.loader.cancel(request)
+        self.loading_rows.pop(row, None)
+        for child_row in self.children[row] or []:
+            self._discard_row(child_row)
+        self.children[row] = None
+
+    @classmethod
+    def get_icon(cls, entity_type):
+        """returns the shared icon for the given entity type
+        """
+        icon = cls._icons.get(entity_type)
+        if icon is None:
+            icon = TaskIcon(entity_type=entity_type)
+            cls._icons[entity_type] = icon
+        return icon
+
+    @classmethod
+    def get_status_color(cls, status_id):
+        """returns the shared color for the given status id
+        """
+        color = cls._status_colors.get(status_id)
+        if color is None:
+            from anima import defaults
+            rgb = defaults.status_colors_by_id.get(status_id)
+            if rgb:
+                color = QtGui.QColor(*rgb)
+                cls._status_colors[status_id] = color
+        return color
+
+    @classmethod
+    def get_foreground(cls):
+        """returns the shared foreground brush, it uses black text
+        """
+        if cls._foreground is None:
+            cls._foreground = QtGui.QBrush(QtGui.QColor(0, 0, 0))
+        return cls._foreground
+
+    @classmethod
+    def get_project_font(cls):
+        """returns the shared bold font of the projects
+        """
+        if cls._project_font is None:
+            cls._project_font = QtGui.QFont()
+            cls._project_font.setBold(True)
+        return cls._project_font
+
+    @classmethod
+    def format_resources(cls, resources):
+        """returns the resource names as a comma separated string
+        """
+        if resources and resources != [None]:
+            return ', '.join(map(str, resources))
+
+    def get_task_data(self, row):
+        """returns the :class:`.TaskData` of the given row, returns None for
+        the loading placeholder
+        """
+        if not self.ids[row]:
+            return None
+        return TaskData(
+            self.ids[row],
+            self.names[row],
+            self.entity_types[row],
+            self.status_ids[row] if self.status_ids[row] >= 0 else None,
+            bool(self.has_children[row]),
+            self.resources[row]
+        )
+
+    def get_index(self, row, column=0):
+        """returns the QModelIndex of the given row
+        """
+        return self.createIndex(self.positions[row], column, row)
+
+    def get_task_id(self, index):
+        """returns the id of the task at the given index
+        """
+        if index.isValid():
+            return self.ids[index.internalId()] or None
+
+    def find_item(self, task_id):
+        """returns the :class:`.TaskItem` of the task with the given id if it
+        is loaded, returns None otherwise
+        """
+        row = self.rows_by_id.get(task_id)
+        if row is not None:
+            return TaskItem(self, row)
+
+    @classmethod
+    def query_task_path(cls, task_id):
+        """returns the ids of the project and the parents of the given task
+        and the task itself, starting from the project, with one query
+
+        :param int task_id: The id of a task or project.
+        :return: list
+        """
+        from sqlalchemy import literal
+        from stalker import Task
+        from stalker.db.session import DBSession
+
+        tasks = Task.__table__
+        ancestors = DBSession.query(
+            tasks.c.id,
+            tasks.c.parent_id,
+            tasks.c.project_id,
+            literal(0).label('depth')
+        ).filter(tasks.c.id == task_id).cte('ancestors', recursive=True)
+
+        ancestors = ancestors.union_all(
+            DBSession.query(
+                tasks.c.id,
+                tasks.c.parent_id,
+                tasks.c.project_id,
+                ancestors.c.depth + 1
+            ).filter(tasks.c.id == ancestors.c.parent_id)
+        )
+
+        rows = DBSession.query(ancestors.c.id, ancestors.c.project_id)\
+            .order_by(ancestors.c.depth.desc())\
+            .all()
+
+        if not rows:
+            # a project
+            return [task_id]
+        return [rows[0].project_id] + [row.id for row in rows]
+
+    def itemFromIndex(self, index):
+        """returns the :class:`.TaskItem` of the given index
+        """
+        if index.isValid():
+            return TaskItem(self, index.internalId())
+
     def flags(self, model_index):
         """Returns model flags
 
@@ -344,46 +906,257 @@ class TaskTreeModel(QtGui.QStandardItemModel):
         if not model_index.isValid():
             return QtCore.Qt.ItemIsEnabled
 
-        # super(TaskTreeModel, self).flags(model_index)
+        if not self.ids[model_index.internalId()]:
+            # the loading placeholder
+            return QtCore.Qt.NoItemFlags
+
         return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable  # \
                # | QtCore.Qt.ItemIsEditable | QtCore.Qt.ItemIsDropEnabled
 
+    def index(self, position, column, parent=QtCore.QModelIndex()):
+        """returns the index of the child at the given position
+        """
+        if parent.isValid():
+            if parent.column() != 0:
+                return QtCore.QModelIndex()
+            rows = self.children[parent.internalId()] or []
+        else:
+            rows = self.root_rows
+
+        if 0 <= position < len(rows) and 0 <= column < len(self.headers):
+            return self.createIndex(position, column, rows[position])
+        return QtCore.QModelIndex()
+
+    def parent(self, index=None):
+        """returns the parent index of the given index
+        """
+        if index is None:
+            # QObject.parent()
+            return QtCore.QAbstractItemModel.parent(self)
+
+        if not index.isValid():
+            return QtCore.QModelIndex()
+
+        parent_row = self.parent_rows[index.internalId()]
+        if parent_row < 0:
+            return QtCore.QModelIndex()
+        return self.get_index(parent_row)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if not parent.isValid():
+            return len(self.root_rows)
+        if parent.column() != 0:
+            return 0
+        return len(self.children[parent.internalId()] or [])
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return len(self.headers)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal \
+           and role == QtCore.Qt.DisplayRole \
+           and 0 <= section < len(self.headers):
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        """returns the data of the given index, it is generated from the
+        arrays on demand
+        """
+        if not index.isValid():
+            return None
+
+        row = index.internalId()
+        column = index.column()
+        if role == QtCore.Qt.DisplayRole:
+            if column == 0:
+                return self.names[row]
+            elif not self.ids[row]:
+                return None
+            elif column == 1:
+                return self.entity_types[row]
+            elif column == 2:
+                return self.resources[row]
+        elif column != 0 or not self.ids[row]:
+            return None
+        elif role == QtCore.Qt.DecorationRole:
+            return self.get_icon(self.entity_types[row])
+        elif role == QtCore.Qt.BackgroundRole:
+            return self.get_status_color(self.status_ids[row])
+        elif role == QtCore.Qt.ForegroundRole:
+            return self.get_foreground()
+        elif role == QtCore.Qt.FontRole and self.parent_rows[row] < 0:
+            return self.get_project_font()
+        return None
+
     def populateTree(self, projects):
         """populates tree with user projects
         """
         logger.debug('TaskTreeModel.populateTree() is started')
-        self.setColumnCount(4)
-        self.setHorizontalHeaderLabels(
-            ['Name', 'Type', 'Resources', 'Dependencies']
-        )
-
+        self.loader.cancel_all()
+        self.beginResetModel()
+        self._clear()
         for project in projects:
-            project_item = TaskItem(0, 4, task=project)
-            project_item.parent = None
-            project_item.setColumnCount(4)
+            row = self._add_row(
+                -1,
+                project.id,
+                project.name,
+                project.entity_type,
+                project.status_id,
+                getattr(project, 'has_children', True),
+                None
+            )
+            self.positions[row] = len(self.root_rows)
+            self.root_rows.append(row)
+        self.endResetModel()
+        logger.debug('TaskTreeModel.populateTree() is finished')
 
-            # Set Font
-            my_font = project_item.font()
-            my_font.setBold(True)
-            project_item.setFont(my_font)
+    def add_children(self, row, tasks):
+        """adds the given child task data under the given row, before the
+        loading placeholder if there is one
 
-            # color with task status
-            from anima import defaults
-            project_item.setData(
-                QtGui.QColor(
-                    *defaults.status_colors_by_id.get(project.status_id)
-                ),
-                QtCore.Qt.BackgroundRole
+        :param int row: The row of the parent task.
+        :param list tasks: The child task data returned by
+          :meth:`.TaskLoader.query_children`.
+        """
+        if not tasks:
+            return
+
+        rows = self.children[row]
+        if rows is None:
+            rows = self.children[row] = []
+
+        position = len(rows)
+        placeholder_row = self.loading_rows.get(row)
+        if placeholder_row is not None:
+            position = self.positions[placeholder_row]
+
+        self.beginInsertRows(
+            self.get_index(row), position, position + len(tasks) - 1
+        )
+        rows[position:position] = [
+            self._add_row(
+                row,
+                task.id,
+                task.name,
+                task.entity_type,
+                task.status_id,
+                task.has_children,
+                self.format_resources(task.resources)
             )
+            for task in tasks
+        ]
+        for i in range(position, len(rows)):
+            self.positions[rows[i]] = i
+        self.endInsertRows()
+
+    def remove_children(self, row):
+        """removes the children of the given row
+        """
+        rows = self.children[row]
+        if rows:
+            self.beginRemoveRows(self.get_index(row), 0, len(rows) - 1)
+            for child_row in rows:
+                self._discard_row(child_row)
+            self.children[row] = None
+            self.endRemoveRows()
+        self.loading_rows.pop(row, None)
+        self.fetched[row] = 0
+
+    def can_fetch_more(self, row):
+        """returns True if the children of the given row can be fetched
+        """
+        return bool(
+            self.ids[row]
+            and self.has_children[row]
+            and not self.fetched[row]
+            and row not in self.load_requests
+        )
+
+    def fetch_children(self, row):
+        """fetches the children of the given row from the prefetched data or
+        starts loading them in the background
+        """
+        if not self.can_fetch_more(row):
+            return
 
-            # use black text
-            project_item.setForeground(
-                QtGui.QBrush(QtGui.QColor(0, 0, 0))
+        tasks = self.loader.get_prefetched(self.ids[row])
+        if tasks is not None:
+            self.add_children(row, tasks)
+            self.fetched[row] = 1
+        else:
+            self.start_loading(row)
+
+    def load_children(self, row):
+        """loads the children of the given row in the current thread
+        """
+        self.cancel_loading(row)
+        if not self.can_fetch_more(row):
+            return
+
+        tasks = self.loader.get_prefetched(self.ids[row])
+        if tasks is None:
+            tasks = TaskLoader.query_children(
+                self.ids[row], self.entity_types[row]
             )
+        self.add_children(row, tasks)
+        self.fetched[row] = 1
+
+    def start_loading(self, row):
+        """adds the loading placeholder and starts loading the children of the
+        given row in the background
+        """
+        rows = self.children[row]
+        if rows is None:
+            rows = self.children[row] = []
 
-            self.appendRow(project_item)
+        self.beginInsertRows(self.get_index(row), len(rows), len(rows))
+        placeholder_row = \
+            self._add_row(row, 0, u'Loading…', None, None, False, None)
+        self.positions[placeholder_row] = len(rows)
+        rows.append(placeholder_row)
+        self.endInsertRows()
 
-        logger.debug('TaskTreeModel.populateTree() is finished')
+        self.loading_rows[row] = placeholder_row
+        self.load_requests[row] = self.loader.load(TaskItem(self, row))
+
+    def finish_loading(self, row, error=None):
+        """removes the loading placeholder of the given row
+
+        :param error: The exception raised while loading the children, the
+          children are fetched again when the item is expanded next time.
+        """
+        self.load_requests.pop(row, None)
+        placeholder_row = self.loading_rows.pop(row, None)
+        if placeholder_row is not None:
+            position = self.positions[placeholder_row]
+            self.beginRemoveRows(self.get_index(row), position, position)
+            rows = self.children[row]
+            del rows[position]
+            for i in range(position, len(rows)):
+                self.positions[rows[i]] = i
+            self.endRemoveRows()
+        self.fetched[row] = 1 if error is None else 0
+
+    def cancel_loading(self, row):
+        """cancels loading the children of the given row and removes the
+        partially loaded children, they are fetched again when the item is
+        expanded
+        """
+        request = self.load_requests.pop(row, None)
+        if not request:
+            return
+        self.loader.cancel(request)
+        self.remove_children(row)
+
+    def reload_row(self, row):
+        """reloads the children of the given row
+        """
+        self.cancel_loading(row)
+        # the tasks may be changed
+        self.loader.clear_prefetched()
+        self.remove_children(row)
+        self.fetch_children(row)
 
     def canFetchMore(self, index):
         logger.debug(
@@ -392,8 +1165,7 @@ class TaskTreeModel(QtGui.QStandardItemModel):
         if not index.isValid():
             return_value = False
         else:
-            item = self.itemFromIndex(index)
-            return_value = item.canFetchMore()
+            return_value = self.can_fetch_more(index.internalId())
         logger.debug(
             'TaskTreeModel.canFetchMore() is finished for index: %s' % index
         )
@@ -403,36 +1175,37 @@ class TaskTreeModel(QtGui.QStandardItemModel):
         """fetches more elements
         """
         logger.debug(
-            'TaskTreeModel.canFetchMore() is started for index: %s' % index
+            'TaskTreeModel.fetchMore() is started for index: %s' % index
         )
         if index.isValid():
-            item = self.itemFromIndex(index)
-            item.fetchMore()
+            self.fetch_children(index.internalId())
         logger.debug(
-            'TaskTreeModel.canFetchMore() is finished for index: %s' % index
+            'TaskTreeModel.fetchMore() is finished for index: %s' % index
         )
 
-    def hasChildren(self, index):
+    def cancel_fetch(self, index):
+        """cancels loading the children of the item at the given index, they
+        are loaded again when the item is expanded
+        """
+        if index.isValid():
+            self.cancel_loading(index.internalId())
+
+    def cancel_all_fetches(self):
+        """cancels loading the children of all the items
+        """
+        self.loader.cancel_all()
+        self.load_requests = {}
+
+    def hasChildren(self, index=QtCore.QModelIndex()):
         """returns True or False depending on to the index and the item on the
         index
         """
-        logger.debug(
-            'TaskTreeModel.hasChildren() is started for index: %s' % index
-        )
         if not index.isValid():
-            from stalker import Project
-            from stalker.db.session import DBSession
-            projects_count = DBSession.query(Project.id).count()
-            return_value = projects_count > 0
-        else:
-            item = self.itemFromIndex(index)
-            return_value = False
-            if item:
-                return_value = item.hasChildren()
-        logger.debug(
-            'TaskTreeModel.hasChildren() is finished for index: %s' % index
-        )
-        return return_value
+            # the projects are added by populateTree()
+            return len(self.root_rows) > 0
+        if index.column() != 0:
+            return False
+        return bool(self.has_children[index.internalId()])
 
     def reload(self, index):
         """reloads the item at the given index
@@ -441,5 +1214,4 @@ class TaskTreeModel(QtGui.QStandardItemModel):
             # just return
             return
         else:
-            item = self.itemFromIndex(index)
-            item.reload()
+            self.reload_row(index.internalId())
@@ -68,12 +68,18 @@ def UI(app_in=None, executor=None, **kwargs):
 
 class PublisherElement(object):
     """A wrapper for publishers and correspongind UI elements
+
+    :param publisher: The publisher callable.
+    :param version: The version that is checked, it is set as the staged
+      version before running the publisher, so the publisher cache entries
+      are keyed on its task and take name like the ones of the publish.
     """
     passing_text = "Passing"
     not_passing_text = "Not Passing"
 
-    def __init__(self, publisher=None):
+    def __init__(self, publisher=None, version=None):
         self.publisher = publisher
+        self.version = version
         self.layout = None
         self.check_push_button = None
         self.publisher_name_label = None
@@ -88,6 +94,7 @@ class PublisherElement(object):
         self.progress_bar_manager = None
 
         self.duration = 0.0
+        self.result = None
         self._state = False
 
     def create(self, parent=None):
@@ -225,35 +232,37 @@ class PublisherElement(object):
             self.performance_label.setText('x.x sec')
             self.progress_bar.setValue(0)
 
-            # from anima.exc import PublishError
-            import sys
-            import traceback
-            import time
-
-            start = time.time()
-            try:
-                # disable Check button
-                self.check_push_button.setText('Checking...')
-                self.check_push_button.setEnabled(False)
-                QtWidgets.qApp.sendPostedEvents()
-                self.publisher(progress_controller=self.progress_bar_manager)
-                end = time.time()
-            except Exception as e:
-                end = time.time()
-                exc_type, exc_value, exc_traceback = sys.exc_info()
-                self.state = False
+            from anima.publish import run_publisher, staging
+            if self.version is not None:
+                staging['version'] = self.version
+
+            # disable Check button
+            self.check_push_button.setText('Checking...')
+            self.check_push_button.setEnabled(False)
+            QtWidgets.qApp.sendPostedEvents()
+            result = run_publisher(
+                self.publisher,
+                progress_controller=self.progress_bar_manager
+            )
+            if result.status == result.PASSED:
+                self.state = True
                 self.publisher_state_label.setToolTip(
-                    '\n'.join(
-                        traceback.format_exc(exc_traceback).splitlines()[-25:]
-                    )
+                    'Passed before with the same inputs'
+                    if result.cached else ''
                 )
             else:
-                self.state = True
-                self.publisher_state_label.setToolTip('')
+                self.state = False
+                self.publisher_state_label.setToolTip(
+                    '\n'.join(result.traceback.splitlines()[-25:])
+                )
 
             # set performance label
-            self.duration = end - start
-            self.performance_label.setText('%0.1f sec' % self.duration)
+            self.result = result
+            self.duration = result.duration
+            if result.cached:
+                self.performance_label.setText('cached')
+            else:
+                self.performance_label.setText('%0.1f sec' % self.duration)
             self.check_push_button.setText('Check')
             self.check_push_button.setEnabled(True)
 
@@ -431,6 +440,8 @@ class MainDialog(QtWidgets.QDialog, AnimaDialogBase):
                             self.create_publisher_field(publisher)
                         )
 
+        self.update_publisher_stats_info()
+
         # for all publishers also connect the clicked signal of their check
         # buttons to enable or disable the publish button
         for publisher in self.publishers:
@@ -440,12 +451,78 @@ class MainDialog(QtWidgets.QDialog, AnimaDialogBase):
                 self.check_publisher_states
             )
 
+    def get_type_name(self):
+        """returns the task type name of the version
+        """
+        if self.version and self.version.task.type:
+            return self.version.task.type.name
+        return ''
+
+    def update_publisher_stats_info(self):
+        """shows the durations of the previous runs of the publishers in the
+        tool tips of the duration labels
+        """
+        from anima.publish import PublisherStats
+        stats = PublisherStats()
+        data = stats.load()
+        type_name = self.get_type_name()
+
+        for publisher in self.publishers:
+            tool_tip = []
+            if publisher.result is not None:
+                tool_tip.append(
+                    'Last run: %0.2f sec (CPU %0.2f sec)' % (
+                        publisher.result.duration,
+                        publisher.result.cpu_time
+                    )
+                )
+            entry = stats.get(
+                type_name, publisher.publisher.__name__, data
+            )
+            if entry is not None:
+                tool_tip.append(
+                    'Average of %i runs: %0.2f sec (CPU %0.2f sec), '
+                    'max: %0.2f sec' % (
+                        entry['count'], entry['wall_average'],
+                        entry['cpu_average'], entry['wall_max']
+                    )
+                )
+            publisher.performance_label.setToolTip('\n'.join(tool_tip))
+
+        slowest = stats.get_slowest(type_name)
+        if slowest:
+            self.duration_label.setToolTip(
+                'Slowest publishers on average:\n%s' % '\n'.join(
+                    '%0.2f sec: %s' % (entry['wall_average'], name)
+                    for name, entry in slowest
+                )
+            )
+
+    def record_publisher_stats(self):
+        """adds the durations of the last run of the publishers to the
+        publisher stats file
+        """
+        from anima import defaults
+        if not defaults.record_publisher_stats:
+            return
+
+        from anima.publish import PublishReport, PublisherStats
+        report = PublishReport(self.get_type_name())
+        report.results = [
+            publisher.result for publisher in self.publishers
+            if publisher.result is not None
+        ]
+        try:
+            PublisherStats().record(report)
+        except (IOError, OSError, ValueError):
+            pass
+
     def create_publisher_field(self, publisher):
         """Creates a publisher field
         """
         # generate one UI element per publisher
         # create the layout
-        publisher_element = PublisherElement(publisher)
+        publisher_element = PublisherElement(publisher, version=self.version)
         publisher_element.create(parent=self)
         self.publisher_vertical_layout.addLayout(publisher_element.layout)
         return publisher_element
@@ -459,15 +536,20 @@ class MainDialog(QtWidgets.QDialog, AnimaDialogBase):
         current_time = time.time()
         # do not run publishers if they ran less than 5 seconds ago
         if current_time - self.last_run_date > 5:
-            for publisher in self.publishers:
-                # move the view to this publisher
-                self.scroll_area.ensureWidgetVisible(
-                    publisher.check_push_button
-                )
-                publisher.run_publisher()
-                self.update_publisher_total_duration_info()
-                QtWidgets.qApp.sendPostedEvents()
+            # calculate the cache keys that are shared by the publishers once
+            from anima.publish import publisher_cache
+            with publisher_cache.memoize_keys():
+                for publisher in self.publishers:
+                    # move the view to this publisher
+                    self.scroll_area.ensureWidgetVisible(
+                        publisher.check_push_button
+                    )
+                    publisher.run_publisher()
+                    self.update_publisher_total_duration_info()
+                    QtWidgets.qApp.sendPostedEvents()
             self.last_run_date = time.time()
+            self.record_publisher_stats()
+            self.update_publisher_stats_info()
 
         return self.check_publisher_states()
 
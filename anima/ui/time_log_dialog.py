@@ -71,6 +71,10 @@ class MainDialog(QtWidgets.QDialog, AnimaDialogBase):
         self.formatted_date_label = None
         self.time_log_info_label = None
 
+        # loads the time logs of the calendar month by month
+        self.calendar_loader = None
+        self.calendar_filled_months = set()
+
         self.setup_ui()
 
     def setup_ui(self):
@@ -410,6 +414,13 @@ class MainDialog(QtWidgets.QDialog, AnimaDialogBase):
             self.calendar_widget_selection_changed
         )
 
+        # calendar month changed
+        QtCore.QObject.connect(
+            self.calendar_widget,
+            QtCore.SIGNAL("currentPageChanged(int,int)"),
+            self.calendar_widget_page_changed
+        )
+
     def _set_defaults(self):
         """sets the defaults for the ui
         """
@@ -535,67 +546,51 @@ class MainDialog(QtWidgets.QDialog, AnimaDialogBase):
         self.calendar_widget_selection_changed()
 
     def fill_calendar_with_time_logs(self):
-        """fill the calendar with daily time log info
+        """fill the calendar with daily time log info of the shown month and
+        the days of the neighbouring months that are already loaded
         """
         resource_id = self.get_current_resource_id()
-        # do not update if the calendar is showing the same user
-        if self.calendar_widget.resource_id == resource_id or resource_id == -1:
+        if resource_id == -1:
             return
 
-        tool_tip_text_format = u'{start:%H:%M} - {end:%H:%M} | {task_name}'
-
-        # import time
-        # start = time.time()
-        # get all the TimeLogs grouped daily
-        sql = """-- TOP DOWN SEARCH --
-select
-    "TimeLogs".start::date as date,
-    array_agg(task_rec_data.full_path) as task_name,
-    array_agg("TimeLogs".start) as start,
-    array_agg("TimeLogs".end) as end,
-    sum(extract(epoch from ("TimeLogs".end - "TimeLogs".start)))
-
-from "TimeLogs"
-
-join (
-    with recursive recursive_task(id, parent_id, path_names) as (
-        select
-        task.id,
-        task.project_id,
-        -- task.project_id::text as path,
-        ("Projects".code || '') as path_names
-        from "Tasks" as task
-        join "Projects" on task.project_id = "Projects".id
-        where task.parent_id is NULL
-    union all
-        select
-        task.id,
-        task.parent_id,
-        -- (parent.path || '|' || task.parent_id:: text) as path,
-        (parent.path_names || ' | ' || "Parent_SimpleEntities".name) as path_names
-        from "Tasks" as task
-        inner join recursive_task as parent on task.parent_id = parent.id
-        inner join "SimpleEntities" as "Parent_SimpleEntities" on parent.id = "Parent_SimpleEntities".id
-    ) select
-        recursive_task.id,
-        "SimpleEntities".name || ' (' || recursive_task.path_names || ')' as full_path
-    from recursive_task
-    join "SimpleEntities" on recursive_task.id = "SimpleEntities".id
-) as task_rec_data on "TimeLogs".task_id = task_rec_data.id
-
--- getting all the data is as fast as getting one, so get all the TimeLogs of this user
-where "TimeLogs".resource_id = :resource_id
-group by cast("TimeLogs".start as date)
-order by cast("TimeLogs".start as date)
+        if self.calendar_widget.resource_id != resource_id:
+            # clear the formats of the previous resource
+            self.calendar_widget.setDateTextFormat(
+                QtCore.QDate(), QtGui.QTextCharFormat()
+            )
+            self.calendar_widget.resource_id = resource_id
+            self.calendar_filled_months = set()
+
+        if self.calendar_loader is None:
+            from anima.time_log import TimeLogCalendarLoader
+            self.calendar_loader = TimeLogCalendarLoader()
+
+        year = self.calendar_widget.yearShown()
+        month = self.calendar_widget.monthShown()
+        if (year, month) not in self.calendar_filled_months:
+            self.set_calendar_days(
+                self.calendar_loader.load(resource_id, year, month)
+            )
+            self.calendar_filled_months.add((year, month))
+        else:
+            self.calendar_loader.prefetch(resource_id, year, month)
+
+        # the calendar also shows some days of the neighbouring months
+        for count in (-1, 1):
+            key = self.calendar_loader.add_months(year, month, count)
+            if key in self.calendar_filled_months:
+                continue
+            days = self.calendar_loader.get_month(resource_id, *key)
+            if days is not None:
+                self.set_calendar_days(days)
+                self.calendar_filled_months.add(key)
+
+    def set_calendar_days(self, days):
+        """sets the calendar day formats from the given time log days
+
+        :param days: A list of :class:`anima.time_log.TimeLogDay` instances.
         """
-        from sqlalchemy import text
-        from stalker.db.session import DBSession
-        result = DBSession.connection().execute(
-            text(sql),
-            resource_id=resource_id
-        ).fetchall()
-        # end = time.time()
-        # print('getting data from sql: %0.3f sec' % (end - start))
+        tool_tip_text_format = u'{start:%H:%M} - {end:%H:%M} | {task_name}'
 
         from anima.utils import utc_to_local
         time_shifter = utc_to_local
@@ -607,12 +602,10 @@ order by cast("TimeLogs".start as date)
             def time_shifter(x):
                 return x
 
-        for r in result:
-            calendar_day = r[0]
+        for calendar_day, daily_logged_seconds, time_logs in days:
             year = calendar_day.year
             month = calendar_day.month
             day = calendar_day.day
-            daily_logged_seconds = r[4]
             daily_logged_hours = daily_logged_seconds // 3600
             daily_logged_minutes = \
                 (daily_logged_seconds - daily_logged_hours * 3600) // 60
@@ -623,8 +616,7 @@ order by cast("TimeLogs".start as date)
                 if daily_logged_hours
                 else u'Total: %i min logged' % daily_logged_minutes
             ]
-            for task_name, start, end in sorted(
-                    zip(r[1], r[2], r[3]), key=lambda x: x[1]):
+            for start, end, task_name in time_logs:
                 time_log_tool_tip_text = tool_tip_text_format.format(
                     start=time_shifter(start),
                     end=time_shifter(end),
@@ -647,6 +639,11 @@ order by cast("TimeLogs".start as date)
 
             self.calendar_widget.setDateTextFormat(date, date_format)
 
+    def calendar_widget_page_changed(self, year, month):
+        """runs when the shown month of the calendar has changed
+        """
+        self.fill_calendar_with_time_logs()
+
     def calendar_widget_selection_changed(self):
         """runs when selection changed
         """
@@ -711,14 +708,18 @@ order by cast("TimeLogs".start as date)
         return User.query.filter(User.name == resource_name).first()
 
     def get_current_resource_id(self):
-        """returns the current resource
+        """returns the id of the current resource or -1 if there is no
+        resource
         """
         resource_name = self.resource_combo_box.currentText()
         from stalker import User
         from stalker.db.session import DBSession
-        return DBSession.query(User.id)\
+        result = DBSession.query(User.id)\
             .filter(User.name == resource_name)\
             .first()
+        if result is None:
+            return -1
+        return result[0]
 
     def start_time_changed(self, q_time):
         """validates the start time
@@ -5,7 +5,15 @@
 # License: http://www.opensource.org/licenses/MIT
 """Utilities for UI stuff
 """
+import collections
+import hashlib
 import os
+import threading
+
+try:
+    import queue
+except ImportError:  # Python 2
+    import Queue as queue
 
 from anima import logger
 from anima.ui.lib import QtCore, QtGui, QtWidgets
@@ -20,6 +28,387 @@ def get_icon(icon_name):
     return QtGui.QIcon(icon_full_path)
 
 
+class ThumbnailRequest(object):
+    """A request to load a thumbnail for a QGraphicsView.
+
+    :param gview: The QGraphicsView instance.
+    :param str path: The path of the image, or None to use the thumbnail of
+      the task with the given id.
+    :param int task_id: The id of a task.
+    :param int width: The target width.
+    :param int height: The target height.
+    """
+
+    __slots__ = ('gview', 'path', 'task_id', 'width', 'height', 'cancelled')
+
+    def __init__(self, gview, path=None, task_id=None, width=0, height=0):
+        self.gview = gview
+        self.path = path
+        self.task_id = task_id
+        self.width = width
+        self.height = height
+        self.cancelled = False
+
+
+class ThumbnailService(object):
+    """Loads thumbnails in a background thread.
+
+    The images are decoded and scaled down to the size of the
+    QGraphicsView as QImages in a worker thread, and only the QPixmap is
+    created in the GUI thread. The scaled images are kept in an LRU cache
+    in memory and as small JPEG files in the local cache folder, both are
+    keyed by the path, modification time and the target size of the image.
+    When the total size of the JPEG files exceeds ``max_disk_cache_size``
+    bytes the least recently used files are deleted, this also removes the
+    files of the images that are modified or deleted.
+
+    The thumbnail of a task, or the closest parent that has one, is found
+    with one query in the worker thread with its own database session. A new
+    request for a QGraphicsView cancels its previous request.
+
+    Use :meth:`.get` to get the shared service.
+
+    :param str cache_path: The folder for the JPEG files, the default is the
+      ``thumbnail_cache_folder_name`` folder in the local cache folder.
+    :param int max_images: The number of images kept in memory.
+    :param int max_disk_cache_size: The maximum total size of the JPEG files
+      in bytes, 0 or None disables the limit.
+    """
+
+    _instance = None
+
+    poll_interval = 20  # in milliseconds
+    jpeg_quality = 90
+
+    def __init__(self, cache_path=None, max_images=100,
+                 max_disk_cache_size=None):
+        from anima import defaults
+        if cache_path is None:
+            cache_path = os.path.join(
+                os.path.expanduser(defaults.local_cache_folder),
+                defaults.thumbnail_cache_folder_name
+            )
+        self.cache_path = cache_path
+        self.max_images = max_images
+        self.max_disk_cache_size = max_disk_cache_size
+
+        self._images = collections.OrderedDict()
+        self._images_lock = threading.Lock()
+
+        # the JPEG file paths and their (mtime, size), filled lazily and only
+        # used in the worker thread
+        self._cache_files = None
+        self._cache_size = 0
+
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        # id of the gview -> its last request, only used in the GUI thread
+        self._latest = {}
+
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self._timer = None
+
+    @classmethod
+    def get(cls):
+        """returns the shared service
+
+        :return: :class:`.ThumbnailService`
+        """
+        if cls._instance is None:
+            from anima import defaults
+            cls._instance = cls(
+                max_images=defaults.thumbnail_memory_cache_size,
+                max_disk_cache_size=defaults.thumbnail_disk_cache_size
+            )
+        return cls._instance
+
+    def load(self, gview, path=None, task_id=None):
+        """starts loading the given image or the thumbnail of the given task
+        to the given QGraphicsView
+
+        :param gview: The QGraphicsView instance.
+        :param str path: The path of the image.
+        :param int task_id: The id of a task, used if the path is not given.
+        """
+        size = gview.size()
+        request = ThumbnailRequest(
+            gview, path=path, task_id=task_id,
+            width=size.width(), height=size.height()
+        )
+        self.cancel(gview)
+        self._latest[id(gview)] = request
+        self._requests.put(request)
+        self._start()
+
+    def cancel(self, gview):
+        """cancels loading a thumbnail to the given QGraphicsView
+        """
+        request = self._latest.pop(id(gview), None)
+        if request:
+            request.cancelled = True
+
+    def _start(self):
+        """starts the worker thread and the timer that polls the results
+        """
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._work,
+                    name='ThumbnailService'
+                )
+                self._worker.daemon = True
+                self._worker.start()
+
+        if self._timer is None:
+            self._timer = QtCore.QTimer()
+            self._timer.setInterval(self.poll_interval)
+            QtCore.QObject.connect(
+                self._timer,
+                QtCore.SIGNAL('timeout()'),
+                self.process_results
+            )
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _work(self):
+        """the worker loop
+        """
+        from stalker.db.session import DBSession
+        while True:
+            request = self._requests.get()
+            if request.cancelled:
+                continue
+
+            image = None
+            try:
+                path = request.path
+                if path is None and request.task_id:
+                    try:
+                        path = self.query_thumbnail_path(request.task_id)
+                    finally:
+                        # DBSession is thread local, this closes the session
+                        # of this thread only
+                        DBSession.remove()
+                if path:
+                    image = self.get_image(
+                        path, request.width, request.height
+                    )
+            except Exception as e:
+                logger.debug('could not load thumbnail: %s' % e)
+            self._results.put((request, image))
+
+    @classmethod
+    def query_thumbnail_path(cls, task_id):
+        """returns the thumbnail path of the given task or its closest parent
+        that has a thumbnail with one query, it can be called from any thread
+
+        :param int task_id: The id of a task.
+        :return: str
+        """
+        from sqlalchemy import literal
+        from stalker import Link, SimpleEntity, Task
+        from stalker.db.session import DBSession
+
+        tasks = Task.__table__
+        entities = SimpleEntity.__table__
+        links = Link.__table__
+        ancestors = DBSession.query(
+            tasks.c.id,
+            tasks.c.parent_id,
+            literal(0).label('depth')
+        ).filter(tasks.c.id == task_id).cte('ancestors', recursive=True)
+
+        ancestors = ancestors.union_all(
+            DBSession.query(
+                tasks.c.id,
+                tasks.c.parent_id,
+                ancestors.c.depth + 1
+            ).filter(tasks.c.id == ancestors.c.parent_id)
+        )
+
+        row = DBSession.query(links.c.full_path)\
+            .select_from(ancestors)\
+            .join(entities, entities.c.id == ancestors.c.id)\
+            .join(links, links.c.id == entities.c.thumbnail_id)\
+            .order_by(ancestors.c.depth)\
+            .first()
+
+        if row:
+            return os.path.expandvars(row[0])
+
+    def get_cache_file_path(self, key):
+        """returns the path of the JPEG file for the given cache key
+        """
+        digest = hashlib.md5(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_path, digest[:2], '%s.jpg' % digest)
+
+    def get_image(self, path, width, height):
+        """returns the given image scaled to fit the given size as a QImage,
+        it is called in the worker thread
+
+        :param str path: The path of the image.
+        :param int width: The target width.
+        :param int height: The target height.
+        :return: QtGui.QImage or None if the image doesn't exist
+        """
+        path = os.path.normpath(path)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+
+        key = (path, mtime, width, height)
+        with self._images_lock:
+            image = self._images.pop(key, None)
+            if image is not None:
+                self._images[key] = image
+                return image
+
+        cache_file_path = self.get_cache_file_path(key)
+        image = None
+        if os.path.exists(cache_file_path):
+            image = QtGui.QImage(cache_file_path)
+            if image.isNull():
+                image = None
+            else:
+                # keep the recently used files while pruning
+                self._touch_cache_file(cache_file_path)
+
+        if image is None:
+            image_format = \
+                os.path.splitext(path)[-1].replace('.', '').upper()
+            logger.debug('creating image from: %s' % path)
+            image = QtGui.QImage(path, image_format)
+            if image.isNull():
+                return None
+            image = image.scaled(
+                width, height,
+                QtCore.Qt.KeepAspectRatio,
+                QtCore.Qt.SmoothTransformation
+            )
+            try:
+                os.makedirs(os.path.dirname(cache_file_path))
+            except OSError:
+                # already exists
+                pass
+            if image.save(cache_file_path, 'JPG', self.jpeg_quality):
+                self._add_cache_file(cache_file_path)
+                self.prune_cache(keep=cache_file_path)
+
+        with self._images_lock:
+            self._images[key] = image
+            while len(self._images) > self.max_images:
+                self._images.popitem(last=False)
+        return image
+
+    def _scan_cache_files(self):
+        """fills the JPEG file list, it is done only once
+        """
+        if self._cache_files is not None:
+            return
+        self._cache_files = {}
+        self._cache_size = 0
+        for root, dirs, files in os.walk(self.cache_path):
+            for file_name in files:
+                path = os.path.join(root, file_name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                self._cache_files[path] = (stat.st_mtime, stat.st_size)
+                self._cache_size += stat.st_size
+
+    def _add_cache_file(self, path):
+        """adds the given file to the JPEG file list
+        """
+        self._scan_cache_files()
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        self._discard_cache_file(path)
+        self._cache_files[path] = (stat.st_mtime, stat.st_size)
+        self._cache_size += stat.st_size
+
+    def _discard_cache_file(self, path):
+        """removes the given file from the JPEG file list
+        """
+        entry = self._cache_files.pop(path, None)
+        if entry is not None:
+            self._cache_size -= entry[1]
+
+    def _touch_cache_file(self, path):
+        """updates the modification time of the given file, the files are
+        pruned in the order of their modification times
+        """
+        try:
+            os.utime(path, None)
+        except OSError:
+            return
+        if self._cache_files is not None:
+            self._add_cache_file(path)
+
+    def prune_cache(self, keep=None):
+        """deletes the least recently used JPEG files until their total size
+        is under the limit, it is called in the worker thread
+
+        :param str keep: A path that should not be deleted.
+        """
+        if not self.max_disk_cache_size:
+            return
+
+        self._scan_cache_files()
+        if self._cache_size <= self.max_disk_cache_size:
+            return
+
+        cache_files = sorted(
+            self._cache_files.items(), key=lambda item: item[1][0]
+        )
+        for path, (mtime, size) in cache_files:
+            if self._cache_size <= self.max_disk_cache_size:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self._discard_cache_file(path)
+            logger.debug('pruned thumbnail: %s' % path)
+
+    def process_results(self):
+        """shows the loaded thumbnails, it is called periodically in the GUI
+        thread while there are requests in progress
+        """
+        while True:
+            try:
+                request, image = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            if request.cancelled:
+                continue
+
+            gview = request.gview
+            if self._latest.get(id(gview)) is request:
+                del self._latest[id(gview)]
+
+            if image is None:
+                continue
+
+            try:
+                clear_thumbnail(gview)
+                scene = gview.scene()
+                scene.addPixmap(QtGui.QPixmap.fromImage(image))
+            except RuntimeError:
+                # the gview is deleted
+                pass
+
+        if not self._latest and self._results.empty():
+            self._timer.stop()
+
+
 def clear_thumbnail(gview):
     """Clears the thumbnail for the given QGraphicsView
 
@@ -29,6 +418,9 @@ def clear_thumbnail(gview):
     if not gview:
         return
 
+    # do not show the thumbnail that is still loading
+    ThumbnailService.get().cancel(gview)
+
     # clear the graphics scene in case there is no thumbnail
     scene = gview.scene()
     if not scene:
@@ -41,6 +433,9 @@ def clear_thumbnail(gview):
 def update_gview_with_task_thumbnail(task, gview):
     """Updates the given QGraphicsView with the given Task thumbnail
 
+    The thumbnail of the task or its closest parent is loaded in the
+    background by the :class:`.ThumbnailService`.
+
     :param task: A
       :class:`~stalker.models.task.Task` instance
 
@@ -54,36 +449,12 @@ def update_gview_with_task_thumbnail(task, gview):
         logger.debug('task is not a stalker.models.task.Task instance')
         return
 
-    # get the thumbnail full path
-    full_path = None
-    if task.thumbnail:
-        # use the cache system to get the thumbnail
-        # try to get it as a normal file
-        full_path = os.path.expandvars(
-            task.thumbnail.full_path
-        )
-        if not os.path.exists(full_path):
-            full_path = None
-    else:
-        logger.debug('there is no thumbnail')
-        # try to get the thumbnail from parents
-        for parent in reversed(task.parents):
-            if parent.thumbnail:
-                # try to get it as a normal file
-                full_path = os.path.expandvars(
-                    parent.thumbnail.full_path
-                )
-                if not os.path.exists(full_path):
-                    full_path = None
-                logger.debug('found parent thumbnail at: %s' % full_path)
-                break
-
-    if full_path:
-        update_gview_with_image_file(full_path, gview)
+    ThumbnailService.get().load(gview, task_id=task.id)
 
 
 def update_gview_with_image_file(image_full_path, gview):
-    """updates the QGraphicsView with the given image
+    """updates the QGraphicsView with the given image, the image is loaded in
+    the background by the :class:`.ThumbnailService`
     """
 
     if not isinstance(gview, QtWidgets.QGraphicsView):
@@ -92,29 +463,7 @@ def update_gview_with_image_file(image_full_path, gview):
     clear_thumbnail(gview)
 
     if image_full_path != "":
-        image_full_path = os.path.normpath(image_full_path)
-        image_format = os.path.splitext(image_full_path)[-1].replace('.', '').upper()
-        logger.debug("creating pixmap from: %s" % image_full_path)
-
-        # size = conf.thumbnail_size
-        # width = size[0]
-        # height = size[1]
-        size = gview.size()
-        width = size.width()
-        height = size.height()
-        logger.debug('width: %s' % width)
-        logger.debug('height: %s' % height)
-
-        if os.path.exists(image_full_path):
-            pixmap = QtGui.QPixmap(image_full_path, format=image_format).scaled(
-                width, height,
-                QtCore.Qt.KeepAspectRatio,
-                QtCore.Qt.SmoothTransformation
-            )
-            # pixmap = QtGui.QPixmap(image_full_path, format='JPG')
-
-            scene = gview.scene()
-            scene.addPixmap(pixmap)
+        ThumbnailService.get().load(gview, path=image_full_path)
 
 
 def upload_thumbnail(task, thumbnail_full_path):
@@ -123,8 +123,17 @@ class MainDialog(QtWidgets.QDialog, AnimaDialogBase):
       you would normally have (Export As, Save As, Open, Reference, Import),
       and in Read-Only mode it will have only one button called "Choose" which
       lets you choose one Version.
+
+    The previous versions are loaded in pages starting from the most recent
+    one, the older pages are loaded when the table is scrolled to the top.
+    The loaded pages are cached per task, take and published only state, and
+    the cache is invalidated when a version is changed in this dialog or a
+    max(version_number) query shows a change.
     """
 
+    versions_page_size = 50
+    max_cached_version_lists = 100
+
     def __init__(self, environment=None, parent=None, mode=2):
         logger.debug("initializing the interface")
         super(MainDialog, self).__init__(parent)
@@ -142,6 +151,10 @@ class MainDialog(QtWidgets.QDialog, AnimaDialogBase):
         # create the project attribute in projects_combo_box
         self.current_dialog = None
 
+        # (task_id, take_name, published_only) -> cached versions
+        self.versions_cache = {}
+        self.current_versions_key = None
+
         # setup UI
         self._setup_ui()
 
@@ -895,6 +908,13 @@ class MainDialog(QtWidgets.QDialog, AnimaDialogBase):
             self.update_previous_versions_table_widget
         )
 
+        # load older versions when scrolled to the top
+        QtCore.QObject.connect(
+            self.previous_versions_table_widget.verticalScrollBar(),
+            QtCore.SIGNAL("valueChanged(int)"),
+            self.previous_versions_table_widget_scrolled
+        )
+
         # # version_count_spin_box
         # QtCore.QObject.connect(
         #     self.version_count_spin_box,
@@ -1022,6 +1042,7 @@ class MainDialog(QtWidgets.QDialog, AnimaDialogBase):
                     from stalker.db.session import DBSession
                     DBSession.add(version)
                     DBSession.commit()
+                    self.invalidate_versions_cache()
                     # refresh the tableWidget
                     self.update_previous_versions_table_widget()
                     return
@@ -1061,6 +1082,7 @@ class MainDialog(QtWidgets.QDialog, AnimaDialogBase):
                         from stalker.db.session import DBSession
                         DBSession.add(version)
                         DBSession.commit()
+                        self.invalidate_versions_cache()
                         # refresh the tableWidget
                         self.update_previous_versions_table_widget()
                 elif choice == "Delete":
@@ -1117,6 +1139,7 @@ class MainDialog(QtWidgets.QDialog, AnimaDialogBase):
                                     str(e)
                                 )
                             finally:
+                                self.invalidate_versions_cache()
                                 # refresh the tableWidget
                                 self.update_previous_versions_table_widget()
                         else:
@@ -1187,6 +1210,7 @@ class MainDialog(QtWidgets.QDialog, AnimaDialogBase):
                         DBSession.add(version)
                         DBSession.commit()
 
+                        self.invalidate_versions_cache()
                         # update the previous_versions_table_widget
                         self.update_previous_versions_table_widget()
             elif choice == "Copy Path":
@@ -1215,6 +1239,7 @@ class MainDialog(QtWidgets.QDialog, AnimaDialogBase):
                 except BaseException:
                     DBSession.rollback()
 
+                self.invalidate_versions_cache()
                 # now reload the UI
                 self.update_previous_versions_table_widget()
             elif selected_item == rerender_path_variables_action:
@@ -1240,6 +1265,7 @@ class MainDialog(QtWidgets.QDialog, AnimaDialogBase):
                         DBSession.commit()
                     except BaseException:
                         DBSession.rollback()
+                    self.invalidate_versions_cache()
                     # now reload the UI
                     self.update_previous_versions_table_widget()
 
@@ -1264,15 +1290,7 @@ class MainDialog(QtWidgets.QDialog, AnimaDialogBase):
         if not entity:
             return None
 
-        indexes = self.get_item_indices_containing_text(entity.name, tree_view)
-        model = tree_view.model()
-        logger.debug("items matching name : %s" % indexes)
-        for index in indexes:
-            item = model.itemFromIndex(index)
-            if item:
-                if item.task_id == entity.id:
-                    return item
-        return None
+        return tree_view.model().find_item(entity.id)
 
     def clear_recent_files(self):
         """clears the recent files
@@ -1280,8 +1298,7 @@ class MainDialog(QtWidgets.QDialog, AnimaDialogBase):
         if self.environment:
             from anima.recent import RecentFileManager
             rfm = RecentFileManager()
-            rfm[self.environment.name] = []
-            rfm.save()
+            rfm.clear(self.environment.name)
 
     def clear_recent_file_push_button_clicked(self):
         """clear the recent files
@@ -1598,8 +1615,13 @@ class MainDialog(QtWidgets.QDialog, AnimaDialogBase):
         take_name = version.take_name
         self.takes_list_widget.current_take_name = take_name
 
-        # select the version in the previous version list
-        self.previous_versions_table_widget.select_version(version)
+        # select the version in the previous version list, load the older
+        # versions until it is found
+        table_widget = self.previous_versions_table_widget
+        while version.id not in [v.id for v in table_widget.versions]:
+            if not self.load_older_versions():
+                break
+        table_widget.select_version(version)
 
         if not self.environment:
             # set the environment_comboBox
@@ -1639,21 +1661,14 @@ class MainDialog(QtWidgets.QDialog, AnimaDialogBase):
         """
         logger.debug("update_previous_versions_table_widget is started")
         self.previous_versions_table_widget.clear()
+        self.current_versions_key = None
 
-        from stalker import Task
-        task_id = self.tasks_tree_view.get_task_id()
-        if not task_id:  # or not isinstance(task, Task):
+        task = self.tasks_tree_view.get_task_data()
+        if not task:
             return
 
         # do not display any version for a container task
-        from stalker.db.session import DBSession
-        children_count = DBSession\
-            .query(Task.id)\
-            .filter(Task.parent_id == task_id)\
-            .count()
-        if children_count > 0:
-            # clear the versions list
-            self.previous_versions_table_widget.clear()
+        if task.has_children:
             return
 
         # take name
@@ -1664,33 +1679,138 @@ class MainDialog(QtWidgets.QDialog, AnimaDialogBase):
         else:
             return
 
+        key = (
+            task.id,
+            take_name,
+            self.show_published_only_check_box.isChecked()
+        )
+
+        # check if the versions are changed
+        max_version_number = self.query_max_version_number(*key)
+        cached_versions = self.versions_cache.get(key)
+        if cached_versions is None \
+           or cached_versions['max_version_number'] != max_version_number:
+            versions, has_more = self.query_versions(*key)
+            cached_versions = {
+                'versions': versions,
+                'has_more': has_more,
+                'max_version_number': max_version_number
+            }
+            if len(self.versions_cache) >= self.max_cached_version_lists:
+                self.versions_cache = {}
+            self.versions_cache[key] = cached_versions
+
+        self.current_versions_key = key
+        self.previous_versions_table_widget.update_content(
+            list(cached_versions['versions'])
+        )
+        # show the most recent versions
+        self.previous_versions_table_widget.scrollToBottom()
+        logger.debug("update_previous_versions_table_widget is finished")
+
+    @classmethod
+    def get_versions_query(cls, task_id, take_name, published_only, *fields):
+        """returns the query of the given fields of the versions of the given
+        task and take
+        """
+        from stalker import Version
+        from stalker.db.session import DBSession
+        query = DBSession.query(*fields)\
+            .filter(Version.task_id == task_id) \
+            .filter(Version.take_name == take_name)
+
+        # get the published only
+        if published_only:
+            query = query.filter(Version.is_published == True)
+        return query
+
+    @classmethod
+    def query_max_version_number(cls, task_id, take_name, published_only):
+        """returns the max version number of the given task and take, it is
+        used to check if the cached versions are changed
+        """
+        from sqlalchemy import func
+        from stalker import Version
+        return cls.get_versions_query(
+            task_id, take_name, published_only,
+            func.max(Version.version_number)
+        ).scalar()
+
+    def query_versions(self, task_id, take_name, published_only,
+                       before_version_number=None):
+        """returns a page of versions of the given task and take ordered by
+        version number, starting from the most recent one or the one before
+        the given version number
+
+        :return: A list of VersionNT and a bool showing if there are older
+          versions.
+        """
         # query the Versions of this type and take
         from stalker import Version
-        query = DBSession.query(
+        query = self.get_versions_query(
+            task_id, take_name, published_only,
             # use only the necessary fields
             Version.id, Version.version_number,
             Version.is_published, Version.created_with,
             Version.created_by_id, Version.updated_by_id,
             Version.full_path,  # convert to absolute full path
             Version.description,
-        )\
-            .filter(Version.task_id == task_id) \
-            .filter(Version.take_name == take_name)
+        )
+        if before_version_number is not None:
+            query = query.filter(
+                Version.version_number < before_version_number
+            )
 
-        # get the published only
-        if self.show_published_only_check_box.isChecked():
-            query = query.filter(Version.is_published == True)
+        data_from_db = query\
+            .order_by(Version.version_number.desc())\
+            .limit(self.versions_page_size + 1)\
+            .all()
+        has_more = len(data_from_db) > self.versions_page_size
+        versions = list(
+            map(lambda x: VersionNT(*x),
+                data_from_db[:self.versions_page_size])
+        )
+        versions.reverse()
+        return versions, has_more
 
-        # show how many
-        # count = self.version_count_spin_box.value()
+    def load_older_versions(self):
+        """loads the previous page of versions to the
+        previous_versions_table_widget
 
-        data_from_db = \
-            query.order_by(Version.version_number.desc()).all()
-        versions = list(map(lambda x: VersionNT(*x), data_from_db))
-        versions.reverse()
+        :return: True if there were older versions
+        """
+        cached_versions = self.versions_cache.get(self.current_versions_key)
+        if not cached_versions or not cached_versions['has_more']:
+            return False
 
-        self.previous_versions_table_widget.update_content(versions)
-        logger.debug("update_previous_versions_table_widget is finished")
+        versions = cached_versions['versions']
+        before_version_number = None
+        if versions:
+            before_version_number = versions[0].version_number
+
+        older_versions, has_more = self.query_versions(
+            *self.current_versions_key,
+            before_version_number=before_version_number
+        )
+        cached_versions['versions'] = older_versions + versions
+        cached_versions['has_more'] = has_more
+        self.previous_versions_table_widget.prepend_content(older_versions)
+        return bool(older_versions)
+
+    def previous_versions_table_widget_scrolled(self, value):
+        """loads the older versions when the previous_versions_table_widget is
+        scrolled to the top
+        """
+        scroll_bar = self.previous_versions_table_widget.verticalScrollBar()
+        if value == scroll_bar.minimum() \
+           and scroll_bar.maximum() > scroll_bar.minimum():
+            self.load_older_versions()
+
+    def invalidate_versions_cache(self):
+        """clears the cached versions, call it when a version is created or
+        changed
+        """
+        self.versions_cache = {}
 
     def add_take_push_button_clicked(self):
         """runs when the add_take_toolButton clicked
@@ -1807,6 +1927,7 @@ class MainDialog(QtWidgets.QDialog, AnimaDialogBase):
                 DBSession.rollback()
                 return
             finally:
+                self.invalidate_versions_cache()
                 self.update_previous_versions_table_widget()
 
                 # inform the user about what has happened
@@ -2021,6 +2142,7 @@ class MainDialog(QtWidgets.QDialog, AnimaDialogBase):
 
         if is_external_env:
             # refresh the UI
+            self.invalidate_versions_cache()
             self.tasks_tree_view_changed()
         else:
             # close the UI
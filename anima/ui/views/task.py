@@ -120,6 +120,13 @@ class TaskTreeView(QtWidgets.QTreeView):
             self.auto_fit_column
         )
 
+        # cancel loading the children of collapsed items
+        QtCore.QObject.connect(
+            self,
+            QtCore.SIGNAL('collapsed(QModelIndex)'),
+            self.cancel_fetch
+        )
+
         # custom context menu for the tasks_treeView
         self.setContextMenuPolicy(
             QtCore.Qt.CustomContextMenu
@@ -150,6 +157,13 @@ class TaskTreeView(QtWidgets.QTreeView):
         """
         self.resizeColumnToContents(0)
 
+    def cancel_fetch(self, index):
+        """cancels loading the children of the item at the given index
+        """
+        model = self.model()
+        if isinstance(model, TaskTreeModel):
+            model.cancel_fetch(index)
+
     def fill(self):
         """fills the tree view with data
         """
@@ -185,6 +199,8 @@ class TaskTreeView(QtWidgets.QTreeView):
 
         # delete the old model if any
         if self.model() is not None:
+            if isinstance(self.model(), TaskTreeModel):
+                self.model().cancel_all_fetches()
             self.model().deleteLater()
 
         task_tree_model = TaskTreeModel()
@@ -646,7 +662,6 @@ class TaskTreeView(QtWidgets.QTreeView):
                         file_path = dialog.selectedFiles()[0]
                         if file_path:
                             import os
-                            import json
                             from anima.utils import task_hierarchy_io
 
                             # check file extension
@@ -655,15 +670,11 @@ class TaskTreeView(QtWidgets.QTreeView):
                             if not parts[1]:
                                 file_path = '%s%s' % (parts[0], '.json')
 
-                            data = json.dumps(
-                                entity,
-                                cls=task_hierarchy_io.StalkerEntityEncoder,
-                                check_circular=False,
-                                indent=4
-                            )
                             try:
                                 with open(file_path, 'w') as f:
-                                    f.write(data)
+                                    task_hierarchy_io.dump(
+                                        entity, f, indent=4
+                                    )
                             except Exception as e:
                                 pass
                             finally:
@@ -698,12 +709,8 @@ class TaskTreeView(QtWidgets.QTreeView):
                                 task_hierarchy_io.StalkerEntityDecoder(
                                     project=project
                                 )
-                            loaded_entity = decoder.loads(data, parent=parent)
-
                             try:
-                                from stalker.db.session import DBSession
-                                DBSession.add(loaded_entity)
-                                DBSession.commit()
+                                decoder.bulk_loads(data, parent=parent)
                             except Exception as e:
                                 QtWidgets.QMessageBox.critical(
                                     self,
@@ -895,34 +902,34 @@ class TaskTreeView(QtWidgets.QTreeView):
     def load_task_item_hierarchy(self, task, tree_view):
         """loads the TaskItem related to the given task in the given tree_view
 
+        The ids of the parents of the task are queried at once and the items
+        are expanded along this path, so it takes a few queries for any task.
+
         :return: TaskItem instance
         """
         if not task:
             return
 
+        if tree_view is None:
+            tree_view = self
+
         self.is_updating = True
-        item = self.find_entity_item(task)
+        item = self.find_entity_item(task, tree_view)
         if not item:
             # the item is not loaded to the UI yet
-            # start loading its parents
-            # start from the project
-            from stalker import Task
-            if isinstance(task, Task):
-                item = self.find_entity_item(task.project, tree_view)
-            else:
-                item = self.find_entity_item(task, tree_view)
-            logger.debug('item for project: %s' % item)
-
-            if item:
-                tree_view.setExpanded(item.index(), True)
+            # start loading its parents starting from the project
+            model = tree_view.model()
+            task_path = model.query_task_path(task.id)
+            logger.debug('task path: %s' % task_path)
 
-            if isinstance(task, Task) and task.parents:
-                # now starting from the most outer parent expand the tasks
-                for parent in task.parents:
-                    item = self.find_entity_item(parent, tree_view)
+            for parent_id in task_path[:-1]:
+                parent_item = model.find_item(parent_id)
+                if not parent_item:
+                    break
 
-                    if item:
-                        tree_view.setExpanded(item.index(), True)
+                # load the children now, instead of in the background
+                parent_item.load_children()
+                tree_view.setExpanded(parent_item.index(), True)
 
             # finally select the task
             item = self.find_entity_item(task, tree_view)
@@ -944,15 +951,7 @@ class TaskTreeView(QtWidgets.QTreeView):
         if tree_view is None:
             tree_view = self
 
-        indexes = self.get_item_indices_containing_text(entity.name, tree_view)
-        model = tree_view.model()
-        logger.debug('items matching name : %s' % indexes)
-        for index in indexes:
-            item = model.itemFromIndex(index)
-            if item:
-                if item.task.id == entity.id:
-                    return item
-        return None
+        return tree_view.model().find_item(entity.id)
 
     @classmethod
     def get_item_indices_containing_text(cls, text, tree_view):
@@ -968,6 +967,17 @@ class TaskTreeView(QtWidgets.QTreeView):
             QtCore.Qt.MatchRecursive
         )
 
+    def get_task_data(self):
+        """returns the :class:`anima.ui.models.task.TaskData` of the selected
+        task, it doesn't query the database
+        """
+        selection_model = self.selectionModel()
+        indexes = selection_model.selectedIndexes()
+        if indexes:
+            item = self.model().itemFromIndex(indexes[0])
+            if item:
+                return item.task
+
     def get_task_id(self):
         """returns the task from the UI, it is an task, asset, shot, sequence
         or project
@@ -983,11 +993,7 @@ class TaskTreeView(QtWidgets.QTreeView):
             current_index = indexes[0]
             logger.debug('current_index : %s' % current_index)
 
-            item_model = self.model()
-            current_item = item_model.itemFromIndex(current_index)
-
-            if current_item:
-                task_id = current_item.task.id
+            task_id = self.model().get_task_id(current_index)
 
         logger.debug('task_id: %s' % task_id)
         return task_id
@@ -14,6 +14,10 @@ db.setup()
 t = Task.query.get(12106)
 data = json.dumps(t, cls=task_hierarchy_io.StalkerEntityEncoder, check_circular=False, indent=4)
 
+# or stream it directly in to a file
+with open('/tmp/task_hierarchy.json', 'w') as f:
+    task_hierarchy_io.dump(t, f, indent=4)
+
 #
 # DECODING
 #
@@ -138,39 +142,107 @@ class StalkerEntityEncoder(json.JSONEncoder):
         'version_id',
     ]
 
+    # attributes that are not fields of the entity
+    skip_fields = ['metadata', 'registry']
+
+    # per entity class field names cache
+    _fields_cache = {}
+
     def __init__(self, *args, **kwargs):
         super(StalkerEntityEncoder, self).__init__(*args, **kwargs)
-        self._visited_objs = []
+        # use the object ids instead of the objects, so we will not use the
+        # __eq__ operator of the entities which is costly and also not what
+        # we want, the dict values are holding a reference to the objects to
+        # prevent the ids from being reused
+        self._visited_objs = {}
+
+    @classmethod
+    def get_fields(cls, entity_class):
+        """Returns the serializable field names of the given class.
+
+        The field names are computed only once per entity class and then
+        cached. Returns None if the given class is not an SQLAlchemy mapped
+        class.
+
+        :param entity_class: A Stalker class.
+        :return: list of str
+        """
+        cache_key = (cls, entity_class)
+        try:
+            return cls._fields_cache[cache_key]
+        except KeyError:
+            pass
 
-    def default(self, obj):
-        from sqlalchemy.ext.declarative import DeclarativeMeta
+        from sqlalchemy import inspect
+        from sqlalchemy.exc import NoInspectionAvailable
+        try:
+            mapper = inspect(entity_class, raiseerr=False)
+        except NoInspectionAvailable:
+            mapper = None
+
+        if mapper is None:
+            fields = None
+        else:
+            import types
+            ignore_fields = set(cls.ignore_fields)
+            ignore_fields.update(cls.skip_fields)
+            fields = []
+            # dir() also returns the plain Python properties (like
+            # Task.path) along with the columns and relationships and it
+            # returns them sorted, which keeps the output same as before
+            for field in dir(entity_class):
+                if field.startswith('_') or field in ignore_fields:
+                    continue
+
+                # find the raw attribute without triggering the descriptors
+                attr = None
+                for klass in entity_class.__mro__:
+                    if field in klass.__dict__:
+                        attr = klass.__dict__[field]
+                        break
+
+                # skip methods
+                if isinstance(attr, (types.FunctionType, classmethod,
+                                     staticmethod)):
+                    continue
+
+                # skip any other non descriptor callables
+                if not hasattr(attr, '__get__') and callable(attr):
+                    continue
 
-        if isinstance(obj.__class__, DeclarativeMeta):
+                fields.append(field)
+
+        cls._fields_cache[cache_key] = fields
+        return fields
+
+    def default(self, obj):
+        fields = self.get_fields(obj.__class__)
+        if fields is not None:
             # don't re-visit self
-            if obj in self._visited_objs:
+            obj_id = id(obj)
+            if obj_id in self._visited_objs:
                 return None
             # do not append if this is a type instance
             if obj.entity_type != 'Type':
-                self._visited_objs.append(obj)
+                self._visited_objs[obj_id] = obj
 
             # an SQLAlchemy class
-            fields = {}
-            for field in [x for x in dir(obj) if not x.startswith('_') and x != 'metadata']:
-                # skip ignore fields
-                if field in self.ignore_fields:
+            data = {}
+            for field in fields:
+                try:
+                    value = getattr(obj, field)
+                except (AttributeError, TypeError, NotImplementedError,
+                        RuntimeError):
                     continue
 
                 # skip callables
-                if callable(obj.__getattribute__(field)):
+                if callable(value):
                     continue
 
-                try:
-                    fields[field] = obj.__getattribute__(field)
-                except (AttributeError, TypeError, NotImplementedError, RuntimeError):
-                    pass
+                data[field] = value
 
             # a json-encodable dict
-            return fields
+            return data
 
         try:
             return json.JSONEncoder.default(self, obj)
@@ -178,13 +250,44 @@ class StalkerEntityEncoder(json.JSONEncoder):
             return None
 
 
+def dump(entity, fp, **kwargs):
+    """Streams the given Stalker entity as JSON in to the given file like
+    object.
+
+    The data is written in chunks as it is encoded, so the whole JSON string
+    is never kept in memory. The output is the same as::
+
+      json.dumps(entity, cls=StalkerEntityEncoder, check_circular=False)
+
+    :param entity: A Stalker entity, generally a Task or a derivative.
+    :param fp: A file like object that supports ``write()``.
+    :param kwargs: Extra keyword arguments passed to the encoder, like
+      ``indent``.
+    """
+    kwargs.setdefault('check_circular', False)
+    encoder = StalkerEntityEncoder(**kwargs)
+    for chunk in encoder.iterencode(entity):
+        fp.write(chunk)
+
+
 class StalkerEntityDecoder(object):
     """Decoder for Stalker classes
     """
+
+    # number of new entities to be collected before flushing them to the
+    # database in bulk mode
+    batch_size = 500
+
     def __init__(self, project, parent=None):
         self.project = project
         self.parent = None
 
+        # bulk mode caches
+        self._entity_index = {}
+        self._version_index = set()
+        self._type_index = {}
+        self._pending_count = 0
+
     def loads(self, data, parent=None):
         """Decodes Stalker data
 
@@ -276,3 +379,182 @@ class StalkerEntityDecoder(object):
             entity.parent = parent
 
         return entity
+
+    def bulk_loads(self, data, parent=None):
+        """Decodes Stalker data in a single transaction.
+
+        Works like :meth:`.loads` but instead of querying the database for
+        every entity and version and committing after each of them, the
+        existing Tasks, Versions and Types of the project are fetched in a
+        few queries up front, the missing ones are created in memory and
+        flushed in batches of :attr:`.batch_size` and everything is committed
+        at once. If anything goes wrong the whole transaction is rolled back,
+        so no partial data is left in the database.
+
+        :param data: JSON string or the already decoded data.
+        :param parent: The parent Task of the loaded entity.
+        :return:
+        """
+        from stalker.db.session import DBSession
+
+        if isinstance(data, str):
+            data = json.loads(data)
+
+        try:
+            self._prefetch()
+            with DBSession.no_autoflush:
+                entity = self._bulk_load_entity(data, parent=parent)
+            DBSession.commit()
+        except Exception:
+            DBSession.rollback()
+            raise
+        finally:
+            self._entity_index = {}
+            self._version_index = set()
+            self._type_index = {}
+            self._pending_count = 0
+
+        return entity
+
+    def _prefetch(self):
+        """Fetches the existing Tasks, Versions and Types of the project for
+        bulk loading
+        """
+        from stalker.db.session import DBSession
+        from stalker import Task, Version, Type
+
+        # Tasks (and derived classes) indexed by their parent and name
+        tasks = Task.query.filter(Task.project == self.project).all()
+        tasks_by_id = dict((t.id, t) for t in tasks)
+        self._entity_index = {}
+        for task in tasks:
+            key = (self._get_index_key(tasks_by_id.get(task.parent_id)),
+                   task.name)
+            self._entity_index.setdefault(key, []).append(task)
+
+        # Versions are indexed by their task, take_name and version_number,
+        # the task ids are queried in chunks to stay in the limits of the
+        # number of allowed parameters of the database
+        self._version_index = set()
+        task_ids = list(tasks_by_id.keys())
+        chunk_size = 500
+        for i in range(0, len(task_ids), chunk_size):
+            version_data = DBSession\
+                .query(Version.task_id, Version.take_name,
+                       Version.version_number)\
+                .filter(Version.task_id.in_(task_ids[i:i + chunk_size]))\
+                .all()
+            for task_id, take_name, version_number in version_data:
+                self._version_index.add(
+                    (id(tasks_by_id[task_id]), take_name, version_number)
+                )
+
+        # Types are indexed by their name
+        self._type_index = {}
+        for type_ in Type.query.all():
+            self._type_index.setdefault(type_.name, type_)
+
+    @classmethod
+    def _get_index_key(cls, entity):
+        """Returns the key of the given entity to be used in the bulk mode
+        indices.
+
+        The entities are held by the session during the load, so their ids
+        are unique and it works for the new entities that are not flushed
+        yet.
+        """
+        if entity is None:
+            return None
+        return id(entity)
+
+    def _bulk_add(self, entity):
+        """Adds the given entity to the session and flushes the session if
+        there are enough pending entities
+        """
+        from stalker.db.session import DBSession
+        DBSession.add(entity)
+        self._pending_count += 1
+        if self._pending_count >= self.batch_size:
+            DBSession.flush()
+            self._pending_count = 0
+
+    def _bulk_load_entity(self, data, parent=None):
+        """Decodes the given entity data without querying the database
+        """
+        from stalker import Asset, Task, Shot, Sequence, Version, Type
+
+        # get the entity_type
+        entity_type = data['entity_type']
+
+        # set default entity class to Task
+        entity_class = Task
+        if entity_type == 'Asset':
+            entity_class = Asset
+        elif entity_type == 'Shot':
+            entity_class = Shot
+            # this is a bug
+            data['sequences'] = []
+        elif entity_type == 'Sequence':
+            entity_class = Sequence
+
+        # get the type
+        if 'type' in data:
+            type_data = data['type']
+            if type_data and not isinstance(type_data, Type):
+                type_name = type_data['name']
+                type_ = self._type_index.get(type_name)
+                if not type_:
+                    # create a Type
+                    type_ = Type(**type_data)
+                    self._type_index[type_name] = type_
+                data['type'] = type_
+
+        # store version data
+        version_data = sorted(data['versions'], key=lambda x: x["version_number"])
+        data['versions'] = []
+
+        data['project'] = self.project
+
+        # check if the data exists before creating it
+        parent_key = self._get_index_key(parent)
+        index_key = (parent_key, data['name'])
+        entity = None
+        for existing_entity in self._entity_index.get(index_key, []):
+            if isinstance(existing_entity, entity_class):
+                entity = existing_entity
+                break
+
+        if not entity:
+            # then create it
+            entity = entity_class(**data)
+            self._entity_index.setdefault(index_key, []).append(entity)
+            self._bulk_add(entity)
+
+        # create Versions
+        entity_key = self._get_index_key(entity)
+        for v_data in version_data:
+            # check version number and take name
+            # if there is a version with the same version_number
+            # don't create it
+            version_key = \
+                (entity_key, v_data['take_name'], v_data['version_number'])
+            if version_key in self._version_index:
+                continue
+
+            # then create it
+            v_data['task'] = entity
+            v = Version(**v_data)
+            # update version_number
+            v.version_number = v_data['version_number']
+            v.is_published = v_data['is_published']
+            self._version_index.add(version_key)
+            self._bulk_add(v)
+
+        # for each child task
+        for t in data['tasks']:
+            self._bulk_load_entity(t, parent=entity)
+
+        if parent:
+            entity.parent = parent
+
+        return entity
@@ -204,6 +204,286 @@ class EnvironmentBaseTestCase(unittest.TestCase):
         )
         self.assertEqual(version2_found, version2)
 
+    def test_get_versions_from_full_paths_is_working_properly(self):
+        """testing if get_versions_from_full_paths() will return the versions
+        of the given paths in the same order and None for the paths that
+        doesn't match any version
+        """
+        repo1 = Repository(
+            name='Test Repo 1',
+            linux_path='/mnt/T/',
+            windows_path='T:/',
+            osx_path='/Volumes/T/'
+        )
+        DBSession.add(repo1)
+
+        repo2 = Repository(
+            name='Test Repo 2',
+            linux_path='/mnt/S/',
+            windows_path='S:/',
+            osx_path='/Volumes/S/'
+        )
+        DBSession.add(repo2)
+
+        task_ft = FilenameTemplate(
+            name='Task Filename Template',
+            target_entity_type='Task',
+            path='$REPO{{project.repository.code}}/{{project.code}}/'
+                 '{%- for parent_task in parent_tasks -%}'
+                 '{{parent_task.nice_name}}/{%- endfor -%}',
+            filename='{{task.nice_name}}_{{version.take_name}}'
+                     '_v{{"%03d"|format(version.version_number)}}',
+        )
+        DBSession.add(task_ft)
+
+        structure1 = Structure(
+            name='Commercial Project Structure',
+            templates=[task_ft]
+        )
+        DBSession.add(structure1)
+
+        status1 = Status(name='Status 1', code='STS1')
+        status2 = Status(name='Status 2', code='STS2')
+        status3 = Status(name='Status 3', code='STS3')
+        DBSession.add_all([status1, status2, status3])
+
+        proj_status_list = \
+            StatusList.query.filter_by(target_entity_type='Project').first()
+
+        task_status_list = \
+            StatusList.query.filter_by(target_entity_type='Task').first()
+
+        version_status_list = StatusList(
+            name='Version Statuses',
+            target_entity_type='Version',
+            statuses=[status1, status2, status3]
+        )
+        DBSession.add(version_status_list)
+
+        project1 = Project(
+            name='Test Project 1',
+            code='TP1',
+            repositories=[repo1],
+            structure=structure1,
+            status_list=proj_status_list
+        )
+        DBSession.add(project1)
+
+        project2 = Project(
+            name='Test Project 2',
+            code='TP2',
+            repositories=[repo2],
+            structure=structure1,
+            status_list=proj_status_list
+        )
+        DBSession.add(project2)
+
+        task1 = Task(
+            name='Test Task 1',
+            code='TT1',
+            project=project1,
+            status_list=task_status_list
+        )
+        DBSession.add(task1)
+
+        task2 = Task(
+            name='Test Task 1',
+            code='TT1',
+            project=project2,
+            status_list=task_status_list
+        )
+        DBSession.add(task2)
+
+        DBSession.commit()
+
+        # now create versions
+        version1 = Version(
+            task=task1,
+            status_list=version_status_list
+        )
+        DBSession.add(version1)
+        DBSession.commit()
+        version1.update_paths()
+
+        version2 = Version(
+            task=task2,
+            status_list=version_status_list
+        )
+        DBSession.add(version2)
+        DBSession.commit()
+        version2.update_paths()
+
+        DBSession.commit()
+        logger.debug('version1.full_path : %s' % version1.full_path)
+        logger.debug('version2.full_path : %s' % version2.full_path)
+
+        env = EnvironmentBase()
+        versions = env.get_versions_from_full_paths([
+            '/mnt/S/TP2/Test_Task_1/Test_Task_1_Main_v001',
+            '/mnt/T/TP1/Test_Task_1/Test_Task_1_Main_v002',
+            'T:/TP1/Test_Task_1/Test_Task_1_Main_v001',
+            '/Volumes/S/TP2/Test_Task_1/Test_Task_1_Main_v001',
+        ])
+        self.assertEqual(versions, [version2, None, version1, version2])
+
+    def test_get_versions_from_full_paths_with_an_empty_list(self):
+        """testing if get_versions_from_full_paths() will return an empty list
+        for an empty list of paths
+        """
+        env = EnvironmentBase()
+        self.assertEqual(env.get_versions_from_full_paths([]), [])
+
+    def test_get_version_input_graph_is_working_properly(self):
+        """testing if get_version_input_graph() will return the deep inputs
+        of the given version along with the latest published versions
+        """
+        repo1 = Repository(
+            name='Test Repo 1',
+            linux_path='/mnt/T/',
+            windows_path='T:/',
+            osx_path='/Volumes/T/'
+        )
+        DBSession.add(repo1)
+
+        repo2 = Repository(
+            name='Test Repo 2',
+            linux_path='/mnt/S/',
+            windows_path='S:/',
+            osx_path='/Volumes/S/'
+        )
+        DBSession.add(repo2)
+
+        task_ft = FilenameTemplate(
+            name='Task Filename Template',
+            target_entity_type='Task',
+            path='$REPO{{project.repository.code}}/{{project.code}}/'
+                 '{%- for parent_task in parent_tasks -%}'
+                 '{{parent_task.nice_name}}/{%- endfor -%}',
+            filename='{{task.nice_name}}_{{version.take_name}}'
+                     '_v{{"%03d"|format(version.version_number)}}',
+        )
+        DBSession.add(task_ft)
+
+        structure1 = Structure(
+            name='Commercial Project Structure',
+            templates=[task_ft]
+        )
+        DBSession.add(structure1)
+
+        status1 = Status(name='Status 1', code='STS1')
+        status2 = Status(name='Status 2', code='STS2')
+        status3 = Status(name='Status 3', code='STS3')
+        DBSession.add_all([status1, status2, status3])
+
+        proj_status_list = \
+            StatusList.query.filter_by(target_entity_type='Project').first()
+
+        task_status_list = \
+            StatusList.query.filter_by(target_entity_type='Task').first()
+
+        version_status_list = StatusList(
+            name='Version Statuses',
+            target_entity_type='Version',
+            statuses=[status1, status2, status3]
+        )
+        DBSession.add(version_status_list)
+
+        project1 = Project(
+            name='Test Project 1',
+            code='TP1',
+            repositories=[repo1],
+            structure=structure1,
+            status_list=proj_status_list
+        )
+        DBSession.add(project1)
+
+        project2 = Project(
+            name='Test Project 2',
+            code='TP2',
+            repositories=[repo2],
+            structure=structure1,
+            status_list=proj_status_list
+        )
+        DBSession.add(project2)
+
+        task1 = Task(
+            name='Test Task 1',
+            code='TT1',
+            project=project1,
+            status_list=task_status_list
+        )
+        DBSession.add(task1)
+
+        task2 = Task(
+            name='Test Task 1',
+            code='TT1',
+            project=project2,
+            status_list=task_status_list
+        )
+        DBSession.add(task2)
+
+        DBSession.commit()
+
+        # now create versions
+        version1 = Version(
+            task=task1,
+            status_list=version_status_list
+        )
+        DBSession.add(version1)
+        DBSession.commit()
+        version1.update_paths()
+
+        version2 = Version(
+            task=task2,
+            status_list=version_status_list
+        )
+        DBSession.add(version2)
+        DBSession.commit()
+        version2.update_paths()
+
+        DBSession.commit()
+        logger.debug('version1.full_path : %s' % version1.full_path)
+        logger.debug('version2.full_path : %s' % version2.full_path)
+
+        # version3 is a newer published version of version1
+        version1.is_published = True
+        version3 = Version(
+            task=task1,
+            status_list=version_status_list
+        )
+        version3.is_published = True
+        DBSession.add(version3)
+        DBSession.commit()
+
+        # version4 references version2 which references version1
+        version2.inputs = [version1]
+        version4 = Version(
+            task=task2,
+            take_name='Lighting',
+            inputs=[version2],
+            status_list=version_status_list
+        )
+        DBSession.add(version4)
+        DBSession.commit()
+
+        inputs_by_id, versions_by_id, latest_by_id, latest_inputs_by_id = \
+            EnvironmentBase.get_version_input_graph(version4)
+
+        self.assertEqual(
+            inputs_by_id,
+            {version4.id: [version2.id], version2.id: [version1.id]}
+        )
+        self.assertEqual(
+            versions_by_id,
+            {
+                version4.id: version4,
+                version2.id: version2,
+                version1.id: version1
+            }
+        )
+        self.assertEqual(latest_by_id, {version1.id: version3.id})
+        self.assertEqual(latest_inputs_by_id, {})
+
     def test_get_versions_from_path_handles_empty_and_None_path(self):
         """testing if no errors will be raised for a path which is None or an
         empty string
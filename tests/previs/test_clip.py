@@ -291,6 +291,45 @@ class ClipTestCase(unittest.TestCase):
             c.to_xml()
         )
 
+    def test_clip_instances_do_not_have_a_dict(self):
+        """testing if the Clip instances are using __slots__ and do not have
+        an instance __dict__
+        """
+        c = Clip(id='shot1', file=File(pathurl='file:///tmp/shot1.mov'))
+        self.assertFalse(hasattr(c, '__dict__'))
+        self.assertFalse(hasattr(c.file, '__dict__'))
+        with self.assertRaises(AttributeError):
+            c.some_attribute = 'some value'
+
+    def test_file_argument_is_working_properly(self):
+        """testing if the file argument value is passed to the file attribute
+        """
+        f = File(pathurl='file:///tmp/shot1.mov')
+        c = Clip(file=f)
+        self.assertEqual(f, c.file)
+
+    def test_validate_is_working_properly(self):
+        """testing if validate() will validate the attribute values that are
+        directly set
+        """
+        c = Clip(id='shot1', name='shot1', duration=34)
+        c._id = None
+        c.validate()
+        self.assertEqual('', c.id)
+
+        c._id = 123
+        with self.assertRaises(TypeError):
+            c.validate()
+
+    def test_validate_will_validate_the_file(self):
+        """testing if validate() will also validate the file of the clip
+        """
+        f = File(pathurl='file:///tmp/shot1.mov')
+        c = Clip(id='shot1', file=f)
+        f._pathurl = 123
+        with self.assertRaises(TypeError):
+            c.validate()
+
 
         # def test_in_is_bigger_than_out_will_be_converted_to_negative_values(self):
     #     """testing if setting the in smaller than out will convert the in to
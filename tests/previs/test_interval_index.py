@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2020, Anima Istanbul
+#
+# This module is part of anima-tools and is released under the MIT
+# License: http://www.opensource.org/licenses/MIT
+import unittest
+from anima.edit import IntervalIndex, Track, Clip
+
+
+class IntervalIndexTestCase(unittest.TestCase):
+    """tests the anima.edit.IntervalIndex class
+    """
+
+    def setUp(self):
+        """set up the test
+        """
+        self.index = IntervalIndex([
+            (0, 10, 'shot1'),
+            (10, 25, 'shot2'),
+            (30, 40, 'shot3'),
+            (35, 50, 'shot4'),
+        ])
+
+    def test_intervals_argument_is_skipped(self):
+        """testing if an empty index will be created when the intervals
+        argument is skipped
+        """
+        index = IntervalIndex()
+        self.assertEqual(0, len(index))
+        self.assertEqual([], index.items_at(0))
+        self.assertEqual([], index.overlaps())
+        self.assertEqual([], index.gaps())
+
+    def test_iterating_returns_the_ranges_sorted_by_start(self):
+        """testing if iterating over the index will return the ranges sorted
+        by their start frames
+        """
+        index = IntervalIndex([
+            (30, 40, 'shot3'),
+            (0, 10, 'shot1'),
+            (10, 25, 'shot2'),
+        ])
+        self.assertEqual(
+            [(0, 10, 'shot1'), (10, 25, 'shot2'), (30, 40, 'shot3')],
+            list(index)
+        )
+
+    def test_same_item_can_not_be_added_twice(self):
+        """testing if a ValueError will be raised when the same item is added
+        twice
+        """
+        with self.assertRaises(ValueError):
+            self.index.add(60, 70, 'shot1')
+
+    def test_end_is_smaller_than_start(self):
+        """testing if a ValueError will be raised when the end frame is
+        smaller than the start frame
+        """
+        with self.assertRaises(ValueError):
+            self.index.add(60, 50, 'shot5')
+
+    def test_items_at_is_working_properly(self):
+        """testing if items_at() will return the items covering the given
+        frame
+        """
+        self.assertEqual([], self.index.items_at(-1))
+        self.assertEqual(['shot1'], self.index.items_at(0))
+        self.assertEqual(['shot1'], self.index.items_at(9))
+        self.assertEqual(['shot2'], self.index.items_at(10))
+        self.assertEqual([], self.index.items_at(27))
+        self.assertEqual(['shot3', 'shot4'], self.index.items_at(36))
+        self.assertEqual([], self.index.items_at(50))
+
+    def test_overlapping_is_working_properly(self):
+        """testing if overlapping() will return the items overlapping with the
+        given range
+        """
+        self.assertEqual(['shot1', 'shot2'], self.index.overlapping(5, 15))
+        self.assertEqual([], self.index.overlapping(25, 30))
+        self.assertEqual(
+            ['shot2', 'shot3', 'shot4'],
+            self.index.overlapping(20, 100)
+        )
+
+    def test_containing_is_working_properly(self):
+        """testing if containing() will return the items fully containing the
+        given range
+        """
+        self.assertEqual(['shot2'], self.index.containing(10, 25))
+        self.assertEqual([], self.index.containing(5, 15))
+        self.assertEqual(['shot3', 'shot4'], self.index.containing(35, 40))
+
+    def test_overlaps_is_working_properly(self):
+        """testing if overlaps() will return the overlapping item pairs
+        """
+        self.assertEqual([('shot3', 'shot4')], self.index.overlaps())
+
+    def test_gaps_is_working_properly(self):
+        """testing if gaps() will return the frame ranges that are not covered
+        by any item
+        """
+        self.assertEqual([(25, 30)], self.index.gaps())
+        self.assertEqual(
+            [(-5, 0), (25, 30), (50, 60)],
+            self.index.gaps(-5, 60)
+        )
+
+    def test_update_is_working_properly(self):
+        """testing if update() will retime the given item
+        """
+        self.index.update('shot4', 40, 55)
+        self.assertEqual([], self.index.overlaps())
+        self.assertEqual((40, 55), self.index.get_range('shot4'))
+        self.assertEqual(['shot4'], self.index.items_at(54))
+
+        self.index.update('shot2', 10, 30)
+        self.assertEqual([], self.index.gaps())
+
+    def test_remove_is_working_properly(self):
+        """testing if remove() will remove the given item
+        """
+        self.index.remove('shot4')
+        self.assertEqual(3, len(self.index))
+        self.assertFalse('shot4' in self.index)
+        self.assertEqual([], self.index.items_at(45))
+        self.assertEqual(15, self.index.max_length)
+
+    def test_remove_an_item_that_is_not_in_the_index(self):
+        """testing if a ValueError will be raised when an item that is not in
+        the index is removed
+        """
+        with self.assertRaises(ValueError):
+            self.index.remove('shot5')
+
+    def test_from_track_is_working_properly(self):
+        """testing if from_track() will create an index from the clips of the
+        given Track
+        """
+        t = Track()
+        c1 = Clip(id='shot1', start=0, end=34)
+        c2 = Clip(id='shot2', start=34, end=60)
+        t.clips = [c2, c1]
+
+        index = IntervalIndex.from_track(t)
+        self.assertEqual([c1], index.items_at(33))
+        self.assertEqual([c2], index.items_at(34))
+        self.assertEqual([], index.overlaps())
+        self.assertEqual([], index.gaps())
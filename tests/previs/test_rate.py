@@ -164,3 +164,13 @@ class RateTestCase(unittest.TestCase):
 
         self.assertEqual(r.timebase, '25')
         self.assertEqual(r.ntsc, True)
+
+    def test_timecode_converter_attribute_is_working_properly(self):
+        """testing if the timecode_converter attribute will return the shared
+        TimecodeConverter instance of the timebase
+        """
+        from anima.edit import TimecodeConverter
+        r = Rate(timebase='24')
+        self.assertIsInstance(r.timecode_converter, TimecodeConverter)
+        self.assertEqual('24', r.timecode_converter.framerate)
+        self.assertIs(r.timecode_converter, TimecodeConverter.get('24'))
@@ -959,3 +959,44 @@ class SequenceTestCase(unittest.TestCase):
             expected_xmls[2],
             result[2]
         )
+
+    def test_read_xml_and_write_xml_will_round_trip_the_test_data(self):
+        """testing if the read_xml and write_xml methods will round trip the
+        test data
+        """
+        import io
+        here = os.path.dirname(__file__)
+        for file_name in ['test_v001.xml', 'test_v002.xml', 'test_v003.xml']:
+            xml_path = os.path.join(here, 'test_data', file_name)
+            with open(xml_path) as f:
+                expected_xml = f.read().rstrip('\n')
+
+            s = Sequence()
+            s.read_xml(xml_path)
+
+            f = io.StringIO()
+            s.write_xml(f, pre_indent=2)
+            self.assertEqual(expected_xml, f.getvalue())
+
+    def test_read_xml_will_resolve_the_files_exported_only_by_their_id(self):
+        """testing if the read_xml method will set the File instance of the
+        clips that are referencing an already exported file node
+        """
+        import io
+        xml_path = os.path.join(
+            os.path.dirname(__file__), 'test_data', 'test_v001.xml'
+        )
+        s = Sequence()
+        s.read_xml(xml_path)
+        track = s.media.video.tracks[0]
+        for clip in track.clips:
+            clip.file.pathurl = 'file://localhost/tmp/shot.mov'
+        track.optimize_clips()
+
+        s2 = Sequence()
+        s2.read_xml(io.StringIO(s.to_xml()))
+        clips = s2.media.video.tracks[0].clips
+        self.assertEqual(3, len(clips))
+        self.assertEqual('file://localhost/tmp/shot.mov', clips[0].file.pathurl)
+        self.assertIs(clips[0].file, clips[1].file)
+        self.assertIs(clips[0].file, clips[2].file)
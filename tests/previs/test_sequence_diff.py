@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2020, Anima Istanbul
+#
+# This module is part of anima-tools and is released under the MIT
+# License: http://www.opensource.org/licenses/MIT
+import unittest
+from anima.edit import (Sequence, Media, Video, Track, Clip, File,
+                        SequenceDiff)
+
+
+def create_sequence(clip_data):
+    """creates a Sequence with one video track from the given
+    (id, reel, in, out, start) tuples
+    """
+    seq = Sequence(name='SEQ001')
+    seq.media = Media()
+    seq.media.video = Video()
+    track = Track()
+    seq.media.video.tracks.append(track)
+    for id_, reel, in_, out, start in clip_data:
+        track.clips.append(
+            Clip(
+                id=id_,
+                name=reel,
+                in_=in_,
+                out=out,
+                start=start,
+                end=start + out - in_,
+                duration=out - in_,
+                file=File(
+                    duration=out,
+                    name=reel,
+                    pathurl='file:///tmp/%s.mov' % reel
+                )
+            )
+        )
+    return seq
+
+
+class SequenceDiffTestCase(unittest.TestCase):
+    """tests the anima.edit.SequenceDiff class
+    """
+
+    def setUp(self):
+        """set up the test
+        """
+        self.old_seq = create_sequence([
+            ('shot1', 'reel1', 0, 34, 0),
+            ('shot2', 'reel2', 0, 20, 34),
+            ('shot3', 'reel3', 10, 40, 54),
+            ('shot4', 'reel4', 0, 10, 84),
+        ])
+
+    def test_same_sequences(self):
+        """testing if all the clips will be unchanged when the sequences are
+        the same
+        """
+        new_seq = create_sequence([
+            ('shot1', 'reel1', 0, 34, 0),
+            ('shot2', 'reel2', 0, 20, 34),
+            ('shot3', 'reel3', 10, 40, 54),
+            ('shot4', 'reel4', 0, 10, 84),
+        ])
+        diff = SequenceDiff(self.old_seq, new_seq)
+        self.assertEqual(4, len(diff.unchanged))
+        self.assertFalse(diff.has_changes)
+        self.assertEqual([], diff.clips_to_update)
+
+    def test_clips_are_classified_properly(self):
+        """testing if the clips will be classified properly
+        """
+        new_seq = create_sequence([
+            ('shot1', 'reel1', 0, 34, 0),  # unchanged
+            ('shot2', 'reel2', 0, 24, 34),  # retimed
+            ('shot5', 'reel5', 0, 12, 58),  # added
+            ('shot3', 'reel3', 10, 40, 70),  # moved
+        ])  # shot4 is removed
+        diff = self.old_seq.diff(new_seq)
+        self.assertTrue(diff.has_changes)
+        self.assertEqual(
+            [('unchanged', 'shot1'), ('retimed', 'shot2'), ('added', 'shot5'),
+             ('moved', 'shot3'), ('removed', 'shot4')],
+            [(change.status, change.clip.id) for change in diff.changes]
+        )
+
+        new_clips = new_seq.media.video.tracks[0].clips
+        self.assertEqual(
+            [new_clips[1], new_clips[2]],
+            diff.clips_to_transcode
+        )
+        self.assertEqual(
+            [new_clips[1], new_clips[2], new_clips[3]],
+            diff.clips_to_update
+        )
+
+    def test_renamed_clips_are_matched_by_reel_and_source_range(self):
+        """testing if the clips with changed ids will be matched by their
+        reels and source ranges
+        """
+        new_seq = create_sequence([
+            ('shot1', 'reel1', 0, 34, 0),
+            ('shot2', 'reel2', 0, 20, 34),
+            ('shot3_renamed', 'reel3', 10, 40, 54),
+            ('shot4', 'reel4', 0, 10, 84),
+        ])
+        diff = SequenceDiff(self.old_seq, new_seq)
+        self.assertEqual([], diff.added)
+        self.assertEqual([], diff.removed)
+        self.assertEqual(4, len(diff.unchanged))
+        self.assertEqual('shot3', diff.changes[2].old_clip.id)
+
+    def test_changed_file_is_retimed(self):
+        """testing if a clip with a changed file will be classified as
+        retimed
+        """
+        new_seq = create_sequence([
+            ('shot1', 'reel1', 0, 34, 0),
+            ('shot2', 'reel2', 0, 20, 34),
+            ('shot3', 'reel3', 10, 40, 54),
+            ('shot4', 'reel4', 0, 10, 84),
+        ])
+        new_seq.media.video.tracks[0].clips[0].file.pathurl = \
+            'file:///tmp/reel1_v002.mov'
+        diff = SequenceDiff(self.old_seq, new_seq)
+        self.assertEqual(['shot1'], [change.clip.id for change in diff.retimed])
+
+    def test_to_metafuze_xml_clips_argument(self):
+        """testing if to_metafuze_xml() will only generate the XMLs of the
+        given clips
+        """
+        new_seq = create_sequence([
+            ('shot1', 'reel1', 0, 34, 0),
+            ('shot2', 'reel2', 0, 24, 34),
+        ])
+        diff = SequenceDiff(self.old_seq, new_seq)
+        xmls = new_seq.to_metafuze_xml(clips=diff.clips_to_transcode)
+        self.assertEqual(1, len(xmls))
+        self.assertTrue('<ClipName>reel2</ClipName>' in xmls[0])
+        self.assertEqual(2, len(new_seq.to_metafuze_xml()))
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2020, Anima Istanbul
+#
+# This module is part of anima-tools and is released under the MIT
+# License: http://www.opensource.org/licenses/MIT
+"""Tests the speed of the anima.edit operations on long tracks
+"""
+import time
+
+from anima.edit import Track, Clip, File, TimecodeConverter, IntervalIndex
+
+
+class DictClip(Clip):
+    """a Clip with an instance __dict__ to compare against the slotted one
+    """
+
+
+class DictFile(File):
+    """a File with an instance __dict__ to compare against the slotted one
+    """
+
+
+def create_track(num_of_clips, num_of_files):
+    """creates a Track with the given number of clips, the clips are sharing
+    num_of_files different files and every second clip has a duplicate id
+    """
+    track = Track()
+    for i in range(num_of_clips):
+        f = File()
+        f.duration = 34
+        f.name = 'shot%s' % (i % num_of_files)
+        f.pathurl = \
+            'file://localhost/mnt/S/Projects/Test/Edit/shot%s.mov' % \
+            (i % num_of_files)
+
+        c = Clip()
+        c.id = 'shot%s' % (i // 2)
+        c.name = f.name
+        c.start = i * 34
+        c.end = (i + 1) * 34
+        c.duration = 34
+        c.in_ = 0
+        c.out = 34
+        c.file = f
+        track.clips.append(c)
+    return track
+
+
+def create_clips(num_of_clips, clip_class=Clip, file_class=File):
+    """creates the given number of clips by passing all the values to the
+    constructors, so each value is validated only once
+    """
+    clips = []
+    for i in range(num_of_clips):
+        f = file_class(
+            duration=34,
+            name='shot%s' % i,
+            pathurl='file://localhost/mnt/S/Projects/Test/Edit/shot%s.mov' % i
+        )
+        clips.append(
+            clip_class(
+                id='shot%s' % i,
+                name=f.name,
+                start=i * 34,
+                end=(i + 1) * 34,
+                duration=34,
+                in_=0,
+                out=34,
+                file=f
+            )
+        )
+    return clips
+
+
+def measure_clips(num_of_clips, clip_class=Clip, file_class=File):
+    """returns the construction time and the allocated memory of the given
+    number of clips, the memory is None if tracemalloc is not available
+    (Python 2)
+    """
+    try:
+        import tracemalloc
+    except ImportError:
+        tracemalloc = None
+
+    if tracemalloc is not None:
+        tracemalloc.start()
+    start = time.time()
+    clips = create_clips(num_of_clips, clip_class, file_class)
+    end = time.time()
+    memory = None
+    if tracemalloc is not None:
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    del clips
+    return end - start, memory
+
+
+def pairwise_overlaps(track):
+    """returns the overlapping clip pairs by comparing every clip with the
+    others
+    """
+    overlapping_pairs = []
+    clips = track.clips
+    for i in range(len(clips)):
+        clip = clips[i]
+        for j in range(i + 1, len(clips)):
+            compare_clip = clips[j]
+            if clip.start < compare_clip.end and compare_clip.start < clip.end:
+                overlapping_pairs.append((clip, compare_clip))
+    return overlapping_pairs
+
+
+def legacy_optimize_clips(track):
+    """the previous pairwise implementation of Track.optimize_clips()
+    """
+    for i in range(len(track.clips)):
+        clip = track.clips[i]
+        for j in range(i + 1, len(track.clips)):
+            compare_clip = track.clips[j]
+            if clip.file.pathurl == compare_clip.file.pathurl:
+                compare_clip.file = clip.file
+
+            if clip.id == compare_clip.id:
+                random_part = clip.id.split(' ')[-1]
+                if random_part != clip.id:
+                    random_id = int(random_part) + 1
+                    compare_clip.id = '%s %s' % (
+                        clip.id.split(' ')[0],
+                        random_id
+                    )
+                else:
+                    random_id = 2
+                    compare_clip.id = '%s %s' % (clip.id, random_id)
+
+
+if __name__ == '__main__':
+    num_of_clips = 10000
+    num_of_files = 2500
+
+    print('Number of Clips         : %s' % num_of_clips)
+    print('Number of Files         : %s' % num_of_files)
+
+    print('**** optimize_clips ****')
+    track = create_track(num_of_clips, num_of_files)
+    start = time.time()
+    track.optimize_clips()
+    end = time.time()
+    print('Indexed                 : %.3f seconds' % (end - start))
+
+    legacy_track = create_track(num_of_clips, num_of_files)
+    start = time.time()
+    legacy_optimize_clips(legacy_track)
+    end = time.time()
+    print('Pairwise                : %.3f seconds' % (end - start))
+
+    assert [c.id for c in track.clips] == [c.id for c in legacy_track.clips]
+    assert len(set([id(c.file) for c in track.clips])) == num_of_files
+
+    print('******* timecode *******')
+    frame_numbers = [clip.start for clip in track.clips] * 4
+    start = time.time()
+    converter = TimecodeConverter.get('24')
+    converted_timecodes = converter.to_timecodes(frame_numbers)
+    end = time.time()
+    print('TimecodeConverter       : %.3f seconds' % (end - start))
+
+    from timecode import Timecode
+    start = time.time()
+    timecodes = [str(Timecode('24', frames=frame_number + 1))
+                 for frame_number in frame_numbers]
+    end = time.time()
+    print('Timecode                : %.3f seconds' % (end - start))
+
+    assert converted_timecodes == timecodes
+
+    print('****** __slots__ *******')
+    duration, memory = measure_clips(num_of_clips)
+    print('Slotted construction    : %.3f seconds' % duration)
+    if memory is not None:
+        print('Slotted memory          : %.2f MB' % (memory / 1048576.0))
+    duration, memory = measure_clips(num_of_clips, DictClip, DictFile)
+    print('__dict__ construction   : %.3f seconds' % duration)
+    if memory is not None:
+        print('__dict__ memory         : %.2f MB' % (memory / 1048576.0))
+
+    print('**** IntervalIndex *****')
+    start = time.time()
+    index = IntervalIndex.from_track(track)
+    overlapping_pairs = index.overlaps()
+    gaps = index.gaps()
+    clips_at_frames = [index.items_at(frame) for frame in frame_numbers]
+    end = time.time()
+    print('Indexed                 : %.3f seconds' % (end - start))
+
+    start = time.time()
+    legacy_overlapping_pairs = pairwise_overlaps(track)
+    end = time.time()
+    print('Pairwise overlaps       : %.3f seconds' % (end - start))
+
+    assert len(overlapping_pairs) == len(legacy_overlapping_pairs)
+    assert gaps == []
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2020, Anima Istanbul
+#
+# This module is part of anima-tools and is released under the MIT
+# License: http://www.opensource.org/licenses/MIT
+
+import unittest
+from anima.edit import TimecodeConverter
+
+
+class TimecodeConverterTestCase(unittest.TestCase):
+    """tests the anima.edit.TimecodeConverter class
+    """
+
+    framerates = ['12', '23.98', '24', '25', '29.97', '30', '50', '59.94',
+                  '60']
+
+    def test_get_will_return_the_same_instance_for_the_same_framerate(self):
+        """testing if the get() method will return the same instance for the
+        same frame rate
+        """
+        c1 = TimecodeConverter.get('24')
+        c2 = TimecodeConverter.get('24')
+        c3 = TimecodeConverter.get('25')
+        self.assertIs(c1, c2)
+        self.assertIsNot(c1, c3)
+
+    def test_drop_frame_attribute_is_working_properly(self):
+        """testing if the drop_frame attribute is only True for NTSC drop
+        frame rates
+        """
+        self.assertFalse(TimecodeConverter('24').drop_frame)
+        self.assertFalse(TimecodeConverter('23.98').drop_frame)
+        self.assertFalse(TimecodeConverter('30').drop_frame)
+        self.assertTrue(TimecodeConverter('29.97').drop_frame)
+        self.assertTrue(TimecodeConverter('59.94').drop_frame)
+
+    def test_to_timecode_is_working_properly(self):
+        """testing if the to_timecode() method will return the same values
+        with the timecode.Timecode class
+        """
+        from timecode import Timecode
+        for framerate in self.framerates:
+            c = TimecodeConverter(framerate)
+            for frame_number in list(range(0, 20000, 7)) + [2589407, 9000000]:
+                self.assertEqual(
+                    str(Timecode(framerate, frames=frame_number + 1)),
+                    c.to_timecode(frame_number)
+                )
+
+    def test_to_frame_is_working_properly(self):
+        """testing if the to_frame() method will return the same values with
+        the timecode.Timecode class
+        """
+        from timecode import Timecode
+        for framerate in self.framerates:
+            c = TimecodeConverter(framerate)
+            for frame_number in range(0, 20000, 7):
+                tc = str(Timecode(framerate, frames=frame_number + 1))
+                self.assertEqual(
+                    Timecode(framerate, tc).frame_number,
+                    c.to_frame(tc)
+                )
+
+    def test_to_timecodes_and_to_frames_are_working_properly(self):
+        """testing if the batch conversion methods are working properly
+        """
+        c = TimecodeConverter('29.97')
+        frame_numbers = [0, 1, 1799, 1800, 17982, 107892]
+        timecodes = c.to_timecodes(frame_numbers)
+        self.assertEqual(
+            ['00:00:00;00', '00:00:00;01', '00:00:59;29', '00:01:00;02',
+             '00:10:00;00', '01:00:00;00'],
+            timecodes
+        )
+        self.assertEqual(frame_numbers, c.to_frames(timecodes))
@@ -477,3 +477,32 @@ class TrackTestCase(unittest.TestCase):
             expected_xml,
             t.to_xml()
         )
+
+    def test_optimize_clips_will_make_chains_of_duplicate_ids_unique(self):
+        """testing if the optimize_clips method will generate unique ids for
+        more than two clips with the same id
+        """
+        t = Track()
+        ids = ['shot', 'shot 3', 'shot', 'shot', 'shot', 'shot1']
+        for i, id_ in enumerate(ids):
+            f = File()
+            f.name = 'shot'
+            f.pathurl = \
+                'file://localhost/home/eoyilmaz/maya/projects/default/data/' \
+                'shot%s.mov' % (i % 2)
+
+            c = Clip()
+            c.id = id_
+            c.file = f
+            t.clips.append(c)
+
+        t.optimize_clips()
+
+        self.assertEqual(
+            ['shot', 'shot 3', 'shot 2', 'shot 4', 'shot 5', 'shot1'],
+            [c.id for c in t.clips]
+        )
+
+        # and all the clips are using the first two file nodes
+        for i in range(2, len(t.clips)):
+            self.assertIs(t.clips[i % 2].file, t.clips[i].file)
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2020, Anima Istanbul
+#
+# This module is part of anima-tools and is released under the MIT
+# License: http://www.opensource.org/licenses/MIT
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from anima.backup import LocalBackupService
+
+
+class LocalBackupServiceTestCase(unittest.TestCase):
+    """tests the LocalBackupService class
+    """
+
+    def setUp(self):
+        """setup the tests
+        """
+        self.temp_path = tempfile.mkdtemp()
+        self.source_path = os.path.join(self.temp_path, 'source')
+        self.backup_path = os.path.join(self.temp_path, 'backup')
+        os.makedirs(self.source_path)
+        self.source_file = os.path.join(self.source_path, 'a_v001.ma')
+        self.output_file = \
+            os.path.join(self.backup_path, 'Project/a_v001.ma')
+        self.write_source('version 1')
+        self.service = LocalBackupService(self.backup_path, max_backups=2)
+
+    def tearDown(self):
+        """clean up test
+        """
+        shutil.rmtree(self.temp_path)
+
+    def write_source(self, data, mtime=None):
+        """writes the source file
+        """
+        with open(self.source_file, 'w') as f:
+            f.write(data)
+        if mtime is not None:
+            os.utime(self.source_file, (mtime, mtime))
+
+    def read(self, path):
+        """returns the content of the given file
+        """
+        with open(path) as f:
+            return f.read()
+
+    def test_submit_copies_the_file_in_background(self):
+        """testing if submit() will copy the file
+        """
+        self.service.submit(self.source_file, self.output_file)
+        self.service.wait()
+        self.assertEqual('version 1', self.read(self.output_file))
+        stats = self.service.get_stats()
+        self.assertEqual(1, stats['copied'])
+        self.assertEqual(len('version 1'), stats['bytes_copied'])
+        self.assertEqual(0, stats['queue_depth'])
+
+    def test_unchanged_files_are_skipped(self):
+        """testing if the file will not be copied again if it is not changed
+        """
+        self.service.submit(self.source_file, self.output_file)
+        self.service.wait()
+        self.service.submit(self.source_file, self.output_file)
+        self.service.wait()
+
+        # same content with a new mtime
+        self.write_source('version 1', mtime=1000000)
+        self.service.submit(self.source_file, self.output_file)
+        self.service.wait()
+
+        stats = self.service.get_stats()
+        self.assertEqual(1, stats['copied'])
+        self.assertEqual(2, stats['skipped'])
+        self.assertFalse(os.path.exists('%s.1' % self.output_file))
+
+    def test_backups_from_previous_sessions_are_used(self):
+        """testing if the existing backup file will be compared by its content
+        """
+        os.makedirs(os.path.dirname(self.output_file))
+        shutil.copy(self.source_file, self.output_file)
+        self.assertFalse(
+            self.service.backup(self.source_file, self.output_file)
+        )
+
+    def test_previous_backups_are_rotated(self):
+        """testing if the previous backups will be kept up to max_backups
+        """
+        for i in range(3):
+            self.write_source('version %s' % i, mtime=1000000 + i)
+            self.service.submit(self.source_file, self.output_file)
+            self.service.wait()
+
+        self.assertEqual('version 2', self.read(self.output_file))
+        self.assertEqual('version 1', self.read('%s.1' % self.output_file))
+        self.assertFalse(os.path.exists('%s.2' % self.output_file))
+
+    def test_oldest_backups_are_evicted(self):
+        """testing if the oldest backups will be deleted when the total size
+        exceeds max_total_size
+        """
+        self.service.max_total_size = 15
+        other_file = os.path.join(self.backup_path, 'Project/b_v001.ma')
+        self.service.backup(self.source_file, other_file)
+        os.utime(other_file, (1000000, 1000000))
+        self.service._backup_files[other_file] = (1000000, 9)
+
+        self.write_source('version 2')
+        self.service.backup(self.source_file, self.output_file)
+        self.assertFalse(os.path.exists(other_file))
+        self.assertTrue(os.path.exists(self.output_file))
+        self.assertEqual(1, self.service.get_stats()['evicted'])
+
+    def test_is_on_same_device(self):
+        """testing if is_on_same_device() will check the file systems of the
+        closest existing parents
+        """
+        self.assertTrue(
+            LocalBackupService.is_on_same_device(
+                self.source_file,
+                os.path.join(self.backup_path, 'not/created/yet')
+            )
+        )
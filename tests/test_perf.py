@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2020, Anima Istanbul
+#
+# This module is part of anima-tools and is released under the MIT
+# License: http://www.opensource.org/licenses/MIT
+
+import json
+import threading
+import unittest
+
+from anima.perf import Tracer, measure_time
+
+
+class TracerTestCase(unittest.TestCase):
+    """tests the Tracer class
+    """
+
+    def setUp(self):
+        """setup the tests
+        """
+        self.tracer = Tracer(enabled=True)
+
+    def test_disabled_tracer_does_not_record(self):
+        """testing if a disabled tracer will not record any spans
+        """
+        tracer = Tracer(enabled=False)
+
+        @tracer.trace
+        def func():
+            return 1
+
+        with tracer.span('test'):
+            self.assertEqual(1, func())
+        self.assertEqual([], tracer.spans)
+        self.assertEqual({}, tracer.get_stats())
+
+    def test_spans_are_nested_per_thread(self):
+        """testing if the nesting depths of the spans are tracked per thread
+        """
+        depths = {}
+
+        def work(name):
+            with self.tracer.span(name):
+                with self.tracer.span('%s child' % name) as span:
+                    depths[name] = span.depth
+
+        threads = [
+            threading.Thread(target=work, args=('thread%s' % i,))
+            for i in range(4)
+        ]
+        with self.tracer.span('main'):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(
+            {'thread0': 1, 'thread1': 1, 'thread2': 1, 'thread3': 1},
+            depths
+        )
+        self.assertEqual(9, len(self.tracer.spans))
+
+    def test_trace_decorator_runs_the_function_once(self):
+        """testing if the trace decorator will call the decorated function
+        only once even if it raises a TypeError
+        """
+        calls = []
+
+        @self.tracer.trace('failing')
+        def func(a, b=1):
+            calls.append(a)
+            raise TypeError('failing')
+
+        self.assertRaises(TypeError, func, 1, b=2)
+        self.assertEqual([1], calls)
+        self.assertEqual(1, self.tracer.get_stats()['failing']['count'])
+
+    def test_get_stats_aggregates_spans_by_name(self):
+        """testing if get_stats() will aggregate the spans by their names
+        """
+        with self.tracer.span('test'):
+            pass
+        # replace the measured durations with known ones
+        self.tracer._durations['test'] = [float(i) for i in range(10, 0, -1)]
+
+        stats = self.tracer.get_stats()['test']
+        self.assertEqual(10, stats['count'])
+        self.assertEqual(55.0, stats['total'])
+        self.assertEqual(1.0, stats['min'])
+        self.assertEqual(10.0, stats['max'])
+        self.assertEqual(5.0, stats['p50'])
+        self.assertEqual(10.0, stats['p95'])
+
+    def test_exports(self):
+        """testing if the spans will be exported as log lines, JSON and Chrome
+        trace events
+        """
+        with self.tracer.span('save_as', path='/tmp/a.ma'):
+            with self.tracer.span('publisher'):
+                pass
+
+        lines = self.tracer.get_log_lines()
+        self.assertEqual(2, len(lines))
+        self.assertTrue(lines[0].startswith('save_as: count=1'))
+
+        summary = json.loads(self.tracer.to_json())
+        self.assertEqual(1, summary['publisher']['count'])
+
+        events = self.tracer.to_chrome_trace()['traceEvents']
+        self.assertEqual(['publisher', 'save_as'], [e['name'] for e in events])
+        self.assertEqual('X', events[0]['ph'])
+        self.assertEqual({'path': '/tmp/a.ma'}, events[1]['args'])
+
+    def test_max_spans(self):
+        """testing if the oldest spans will be dropped after max_spans
+        """
+        self.tracer.max_spans = 3
+        for i in range(5):
+            with self.tracer.span('span%s' % i):
+                pass
+        self.assertEqual(
+            ['span2', 'span3', 'span4'],
+            [span.name for span in self.tracer.spans]
+        )
+        self.assertEqual(5, len(self.tracer.get_stats()))
+
+
+class MeasureTimeTestCase(unittest.TestCase):
+    """tests the measure_time decorator
+    """
+
+    def test_function_is_called_once(self):
+        """testing if the decorated function will not be called again when it
+        raises a TypeError
+        """
+        calls = []
+
+        @measure_time('test')
+        def func(a, b=1):
+            calls.append(a)
+            raise TypeError('failing')
+
+        self.assertRaises(TypeError, func, 1, b=2)
+        self.assertEqual([1], calls)
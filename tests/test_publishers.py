@@ -6,20 +6,39 @@
 
 import unittest
 
-from anima.publish import (publishers, publisher, run_publishers,
-                           clear_publishers, register_publisher,
-                           PRE_PUBLISHER_TYPE, POST_PUBLISHER_TYPE)
+import shutil
+import tempfile
+import threading
+import time
+
+from anima.exc import PublishError
+from anima.publish import (publishers, publisher, run_publisher,
+                           run_publishers, clear_publishers,
+                           register_publisher, PublisherResult,
+                           PRE_PUBLISHER_TYPE, POST_PUBLISHER_TYPE, staging,
+                           file_fingerprint)
 
 
 class PublishersTestCase(unittest.TestCase):
     """tests the anima.publish module
     """
 
+    def setUp(self):
+        """setup the tests
+        """
+        from anima import defaults
+        self.local_cache_folder = defaults.local_cache_folder
+        self.temp_path = tempfile.mkdtemp()
+        defaults.local_cache_folder = self.temp_path
+
     def tearDown(self):
         """clean up test
         """
         # clean up publishers dictionary
         clear_publishers()
+        from anima import defaults
+        defaults.local_cache_folder = self.local_cache_folder
+        shutil.rmtree(self.temp_path)
 
     def test_registering_a_publisher(self):
         """testing if registering a publisher is working properly
@@ -316,3 +335,308 @@ class PublishersTestCase(unittest.TestCase):
         called = []
         run_publishers('Test3')
         self.assertEqual(called, ['func4', 'func2', 'func3'])
+
+    def test_run_publishers_runs_all_publishers_and_collects_errors(self):
+        """testing if run_publishers() will run all the publishers even if
+        some of them fail and raise their errors combined
+        """
+        called = []
+
+        @publisher('Test')
+        def func1():
+            called.append('func1')
+            raise PublishError('func1 failed')
+
+        @publisher('Test')
+        def func2():
+            called.append('func2')
+
+        @publisher('Test')
+        def func3():
+            called.append('func3')
+            raise PublishError('func3 failed')
+
+        with self.assertRaises(PublishError) as cm:
+            run_publishers('Test')
+
+        self.assertEqual(called, ['func1', 'func2', 'func3'])
+        self.assertEqual(
+            'func1 failed<br><br>func3 failed',
+            str(cm.exception)
+        )
+
+        report = run_publishers('Test', raise_errors=False)
+        self.assertFalse(report.succeeded)
+        self.assertEqual(
+            ['func1', 'func3'],
+            [result.name for result in report.failed]
+        )
+        self.assertEqual(['func2'], [result.name for result in report.passed])
+        self.assertTrue(all(result.duration >= 0 for result in report.results))
+
+    def test_dependencies(self):
+        """testing if the publishers will run after their dependencies and
+        will be skipped if a dependency fails
+        """
+        called = []
+
+        @publisher('Test', depends_on='func2')
+        def func1():
+            called.append('func1')
+
+        @publisher('Test')
+        def func2():
+            called.append('func2')
+            raise PublishError('func2 failed')
+
+        @publisher('Test', depends_on=[func1])
+        def func3():
+            called.append('func3')
+
+        @publisher('Test', depends_on='not_registered')
+        def func4():
+            called.append('func4')
+
+        report = run_publishers('Test', raise_errors=False)
+        self.assertEqual(called, ['func2', 'func4'])
+        self.assertEqual(
+            [PublisherResult.SKIPPED, PublisherResult.FAILED,
+             PublisherResult.SKIPPED, PublisherResult.PASSED],
+            [result.status for result in report.results]
+        )
+
+    def test_parallel_safe_publishers_run_concurrently(self):
+        """testing if the parallel safe publishers will run at the same time
+        in worker threads and the others in the main thread
+        """
+        barrier_lock = threading.Condition()
+        arrived = []
+        threads = {}
+
+        def wait_for_others(name):
+            threads[name] = threading.current_thread()
+            deadline = time.time() + 5
+            with barrier_lock:
+                arrived.append(name)
+                barrier_lock.notify_all()
+                while len(arrived) < 3:
+                    if time.time() > deadline:
+                        raise PublishError('not concurrent')
+                    barrier_lock.wait(0.1)
+
+        @publisher('Test', parallel_safe=True)
+        def func1():
+            wait_for_others('func1')
+
+        @publisher('Test', parallel_safe=True)
+        def func2():
+            wait_for_others('func2')
+
+        @publisher('Test', parallel_safe=True)
+        def func3():
+            wait_for_others('func3')
+
+        @publisher('Test', depends_on=[func1, func2, func3])
+        def func4():
+            threads['func4'] = threading.current_thread()
+
+        report = run_publishers('Test', max_workers=3)
+        self.assertTrue(report.succeeded)
+        self.assertEqual(
+            ['func1', 'func2', 'func3', 'func4'],
+            [result.name for result in report.results]
+        )
+        self.assertEqual(threading.current_thread(), threads['func4'])
+        self.assertNotEqual(threading.current_thread(), threads['func1'])
+
+    def test_passed_publishers_are_cached(self):
+        """testing if the publishers that passed before with the same cache
+        key will not be run again
+        """
+        called = []
+        inputs = {'key': 1}
+
+        def cache_key():
+            return inputs['key']
+
+        @publisher('Test', cache_key=cache_key)
+        def func1():
+            called.append('func1')
+
+        @publisher('Test', cache_key=cache_key)
+        def func2():
+            called.append('func2')
+            if inputs['key'] == 1:
+                raise PublishError('func2 failed')
+
+        @publisher('Test', cache_key=cache_key, side_effects=True)
+        def func3():
+            called.append('func3')
+
+        @publisher('Test')
+        def func4():
+            called.append('func4')
+
+        run_publishers('Test', raise_errors=False)
+        self.assertEqual(called, ['func1', 'func2', 'func3', 'func4'])
+
+        # only the failed and not cacheable ones should run again
+        called = []
+        report = run_publishers('Test', raise_errors=False)
+        self.assertEqual(called, ['func2', 'func3', 'func4'])
+        self.assertTrue(report.results[0].cached)
+
+        # change the inputs
+        called = []
+        inputs['key'] = 2
+        run_publishers('Test', raise_errors=False)
+        self.assertEqual(called, ['func1', 'func2', 'func3', 'func4'])
+
+        # the cache should not be used if it is not wanted
+        called = []
+        run_publishers('Test', use_cache=False)
+        self.assertEqual(called, ['func1', 'func2', 'func3', 'func4'])
+
+    def test_cache_is_per_task_and_take_name(self):
+        """testing if the cached results will be used for the new versions of
+        the same task and take name, and not for other tasks or take names
+        """
+        called = []
+
+        class Version(object):
+            def __init__(self, id_, task_id, take_name):
+                self.id = id_
+                self.task_id = task_id
+                self.take_name = take_name
+
+        @publisher('Test', cache_key=lambda: 'same inputs')
+        def func1():
+            called.append('func1')
+
+        try:
+            staging['version'] = Version(1, 10, 'Main')
+            run_publishers('Test')
+            run_publishers('Test')
+            self.assertEqual(called, ['func1'])
+
+            # publish again, this creates a new version
+            staging['version'] = Version(2, 10, 'Main')
+            run_publishers('Test')
+            self.assertEqual(called, ['func1'])
+
+            staging['version'] = Version(3, 10, 'Main@GPU')
+            run_publishers('Test')
+            self.assertEqual(called, ['func1', 'func1'])
+
+            staging['version'] = Version(4, 11, 'Main@GPU')
+            run_publishers('Test')
+            self.assertEqual(called, ['func1', 'func1', 'func1'])
+        finally:
+            staging.clear()
+
+    def test_cache_keys_are_calculated_once_per_run(self):
+        """testing if a cache_key shared by the publishers will be calculated
+        once in a run until a publisher that is not cacheable runs
+        """
+        calls = []
+
+        def cache_key():
+            calls.append('cache_key')
+            return len(calls)
+
+        @publisher('Test', cache_key=cache_key)
+        def func1():
+            pass
+
+        @publisher('Test', cache_key=cache_key)
+        def func2():
+            pass
+
+        @publisher('Test')
+        def func3():
+            # may change the scene
+            pass
+
+        @publisher('Test', cache_key=cache_key)
+        def func4():
+            pass
+
+        run_publishers('Test')
+        self.assertEqual(['cache_key', 'cache_key'], calls)
+
+        # the keys are not memoized out of the runs
+        run_publisher(func1)
+        run_publisher(func2)
+        self.assertEqual(4, len(calls))
+
+    def test_file_fingerprint(self):
+        """testing if file_fingerprint() will change when a file is changed
+        """
+        import os
+        import tempfile
+        temp_path = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp_path, 'texture.tx')
+            key1 = file_fingerprint([temp_path, path])
+            with open(path, 'w') as f:
+                f.write('data')
+            key2 = file_fingerprint([path, temp_path])
+            self.assertNotEqual(key1, key2)
+            self.assertEqual(key2, file_fingerprint([temp_path, path, path]))
+        finally:
+            import shutil
+            shutil.rmtree(temp_path)
+
+    def test_publisher_timings(self):
+        """testing if the wall and CPU times of the publishers will be
+        recorded and profiled
+        """
+        @publisher('Test')
+        def func1():
+            sum(i * i for i in range(10000))
+
+        @publisher('Test')
+        def func2():
+            time.sleep(0.05)
+
+        report = run_publishers('Test', profile=True)
+        self.assertEqual('Test', report.type_name)
+        self.assertTrue(report.results[1].duration >= 0.05)
+        self.assertTrue(report.results[1].cpu_time < 0.05)
+        self.assertTrue(report.cpu_time >= report.results[0].cpu_time)
+        self.assertTrue('func1' in report.results[0].format_profile())
+        self.assertEqual(
+            'func2',
+            report.get_timing_lines()[0].split(':')[0]
+        )
+
+    def test_publisher_stats_are_aggregated(self):
+        """testing if the durations will be aggregated per task type across
+        the runs in the stats file
+        """
+        from anima.publish import PublisherStats
+
+        @publisher('Test')
+        def func1():
+            time.sleep(0.01)
+
+        @publisher('Test2')
+        def func2():
+            raise PublishError('failed')
+
+        run_publishers('Test')
+        run_publishers('Test')
+        run_publishers('Test2', raise_errors=False)
+        run_publishers('Test', record_stats=False)
+
+        stats = PublisherStats()
+        entry = stats.get('test', 'func1')
+        self.assertEqual(2, entry['count'])
+        self.assertEqual(0, entry['failed'])
+        self.assertTrue(entry['wall_average'] >= 0.01)
+        self.assertEqual(1, stats.get('Test2', 'func2')['failed'])
+        self.assertIsNone(stats.get('Test', 'func2'))
+        self.assertEqual(
+            ['func1'],
+            [name for name, entry in stats.get_slowest('Test')]
+        )
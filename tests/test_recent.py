@@ -193,3 +193,108 @@ class RecentFileManagerTestCase(unittest.TestCase):
             rfm1['Env2'],
             ['Path6', 'Path4']
         )
+
+    def test_concurrent_changes_are_merged(self):
+        """testing if the changes of two managers will be merged when they are
+        saved
+        """
+        rfm1 = RecentFileManager()
+        rfm2 = RecentFileManager()
+
+        rfm1.add('Env1', 'Path1')
+        rfm2.add('Env1', 'Path2')
+        rfm2.add('Env2', 'Path3')
+
+        rfm3 = RecentFileManager()
+        self.assertEqual(rfm3['Env1'], ['Path2', 'Path1'])
+        self.assertEqual(rfm3['Env2'], ['Path3'])
+
+    def test_save_later_is_debouncing_the_saves(self):
+        """testing if save_later() will not write the file immediately but the
+        changes will be visible to the new managers
+        """
+        rfm1 = RecentFileManager()
+        rfm1.add('Env1', 'Path1')
+        cache_file_path = RecentFileManager.cache_file_full_path()
+        mtime = os.path.getmtime(cache_file_path)
+
+        rfm1.add('Env1', 'Path2', save=False)
+        rfm1.save_later(delay=60)
+        rfm1.add('Env1', 'Path3', save=False)
+        rfm1.save_later(delay=60)
+
+        with open(cache_file_path) as f:
+            self.assertFalse('Path2' in f.read())
+        self.assertEqual(mtime, os.path.getmtime(cache_file_path))
+
+        # a new manager sees the pending changes without saving them
+        rfm2 = RecentFileManager()
+        self.assertEqual(rfm2['Env1'], ['Path3', 'Path2', 'Path1'])
+        self.assertEqual(mtime, os.path.getmtime(cache_file_path))
+
+        rfm1.flush()
+        with open(cache_file_path) as f:
+            self.assertTrue('Path3' in f.read())
+
+    def test_shared_manager_merges_the_pending_saves(self):
+        """testing if the files added to the shared manager within the save
+        delay are saved at once
+        """
+        rfm1 = RecentFileManager()
+        rfm1.add('Env1', 'Path1')
+        cache_file_path = RecentFileManager.cache_file_full_path()
+        mtime = os.path.getmtime(cache_file_path)
+
+        shared = RecentFileManager.get()
+        self.assertTrue(shared is RecentFileManager.get())
+        for path in ['Path2', 'Path3']:
+            rfm = RecentFileManager.get()
+            rfm.add('Env1', path, save=False)
+            rfm.save_later(delay=60)
+        self.assertEqual(mtime, os.path.getmtime(cache_file_path))
+
+        shared.flush()
+        rfm2 = RecentFileManager()
+        self.assertEqual(rfm2['Env1'], ['Path3', 'Path2', 'Path1'])
+
+    def test_file_changes_are_detected(self):
+        """testing if the file is parsed again when it is changed by another
+        application
+        """
+        rfm1 = RecentFileManager()
+        rfm1.add('Env1', 'Path1')
+
+        with open(RecentFileManager.cache_file_full_path(), 'w') as f:
+            f.write('{"Env1": ["Path2", "Path1"], "Env2": ["Path3"]}')
+
+        rfm2 = RecentFileManager()
+        self.assertEqual(rfm2['Env1'], ['Path2', 'Path1'])
+        self.assertEqual(rfm2['Env2'], ['Path3'])
+
+    def test_save_does_not_leave_temp_files(self):
+        """testing if save() will not leave any temp files behind
+        """
+        rfm1 = RecentFileManager()
+        rfm1.add('Env1', 'Path1')
+        cache_file_path = RecentFileManager.cache_file_full_path()
+        cache_file_name = os.path.basename(cache_file_path)
+        temp_files = [
+            file_name
+            for file_name in os.listdir(os.path.dirname(cache_file_path))
+            if file_name.startswith('.%s.' % cache_file_name)
+        ]
+        self.assertEqual([], temp_files)
+
+    def test_clear_saves_the_pending_changes_first(self):
+        """testing if clear() will save the pending changes before clearing,
+        so the cleared files do not come back
+        """
+        shared = RecentFileManager.get()
+        shared.add('Env1', 'Path1', save=False)
+        shared.save_later(delay=60)
+
+        RecentFileManager().clear('Env1')
+        shared.flush()
+
+        rfm = RecentFileManager()
+        self.assertEqual(rfm['Env1'], [])
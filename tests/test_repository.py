@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2020, Anima Istanbul
+#
+# This module is part of anima-tools and is released under the MIT
+# License: http://www.opensource.org/licenses/MIT
+
+import os
+import unittest
+
+from anima.repository import RepositoryIndex, RepositoryRoot
+
+
+class RepositoryIndexTestCase(unittest.TestCase):
+    """tests the RepositoryIndex class
+    """
+
+    def setUp(self):
+        """setup the tests
+        """
+        self.repo1 = RepositoryRoot(
+            id=1,
+            env_var='REPO1',
+            windows_path='T:/',
+            linux_path='/mnt/T/',
+            osx_path='/Volumes/T/'
+        )
+        self.repo2 = RepositoryRoot(
+            id=2,
+            env_var='REPO2',
+            windows_path='S:/',
+            linux_path='/mnt/S/',
+            osx_path='/Volumes/S/'
+        )
+        self.repo3 = RepositoryRoot(
+            id=3,
+            env_var='REPO3',
+            windows_path='S:/Nested/',
+            linux_path='/mnt/S/Nested/',
+            osx_path='/Volumes/S/Nested/'
+        )
+        self.repo10 = RepositoryRoot(
+            id=10,
+            env_var='REPO10',
+            windows_path='X:/',
+            linux_path='/mnt/X/',
+            osx_path='/Volumes/X/'
+        )
+        self.index = RepositoryIndex(
+            [self.repo1, self.repo2, self.repo3, self.repo10]
+        )
+
+    def test_find_root_is_working_properly(self):
+        """testing if find_root() will return the repository root of the given
+        path for all the operating systems
+        """
+        self.assertEqual(self.index.find_root('/mnt/T/TP1/a.ma'), self.repo1)
+        self.assertEqual(self.index.find_root('T:/TP1/a.ma'), self.repo1)
+        self.assertEqual(
+            self.index.find_root('/Volumes/T/TP1/a.ma'),
+            self.repo1
+        )
+        self.assertEqual(self.index.find_root('/mnt/S/TP2/a.ma'), self.repo2)
+        self.assertIsNone(self.index.find_root('/tmp/a.ma'))
+        self.assertIsNone(self.index.find_root(''))
+        self.assertIsNone(self.index.find_root(None))
+
+    def test_windows_paths_are_case_insensitive(self):
+        """testing if the windows paths will be matched case insensitively
+        """
+        self.assertEqual(self.index.find_root('t:\\TP1\\a.ma'), self.repo1)
+        self.assertIsNone(self.index.find_root('/MNT/T/TP1/a.ma'))
+
+    def test_nested_repositories(self):
+        """testing if the longest matching repository root will be used
+        """
+        self.assertEqual(
+            self.index.find_root('/mnt/S/Nested/a.ma'),
+            self.repo3
+        )
+        self.assertEqual(self.index.find_root('S:/Nested/a.ma'), self.repo3)
+
+    def test_env_var_paths(self):
+        """testing if the paths starting with the repository environment
+        variables will be matched
+        """
+        self.assertEqual(self.index.find_root('$REPO1/TP1/a.ma'), self.repo1)
+        self.assertEqual(
+            self.index.find_root('$REPO10/TP1/a.ma'),
+            self.repo10
+        )
+        self.assertEqual(self.index.find_root('${REPO3}/a.ma'), self.repo3)
+
+    def test_expanded_paths(self):
+        """testing if the environment variables in the path will be expanded
+        if the path can not be matched otherwise
+        """
+        os.environ['ANIMA_TEST_REPOSITORY_ROOT'] = '/mnt/T'
+        self.assertEqual(
+            self.index.to_os_independent_path(
+                '$ANIMA_TEST_REPOSITORY_ROOT/TP1/a.ma'
+            ),
+            '$REPO1/TP1/a.ma'
+        )
+
+    def test_trim_repo_path_is_working_properly(self):
+        """testing if trim_repo_path() will return the path relative to the
+        repository root
+        """
+        self.assertEqual(
+            self.index.trim_repo_path('/Volumes/T/TP1/a.ma'),
+            'TP1/a.ma'
+        )
+        self.assertEqual(self.index.trim_repo_path('/tmp/a.ma'), '/tmp/a.ma')
+
+    def test_to_os_independent_paths_is_working_properly(self):
+        """testing if to_os_independent_paths() will convert all of the given
+        paths
+        """
+        self.assertEqual(
+            self.index.to_os_independent_paths([
+                '/mnt/T/TP1/a.ma',
+                'S:/TP2/b.ma',
+                '/Volumes/S/Nested/c.ma',
+                '/tmp/d.ma',
+            ]),
+            [
+                '$REPO1/TP1/a.ma',
+                '$REPO2/TP2/b.ma',
+                '$REPO3/c.ma',
+                '/tmp/d.ma'
+            ]
+        )
+
+    def test_to_native_path_is_working_properly(self):
+        """testing if to_native_path() will convert the path to the current
+        os
+        """
+        native_path = self.index.to_native_path('$REPO1/TP1/a.ma')
+        self.assertEqual(native_path, '%sTP1/a.ma' % self.repo1.path)
+        self.assertEqual(
+            self.index.to_native_paths(['T:/TP1/a.ma', '/tmp/a.ma']),
+            ['%sTP1/a.ma' % self.repo1.path, '/tmp/a.ma']
+        )
+
+    def test_update_rebuilds_the_index(self):
+        """testing if update() will rebuild the index with the given roots
+        """
+        self.index.update([self.repo2])
+        self.assertIsNone(self.index.find_root('/mnt/T/TP1/a.ma'))
+        self.assertEqual(self.index.find_root('/mnt/S/TP1/a.ma'), self.repo2)
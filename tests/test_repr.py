@@ -10,7 +10,7 @@ import unittest
 import os
 # from stalker import (db, User, Repository, Status, FilenameTemplate, Structure,
 #                      StatusList, ImageFormat, Project, Type, Task, Version)
-from anima.representation import Representation
+from anima.representation import Representation, RepresentationResolver
 
 
 class RepresentationTestCase(unittest.TestCase):
@@ -370,3 +370,67 @@ class RepresentationTestCase(unittest.TestCase):
         rep = Representation(self.version4)
         self.assertTrue(rep.repr, 'BBox')
 
+    def test_resolver_answers_from_memory(self):
+        """testing if the RepresentationResolver will query the database only
+        once for the given versions
+        """
+        from sqlalchemy import event
+        from stalker.db.session import DBSession
+
+        resolver = RepresentationResolver()
+        resolver.load([self.version1, self.version4, self.version10])
+
+        statements = []
+
+        def count_statements(*args):
+            statements.append(args)
+
+        engine = DBSession.connection().engine
+        event.listen(engine, 'before_cursor_execute', count_statements)
+        try:
+            for version in [self.version1, self.version4, self.version10]:
+                rep = Representation(version, resolver=resolver)
+                rep.list_all()
+                rep.find('BBox')
+                rep.has_repr('ASS')
+                rep.has_any_repr()
+        finally:
+            event.remove(engine, 'before_cursor_execute', count_statements)
+
+        self.assertEqual([], statements)
+        self.assertEqual(
+            self.version7,
+            resolver.get_published_version(self.version1, 'Main@ASS')
+        )
+
+    def test_resolver_stores_the_versions_of_paths(self):
+        """testing if the RepresentationResolver will store the versions of
+        the given paths, including the paths with no versions
+        """
+        resolver = RepresentationResolver()
+        self.assertFalse(resolver.has_version('/path/a.ma'))
+
+        resolver.set_versions(
+            ['/path/a.ma', '/path/b.ma'], [self.version1, None]
+        )
+        self.assertTrue(resolver.has_version('/path/a.ma'))
+        self.assertTrue(resolver.has_version('/path/b.ma'))
+        self.assertEqual(self.version1, resolver.get_version('/path/a.ma'))
+        self.assertIsNone(resolver.get_version('/path/b.ma'))
+
+    def test_new_representations_see_the_published_versions(self):
+        """testing if a Representation created without a resolver will see
+        the versions published after another Representation is queried
+        """
+        from stalker.db.session import DBSession
+        rep = Representation(self.version1)
+        self.assertIsNone(rep.find('GPU'))
+
+        self.version9.is_published = True
+        DBSession.commit()
+        try:
+            rep = Representation(self.version1)
+            self.assertEqual(self.version9, rep.find('GPU'))
+        finally:
+            self.version9.is_published = False
+            DBSession.commit()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2020, Anima Istanbul
+#
+# This module is part of anima-tools and is released under the MIT
+# License: http://www.opensource.org/licenses/MIT
+
+import unittest
+
+from anima.search import TaskNameIndex
+
+
+class TaskNameIndexTestCase(unittest.TestCase):
+    """tests the TaskNameIndex class
+    """
+
+    def setUp(self):
+        """setup the tests
+        """
+        self.index = TaskNameIndex([
+            (1, 'Lookdev', 'PRJ | Assets | Char1'),
+            (2, 'Model', 'PRJ | Assets | Char1'),
+            (3, 'Layout', 'PRJ | Shots | SH010'),
+            (4, 'Animation', 'PRJ | Shots | SH010'),
+            (5, 'Char1 Model Fix', 'PRJ | Assets'),
+            (6, 'model', 'PRJ | Assets | Prop1'),
+        ])
+
+    def test_index_is_ready(self):
+        """testing if the index is ready after it is filled
+        """
+        self.assertTrue(self.index.is_ready)
+        self.assertFalse(self.index.is_expired)
+        self.assertFalse(TaskNameIndex().is_ready)
+
+    def test_search_is_case_insensitive(self):
+        """testing if the search is case insensitive and the names starting
+        with the text come first
+        """
+        self.assertEqual(
+            [2, 6, 5],
+            [task_id for task_id, name, path in self.index.search('MODEL')]
+        )
+
+    def test_search_with_short_text(self):
+        """testing if the texts shorter than a trigram are also searched
+        """
+        self.assertEqual(
+            [4, 5, 3],
+            [task_id for task_id, name, path in self.index.search('a')][:3]
+        )
+        self.assertEqual(
+            [3, 1],
+            [task_id for task_id, name, path in self.index.search('l')][:2]
+        )
+
+    def test_search_checks_the_whole_text(self):
+        """testing if the names having all the trigrams of the text but not
+        the text itself are not returned
+        """
+        index = TaskNameIndex([(1, 'abcd bcde', ''), (2, 'abcde', '')])
+        self.assertEqual([(2, 'abcde', '')], index.search('abcde'))
+
+    def test_search_limit(self):
+        """testing if the number of the results are limited
+        """
+        self.assertEqual(1, len(self.index.search('model', limit=1)))
+        self.assertEqual([], self.index.search('  '))
+        self.assertEqual([], self.index.search('xyz'))
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2020, Anima Istanbul
+#
+# This module is part of anima-tools and is released under the MIT
+# License: http://www.opensource.org/licenses/MIT
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+
+from anima.time_log import TimeLogCalendarLoader
+
+
+class TimeLogCalendarLoaderMonthTestCase(unittest.TestCase):
+    """tests the month calculations of the TimeLogCalendarLoader class
+    """
+
+    def test_add_months(self):
+        """testing if add_months() will move the months across years
+        """
+        self.assertEqual(
+            (2019, 12), TimeLogCalendarLoader.add_months(2020, 1, -1)
+        )
+        self.assertEqual(
+            (2021, 1), TimeLogCalendarLoader.add_months(2020, 12, 1)
+        )
+        self.assertEqual(
+            (2020, 3), TimeLogCalendarLoader.add_months(2020, 3, 0)
+        )
+
+    def test_get_month_range(self):
+        """testing if get_month_range() will return the start of the month
+        and the start of the next month
+        """
+        start, end = TimeLogCalendarLoader.get_month_range(2020, 12)
+        self.assertEqual(
+            (2020, 12, 1), (start.year, start.month, start.day)
+        )
+        self.assertEqual((2021, 1, 1), (end.year, end.month, end.day))
+
+
+class TimeLogCalendarLoaderTestCase(unittest.TestCase):
+    """tests the TimeLogCalendarLoader class
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """setup test
+        """
+        # use a database file, the months are prefetched in another thread
+        cls.temp_path = tempfile.mkdtemp()
+        from stalker import db
+        db.setup({
+            'sqlalchemy.url':
+                'sqlite:///%s' % os.path.join(cls.temp_path, 'test.db')
+        })
+        db.init()
+
+        from stalker import User
+        cls.user1 = User(
+            name='User 1',
+            login='user1',
+            email='user1@users.com',
+            password='12345'
+        )
+
+        from stalker import Repository
+        cls.repo1 = Repository(
+            name='Test Project Repository',
+            linux_path=cls.temp_path,
+            windows_path=cls.temp_path,
+            osx_path=cls.temp_path
+        )
+
+        from stalker import Project
+        cls.project = Project(
+            name='Test Project',
+            code='TP',
+            repository=cls.repo1
+        )
+
+        from stalker import Task
+        cls.assets = Task(name='Assets', project=cls.project)
+        cls.char1 = Task(name='Char1', parent=cls.assets)
+        cls.model = Task(
+            name='Model', parent=cls.char1, resources=[cls.user1]
+        )
+        cls.layout = Task(
+            name='Layout', project=cls.project, resources=[cls.user1]
+        )
+
+        from stalker.db.session import DBSession
+        DBSession.add_all([
+            cls.user1, cls.repo1, cls.project, cls.assets, cls.char1,
+            cls.model, cls.layout
+        ])
+        DBSession.commit()
+
+        cls.create_time_log(cls.model, 2020, 3, 5, 10, 12)
+        cls.create_time_log(cls.layout, 2020, 3, 5, 9, 10)
+        cls.create_time_log(cls.layout, 2020, 3, 9, 9, 10)
+        cls.create_time_log(cls.model, 2020, 2, 28, 9, 10)
+        cls.create_time_log(cls.layout, 2020, 4, 1, 9, 13)
+        cls.create_time_log(cls.model, 2020, 6, 1, 9, 13)
+
+    @classmethod
+    def create_time_log(cls, task, year, month, day, start_hour, end_hour):
+        """A helper method for creating a new time log for user1
+        """
+        start, _ = TimeLogCalendarLoader.get_month_range(year, month)
+        start = start.replace(day=day, hour=start_hour)
+        end = start.replace(hour=end_hour)
+
+        from stalker import TimeLog
+        from stalker.db.session import DBSession
+        time_log = TimeLog(
+            task=task,
+            resource=cls.user1,
+            start=start,
+            end=end
+        )
+        DBSession.add(time_log)
+        DBSession.commit()
+        return time_log
+
+    @classmethod
+    def tearDownClass(cls):
+        """cleanup the test
+        """
+        from stalker.db.session import DBSession
+        DBSession.remove()
+        shutil.rmtree(cls.temp_path, ignore_errors=True)
+
+    def setUp(self):
+        """setup the tests
+        """
+        TimeLogCalendarLoader.clear_task_paths()
+        self.loader = TimeLogCalendarLoader()
+
+    def test_load_returns_the_days_of_the_month(self):
+        """testing if load() will return only the days of the given month
+        with the time logs sorted by their start
+        """
+        days = self.loader.load(self.user1.id, 2020, 3)
+        self.assertEqual(
+            [datetime.date(2020, 3, 5), datetime.date(2020, 3, 9)],
+            [day.date for day in days]
+        )
+        self.assertEqual([10800, 3600], [day.seconds for day in days])
+        self.assertEqual(
+            ['Layout (TP)', 'Model (TP | Assets | Char1)'],
+            [task_name for _, _, task_name in days[0].time_logs]
+        )
+
+    def test_neighbouring_months_are_prefetched(self):
+        """testing if the months before and after the loaded month will be
+        prefetched
+        """
+        self.assertIsNone(self.loader.get_month(self.user1.id, 2020, 2))
+        self.loader.load(self.user1.id, 2020, 3)
+        self.loader.wait()
+
+        february = self.loader.get_month(self.user1.id, 2020, 2)
+        self.assertEqual(
+            [datetime.date(2020, 2, 28)], [day.date for day in february]
+        )
+        april = self.loader.get_month(self.user1.id, 2020, 4)
+        self.assertEqual([14400], [day.seconds for day in april])
+        self.assertIsNone(self.loader.get_month(self.user1.id, 2020, 5))
+
+    def test_get_task_names_caches_the_task_paths(self):
+        """testing if get_task_names() will cache the paths of the tasks and
+        their parents
+        """
+        self.assertEqual(
+            {self.model.id: 'Model (TP | Assets | Char1)'},
+            TimeLogCalendarLoader.get_task_names([self.model.id])
+        )
+        self.assertEqual(
+            'TP | Assets',
+            TimeLogCalendarLoader._task_paths[self.char1.id]
+        )
+        self.assertEqual(
+            {self.char1.id: 'Char1 (TP | Assets)'},
+            TimeLogCalendarLoader.get_task_names([self.char1.id])
+        )
+
+    def test_get_task_paths(self):
+        """testing if get_task_paths() will return the paths of the tasks
+        without the task names
+        """
+        self.assertEqual(
+            {self.model.id: 'TP | Assets | Char1',
+             self.layout.id: 'TP'},
+            TimeLogCalendarLoader.get_task_paths(
+                [self.model.id, self.layout.id]
+            )
+        )
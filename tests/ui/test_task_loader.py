@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2020, Anima Istanbul
+#
+# This module is part of anima-tools and is released under the MIT
+# License: http://www.opensource.org/licenses/MIT
+
+import collections
+import sys
+import threading
+import time
+import unittest
+
+from anima.ui.lib import QtWidgets
+from anima.ui.models.task import TaskLoader, TaskData
+
+
+TaskRef = collections.namedtuple('TaskRef', ['id', 'entity_type'])
+
+
+def create_rows(names, has_children=False):
+    """creates child task data with the given names, the ids are the
+    positions of the names starting from 100
+    """
+    return [
+        TaskData(100 + i, name, 'Task', None, has_children, None)
+        for i, name in enumerate(names)
+    ]
+
+
+class StubTaskLoader(TaskLoader):
+    """A TaskLoader that returns the children from a dictionary instead of
+    querying the database
+    """
+
+    batch_size = 2
+
+    # task id -> child task data
+    children = {}
+    # the task ids in the order they are queried
+    queried = []
+    # the queries of these task ids wait for the gate
+    blocked_task_ids = []
+    gate = threading.Event()
+
+    @classmethod
+    def query_children(cls, task_id, entity_type):
+        if task_id in cls.blocked_task_ids:
+            cls.gate.wait()
+        cls.queried.append(task_id)
+        return list(cls.children.get(task_id, []))
+
+
+class ItemStub(object):
+    """records the calls of the TaskLoader to a TaskItem
+    """
+
+    def __init__(self, task_id, entity_type='Task'):
+        self.task = TaskRef(task_id, entity_type)
+        self.added = []
+        self.finished = []
+
+    def add_children(self, rows):
+        self.added.append([row.name for row in rows])
+
+    def finish_loading(self, error=None):
+        self.finished.append(error)
+
+
+class TaskLoaderTestCase(unittest.TestCase):
+    """tests the TaskLoader class with a stubbed query_children()
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """set up tests in class level
+        """
+        # the loader polls the results with a QTimer
+        cls.app = QtWidgets.QApplication.instance()
+        if not cls.app:
+            cls.app = QtWidgets.QApplication(sys.argv)
+
+    def setUp(self):
+        """set up the test
+        """
+        StubTaskLoader.children = {
+            1: create_rows(['A', 'B', 'C', 'D', 'E']),
+            2: create_rows(['F']),
+        }
+        StubTaskLoader.queried = []
+        StubTaskLoader.blocked_task_ids = []
+        StubTaskLoader.gate.set()
+        self.loader = StubTaskLoader(prefetch=False)
+
+    def tearDown(self):
+        """clean up test
+        """
+        # let the worker finish the blocked queries
+        StubTaskLoader.gate.set()
+        self.loader.cancel_all()
+
+    def wait_for(self, condition, timeout=5):
+        """waits until the given condition is True
+        """
+        end = time.time() + timeout
+        while not condition():
+            if time.time() > end:
+                self.fail('timed out')
+            time.sleep(0.01)
+
+    def wait_for_results(self, count):
+        """waits until the given number of results are queued
+        """
+        self.wait_for(lambda: self.loader._results.qsize() >= count)
+
+    def test_children_are_added_in_batches(self):
+        """testing if the children will be added to the item in batches and
+        the loading will be finished after the last batch
+        """
+        item = ItemStub(1)
+        self.loader.load(item)
+        self.wait_for_results(3)
+        self.loader.process_results()
+
+        self.assertEqual([['A', 'B'], ['C', 'D'], ['E']], item.added)
+        self.assertEqual([None], item.finished)
+        self.assertEqual({}, self.loader._pending)
+
+    def test_request_cancelled_mid_load(self):
+        """testing if the results of a request cancelled while its children
+        are being queried will not be added to the item
+        """
+        StubTaskLoader.blocked_task_ids = [1]
+        StubTaskLoader.gate.clear()
+
+        item1 = ItemStub(1)
+        request = self.loader.load(item1)
+        item2 = ItemStub(2)
+        self.loader.load(item2)
+        # the worker is querying the first request
+        self.wait_for(lambda: self.loader._requests.qsize() == 1)
+
+        self.loader.cancel(request)
+        StubTaskLoader.gate.set()
+
+        # the requests are processed in order, so the first request is done
+        # when the result of the second one is queued
+        self.wait_for(lambda: 2 in StubTaskLoader.queried)
+        self.wait_for_results(1)
+        self.assertEqual([1, 2], StubTaskLoader.queried)
+        self.loader.process_results()
+
+        self.assertEqual([], item1.added)
+        self.assertEqual([], item1.finished)
+        self.assertEqual([['F']], item2.added)
+        self.assertEqual([None], item2.finished)
+
+    def test_queued_results_of_cancelled_request_are_dropped(self):
+        """testing if the already queued results of a cancelled request will
+        be dropped
+        """
+        item = ItemStub(1)
+        request = self.loader.load(item)
+        self.wait_for_results(3)
+
+        self.loader.cancel(request)
+        self.loader.process_results()
+
+        self.assertEqual([], item.added)
+        self.assertEqual([], item.finished)
+
+    def test_reload_while_loading(self):
+        """testing if the children will be added only once when the item is
+        reloaded before the results of the first load are processed
+        """
+        item = ItemStub(1)
+        request1 = self.loader.load(item)
+        self.wait_for_results(3)
+
+        # reload
+        self.loader.cancel(request1)
+        StubTaskLoader.children[1] = create_rows(['A', 'B', 'X'])
+        request2 = self.loader.load(item)
+        self.assertNotEqual(request1.id, request2.id)
+
+        self.wait_for_results(5)
+        self.loader.process_results()
+
+        self.assertEqual([['A', 'B'], ['X']], item.added)
+        self.assertEqual([None], item.finished)
+
+    def test_prefetched_data_is_used(self):
+        """testing if the children of the first child tasks will be
+        prefetched and the prefetched data will be returned only once
+        """
+        self.loader.prefetch = True
+        StubTaskLoader.children[1] = \
+            create_rows(['A', 'B'], has_children=True)
+        StubTaskLoader.children[100] = create_rows(['A1', 'A2'])
+
+        item = ItemStub(1)
+        self.loader.load(item)
+        self.wait_for_results(1)
+        self.loader.process_results()
+
+        # the children of A and B are prefetched
+        self.assertEqual([100, 101], sorted(self.loader._prefetching))
+        self.wait_for_results(2)
+        self.loader.process_results()
+        self.assertEqual({}, self.loader._prefetching)
+
+        prefetched = self.loader.get_prefetched(100)
+        self.assertEqual(['A1', 'A2'], [row.name for row in prefetched])
+        self.assertEqual([], self.loader.get_prefetched(101))
+        self.assertIsNone(self.loader.get_prefetched(100))
+
+        # prefetched data is not used after it expires
+        self.loader.prefetch_children(create_rows(['A'], has_children=True))
+        self.wait_for_results(1)
+        self.loader.process_results()
+        self.loader._prefetched[100] = (0, self.loader._prefetched[100][1])
+        self.assertIsNone(self.loader.get_prefetched(100))
+
+    def test_loads_are_queried_before_prefetches(self):
+        """testing if the load requests will be queried before the prefetch
+        requests that are queued before them
+        """
+        StubTaskLoader.blocked_task_ids = [3]
+        StubTaskLoader.gate.clear()
+
+        # block the worker
+        self.loader.load(ItemStub(3))
+        self.wait_for(lambda: self.loader._requests.empty())
+
+        self.loader.prefetch = True
+        self.loader.prefetch_children(create_rows(['A'], has_children=True))
+        self.loader.load(ItemStub(2))
+        StubTaskLoader.gate.set()
+
+        self.wait_for(lambda: len(StubTaskLoader.queried) == 3)
+        self.assertEqual([3, 2, 100], StubTaskLoader.queried)
+
+    def test_loading_a_task_cancels_its_prefetch(self):
+        """testing if loading the children of a task that is being prefetched
+        will cancel the prefetch request
+        """
+        StubTaskLoader.blocked_task_ids = [3]
+        StubTaskLoader.gate.clear()
+        self.loader.load(ItemStub(3))
+        self.wait_for(lambda: self.loader._requests.empty())
+
+        self.loader.prefetch = True
+        self.loader.prefetch_children(create_rows(['A'], has_children=True))
+        prefetch_request = self.loader._prefetching[100]
+
+        item = ItemStub(100)
+        self.loader.load(item)
+        self.assertTrue(prefetch_request.cancelled)
+        self.assertEqual({}, self.loader._prefetching)
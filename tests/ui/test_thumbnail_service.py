@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2020, Anima Istanbul
+#
+# This module is part of anima-tools and is released under the MIT
+# License: http://www.opensource.org/licenses/MIT
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from anima.ui.utils import ThumbnailService
+
+
+class ThumbnailServiceCacheTestCase(unittest.TestCase):
+    """tests the disk cache of the ThumbnailService class
+    """
+
+    def setUp(self):
+        """set up the test
+        """
+        self.cache_path = tempfile.mkdtemp()
+        self.service = ThumbnailService(
+            cache_path=self.cache_path,
+            max_disk_cache_size=250
+        )
+
+    def tearDown(self):
+        """clean up test
+        """
+        shutil.rmtree(self.cache_path, ignore_errors=True)
+
+    def create_cache_file(self, key, mtime, size=100):
+        """creates a cache file for the given key with the given modification
+        time and size
+        """
+        path = self.service.get_cache_file_path(key)
+        try:
+            os.makedirs(os.path.dirname(path))
+        except OSError:
+            pass
+        with open(path, 'wb') as f:
+            f.write(b'0' * size)
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_prune_cache_deletes_the_oldest_files(self):
+        """testing if prune_cache() will delete the oldest files until the
+        total size is under the limit
+        """
+        path1 = self.create_cache_file('a', 1000)
+        path2 = self.create_cache_file('b', 3000)
+        path3 = self.create_cache_file('c', 2000)
+
+        self.service.prune_cache()
+
+        self.assertFalse(os.path.exists(path1))
+        self.assertTrue(os.path.exists(path2))
+        self.assertTrue(os.path.exists(path3))
+        self.assertEqual(200, self.service._cache_size)
+
+    def test_prune_cache_keeps_the_given_file(self):
+        """testing if prune_cache() will not delete the given file even if it
+        is the oldest one
+        """
+        path1 = self.create_cache_file('a', 1000)
+        path2 = self.create_cache_file('b', 2000)
+        self.service.prune_cache()
+        path3 = self.create_cache_file('c', 500)
+        self.service._add_cache_file(path3)
+
+        self.service.prune_cache(keep=path3)
+
+        self.assertFalse(os.path.exists(path1))
+        self.assertTrue(os.path.exists(path2))
+        self.assertTrue(os.path.exists(path3))
+
+    def test_touched_files_are_pruned_last(self):
+        """testing if the recently used files will be pruned after the
+        others
+        """
+        path1 = self.create_cache_file('a', 1000)
+        path2 = self.create_cache_file('b', 2000)
+        self.service.prune_cache()
+
+        self.service._touch_cache_file(path1)
+        path3 = self.create_cache_file('c', 3000)
+        self.service._add_cache_file(path3)
+        self.service.prune_cache(keep=path3)
+
+        self.assertTrue(os.path.exists(path1))
+        self.assertFalse(os.path.exists(path2))
+        self.assertTrue(os.path.exists(path3))
+
+    def test_no_limit(self):
+        """testing if prune_cache() will not delete any file if there is no
+        limit
+        """
+        self.service.max_disk_cache_size = None
+        paths = [
+            self.create_cache_file(key, 1000 + i)
+            for i, key in enumerate('abcd')
+        ]
+        self.service.prune_cache()
+        self.assertTrue(all(os.path.exists(path) for path in paths))
@@ -44,6 +44,42 @@ def test_stalker_entity_encoder_is_working_properly(create_db, create_project):
     assert data == expected_data
 
 
+def test_dump_is_working_properly(create_db, create_project):
+    """testing if dump() will stream the same JSON data to a file
+    """
+    from stalker import Task
+    project = create_project
+    assets_task = Task.query\
+        .filter(Task.project==project).filter(Task.name=='Assets').first()
+    assert isinstance(assets_task, Task)
+
+    import io
+    from anima.utils import task_hierarchy_io
+    f = io.StringIO()
+    task_hierarchy_io.dump(assets_task, f, indent=4)
+
+    global __here__
+
+    with open(os.path.join(__here__, "data", "test_template2.json")) as f2:
+        expected_data = f2.read()
+
+    assert f.getvalue() == expected_data
+
+
+def test_stalker_entity_encoder_caches_fields(create_db, create_project):
+    """testing if the serializable fields are computed only once per class
+    """
+    from stalker import Task
+    from anima.utils import task_hierarchy_io
+    encoder_class = task_hierarchy_io.StalkerEntityEncoder
+    fields = encoder_class.get_fields(Task)
+    assert 'name' in fields
+    assert 'versions' in fields
+    assert 'children' not in fields
+    assert 'walk_hierarchy' not in fields
+    assert encoder_class.get_fields(Task) is fields
+
+
 def test_stalker_entity_decoder_will_create_new_data(create_db, create_empty_project):
     """testing if JSON decoder will create new data
     """
@@ -551,3 +587,116 @@ def test_stalker_entity_decoder_will_not_recreate_versions_2(create_db, create_e
 
     assert len(kutu_look_dev.versions) == 9
     assert kutu_look_dev.versions[-1].version_number == 8
+
+
+def test_stalker_entity_decoder_bulk_loads_will_create_new_data(create_db, create_empty_project):
+    """testing if bulk_loads() will create new data along with the versions
+    """
+    project = create_empty_project
+
+    import json
+    from anima.utils import task_hierarchy_io
+
+    global __here__
+    file_path = os.path.join(__here__, "data", "test_template5.json")
+
+    with open(file_path) as f:
+        data = json.load(f)
+
+    decoder = \
+        task_hierarchy_io.StalkerEntityDecoder(
+            project=project
+        )
+    decoder.bulk_loads(data)
+
+    from stalker import Asset, Task
+    ananas_asset = Asset.query\
+        .filter(Asset.project==project)\
+        .filter(Asset.name=='Ananas')\
+        .first()
+    assert ananas_asset is not None
+
+    ananas_look_dev = Task.query\
+        .filter(Task.parent==ananas_asset)\
+        .filter(Task.name=='lookDev')\
+        .first()
+    assert ananas_look_dev is not None
+    assert len(ananas_look_dev.versions) == 1
+
+
+def test_stalker_entity_decoder_bulk_loads_will_not_recreate_data(create_db, create_empty_project):
+    """testing if bulk_loads() will not recreate already existing tasks and
+    versions
+    """
+    project = create_empty_project
+
+    import json
+    from anima.utils import task_hierarchy_io
+
+    global __here__
+    file_path = os.path.join(__here__, "data", "test_template6.json")
+
+    with open(file_path) as f:
+        data = json.load(f)
+
+    import copy
+    data_backup = copy.deepcopy(data)
+
+    decoder = \
+        task_hierarchy_io.StalkerEntityDecoder(
+            project=project
+        )
+    decoder.bulk_loads(data)
+
+    # load it a couple of times more with both of the modes
+    decoder.bulk_loads(copy.deepcopy(data_backup))
+    decoder.loads(copy.deepcopy(data_backup))
+    decoder.bulk_loads(copy.deepcopy(data_backup))
+
+    from stalker import Asset, Task
+    kutu_assets = Asset.query\
+        .filter(Asset.project==project)\
+        .filter(Asset.name=='Kutu')\
+        .all()
+    assert len(kutu_assets) == 1
+    kutu_asset = kutu_assets[0]
+
+    kutu_look_devs = Task.query\
+        .filter(Task.parent==kutu_asset)\
+        .filter(Task.name=='lookDev')\
+        .all()
+    assert len(kutu_look_devs) == 1
+    kutu_look_dev = kutu_look_devs[0]
+
+    assert len(kutu_look_dev.versions) == 9
+    assert kutu_look_dev.versions[-1].version_number == 8
+
+
+def test_stalker_entity_decoder_bulk_loads_will_rollback_on_error(create_db, create_empty_project):
+    """testing if bulk_loads() will not leave any partial data behind when
+    an error occurs
+    """
+    project = create_empty_project
+
+    import json
+    from anima.utils import task_hierarchy_io
+
+    global __here__
+    file_path = os.path.join(__here__, "data", "test_template5.json")
+
+    with open(file_path) as f:
+        data = json.load(f)
+
+    # break the last task
+    del data['tasks'][-1]['versions']
+
+    decoder = \
+        task_hierarchy_io.StalkerEntityDecoder(
+            project=project
+        )
+    import pytest
+    with pytest.raises(KeyError):
+        decoder.bulk_loads(data)
+
+    from stalker import Task
+    assert Task.query.filter(Task.project==project).all() == []